@@ -0,0 +1,126 @@
+# ============================================================================
+# benchmarks/bench_analisis_procesos.py
+# Análisis HTML en los hilos de red frente a un pool de procesos
+# Uso: python -m benchmarks.bench_analisis_procesos [paginas] [procesos]
+#      (por defecto 200 páginas y tantos procesos como núcleos disponibles)
+# La ganancia en páginas/s depende de los núcleos libres: con uno solo no
+# hay ganancia que medir, solo el pulso. Medir en un equipo con varios.
+# ============================================================================
+
+import os
+import statistics
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from config.constants import TAMANO_BLOQUE_HTML, MAX_HILOS_VALIDACION
+from model.link_validator import LinkValidator
+from benchmarks.bench_extractores import generar_pagina
+
+# Pausa por bloque que simula la red: libera el GIL como una lectura de socket
+LATENCIA_BLOQUE = 0.002
+
+
+class RespuestaSimulada:
+    """Lo que analizar_contenido_html usa de una respuesta de requests"""
+
+    def __init__(self, contenido):
+        self.contenido = contenido
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.url = 'https://pagina.example.com/'
+
+    def iter_content(self, chunk_size):
+        for inicio in range(0, len(self.contenido), chunk_size):
+            time.sleep(LATENCIA_BLOQUE)
+            yield self.contenido[inicio:inicio + chunk_size]
+
+
+class Pulso(threading.Thread):
+    """Hilo que duerme 1 ms en bucle y anota cuánto tarda de más en
+    despertar: es lo que espera un hilo de red para recuperar el GIL"""
+
+    def __init__(self):
+        super().__init__(daemon=True)
+        self.retrasos = []
+        self.activo = True
+
+    def run(self):
+        while self.activo:
+            inicio = time.perf_counter()
+            time.sleep(0.001)
+            self.retrasos.append((time.perf_counter() - inicio - 0.001) * 1000)
+
+
+def medir(validador, paginas, hilos):
+    pulso = Pulso()
+    pulso.start()
+    medidas = [{} for _ in paginas]
+    inicio = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=hilos) as executor:
+        veredictos = list(executor.map(
+            lambda contenido, medida: validador.analizar_contenido_html(RespuestaSimulada(contenido), medida),
+            paginas, medidas
+        ))
+    duracion = time.perf_counter() - inicio
+    pulso.activo = False
+    pulso.join()
+    retrasos = sorted(pulso.retrasos)
+    return {
+        'segundos': duracion,
+        'paginas_s': len(paginas) / duracion,
+        'pulso_mediana_ms': statistics.median(retrasos),
+        'pulso_p99_ms': retrasos[int(len(retrasos) * 0.99)],
+        'kb_pagina': sum(medida.get('bytes_leidos', 0) for medida in medidas) / len(paginas) / 1024,
+        'veredictos': veredictos,
+    }
+
+
+def nucleos_disponibles():
+    # Los que puede usar este proceso (un contenedor puede tener menos que cpu_count)
+    if hasattr(os, 'sched_getaffinity'):
+        return len(os.sched_getaffinity(0))
+    return os.cpu_count() or 1
+
+
+def main():
+    nucleos = nucleos_disponibles()
+    num_paginas = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    procesos = int(sys.argv[2]) if len(sys.argv) > 2 else nucleos
+
+    # Páginas de ~1 MB sin palabras clave (se analizan enteras, el peor caso)
+    # y las mismas con «domain for sale» en el título (el primer bloque decide)
+    pagina = generar_pagina(12000).encode('utf-8')
+    en_venta = pagina.replace(b'<title>', b'<title>domain for sale ', 1)
+    print(f"{num_paginas} páginas de {len(pagina) // 1024} KB en bloques de {TAMANO_BLOQUE_HTML // 1024} KB, "
+          f"{MAX_HILOS_VALIDACION} hilos de red, {nucleos} núcleos")
+    if nucleos < 2:
+        print("Aviso: con un solo núcleo los procesos no pueden analizar en paralelo. "
+              "La ganancia en páginas/s no se mide aquí, solo el pulso.")
+
+    for tipo, contenido in (('sin veredicto', pagina), ('en venta', en_venta)):
+        print(f"\nPáginas {tipo}")
+        print(f"{'Modo':<22} {'Tiempo':>8} {'Páginas/s':>10} {'KB leídos':>10} "
+              f"{'Pulso mediana':>14} {'Pulso p99':>10}")
+        paginas = [contenido] * num_paginas
+        referencia = None
+        for nombre, num_procesos in (('hilos', 0), (f'{procesos} procesos', procesos)):
+            validador = LinkValidator(cache=None, procesos_html=num_procesos)
+            try:
+                if num_procesos:
+                    # Arrancar los procesos fuera de la medida
+                    medir(validador, paginas[:num_procesos], MAX_HILOS_VALIDACION)
+                r = medir(validador, paginas, MAX_HILOS_VALIDACION)
+            finally:
+                validador.cerrar()
+            if referencia is None:
+                referencia = r
+            elif r['veredictos'] != referencia['veredictos']:
+                print("  ¡Los veredictos no coinciden con los del modo hilos!")
+            print(f"{nombre:<22} {r['segundos']:>7.1f}s {r['paginas_s']:>10.1f} {r['kb_pagina']:>10.0f} "
+                  f"{r['pulso_mediana_ms']:>11.2f} ms {r['pulso_p99_ms']:>7.2f} ms")
+        print(f"Ganancia: x{r['paginas_s'] / referencia['paginas_s']:.2f}")
+
+
+if __name__ == "__main__":
+    main()
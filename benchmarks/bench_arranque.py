@@ -0,0 +1,68 @@
+# ============================================================================
+# benchmarks/bench_arranque.py
+# Tiempo de arranque en frío: imports de la interfaz (main.py) y de cli.py
+# Uso: python -m benchmarks.bench_arranque [repeticiones]   (por defecto 10)
+# ============================================================================
+
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+# Cada caso se importa en un intérprete nuevo. main.py no se ejecuta entero
+# porque abriría la ventana: se importan sus módulos sin crear la raíz de Tk.
+CASOS = [
+    ("python vacío", "pass"),
+    ("interfaz (main.py)", "import main"),
+    ("línea de comandos (cli.py)", "import cli"),
+    ("cli.py --help", "import cli, contextlib, io\n"
+                      "with contextlib.redirect_stdout(io.StringIO()):\n"
+                      "    try:\n"
+                      "        cli.main(['--help'])\n"
+                      "    except SystemExit:\n"
+                      "        pass"),
+]
+
+# Dependencias que deben cargarse solo al usarse por primera vez
+DIFERIDAS = ['pandas', 'numpy', 'requests', 'urllib3', 'openpyxl', 'pyarrow']
+
+_MEDIR = """
+import json, sys, time
+inicio = time.perf_counter()
+exec(compile(sys.argv[1], '<caso>', 'exec'))
+duracion = time.perf_counter() - inicio
+print(json.dumps({'ms': duracion * 1000,
+                  'cargadas': [m for m in json.loads(sys.argv[2]) if m in sys.modules]}))
+"""
+
+
+def medir(codigo):
+    salida = subprocess.run(
+        [sys.executable, "-c", _MEDIR, codigo, json.dumps(DIFERIDAS)],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def medir_proceso(codigo):
+    # Tiempo total del proceso (arranque del intérprete incluido)
+    inicio = time.perf_counter()
+    subprocess.run([sys.executable, "-c", codigo], capture_output=True, check=True)
+    return (time.perf_counter() - inicio) * 1000
+
+
+def main():
+    repeticiones = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+
+    print(f"{'Caso':<30} {'Imports':>10} {'Proceso':>10}  Dependencias pesadas cargadas")
+    for nombre, codigo in CASOS:
+        medidas = [medir(codigo) for _ in range(repeticiones)]
+        procesos = [medir_proceso(codigo) for _ in range(repeticiones)]
+        cargadas = ", ".join(medidas[-1]['cargadas']) or "ninguna"
+        print(f"{nombre:<30} {statistics.median(m['ms'] for m in medidas):>7.1f} ms "
+              f"{statistics.median(procesos):>7.1f} ms  {cargadas}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+# ============================================================================
+# benchmarks/bench_escritor.py
+# Guardado de resultados: parche de la hoja destino frente a openpyxl completo
+# Uso: python -m benchmarks.bench_escritor [hojas] [filas_por_hoja]
+# ============================================================================
+
+import os
+import shutil
+import sys
+import tempfile
+import time
+import tracemalloc
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.styles import Font, PatternFill
+
+from model.escritor_xlsx import EscritorXlsx
+from config.constants import VALOR_EXCEL_VALIDO, VALOR_EXCEL_NO_VALIDO, VALOR_EXCEL_VALIDAR
+
+
+def generar_libro(ruta, hojas, filas):
+    # Varias hojas con texto, números y estilos; la primera tiene las URLs
+    wb = Workbook(write_only=True)
+    negrita = Font(bold=True)
+    relleno = PatternFill('solid', fgColor='FFF2CC')
+    for h in range(hojas):
+        ws = wb.create_sheet(f"Hoja{h + 1}")
+        for i in range(1, filas + 1):
+            fila = [f"https://sitio{i % 500}.example.com/p/{i}", i, i * 1.5, f"texto {h}-{i}", "notas"]
+            ws.append(fila)
+    wb.save(ruta)
+    # Estilos en algunas celdas (requiere el modo normal de openpyxl)
+    wb = load_workbook(ruta)
+    for ws in wb.worksheets:
+        for i in range(1, min(filas, 200) + 1):
+            ws.cell(row=i, column=1).font = negrita
+            ws.cell(row=i, column=4).fill = relleno
+    wb.save(ruta)
+    wb.close()
+
+
+def medir(original, copia, metodo, cambios):
+    # Tiempo y memoria en pasadas separadas: tracemalloc ralentiza mucho
+    # el código que crea muchos objetos y falsearía la comparación
+    shutil.copy(original, copia)
+    inicio = time.perf_counter()
+    getattr(EscritorXlsx(copia), f"escribir_{metodo}")(cambios)
+    duracion = time.perf_counter() - inicio
+
+    shutil.copy(original, copia)
+    tracemalloc.start()
+    getattr(EscritorXlsx(copia), f"escribir_{metodo}")(cambios)
+    _, pico = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return duracion, pico
+
+
+def main():
+    hojas = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    filas = int(sys.argv[2]) if len(sys.argv) > 2 else 10000
+
+    carpeta = tempfile.mkdtemp()
+    try:
+        original = os.path.join(carpeta, "libro.xlsx")
+        print(f"Generando libro de prueba: {hojas} hojas x {filas} filas...")
+        generar_libro(original, hojas, filas)
+        print(f"Tamaño: {os.path.getsize(original) / 1024 / 1024:.1f} MB")
+
+        valores = [VALOR_EXCEL_VALIDO, VALOR_EXCEL_NO_VALIDO, VALOR_EXCEL_VALIDAR]
+        cambios = {"Hoja1": {(i, 26): valores[i % 3] for i in range(2, filas + 1)}}
+
+        tiempos = {}
+        for metodo in ('openpyxl', 'parche'):
+            copia = os.path.join(carpeta, f"{metodo}.xlsx")
+            tiempos[metodo] = medir(original, copia, metodo, cambios)
+
+        # Los dos archivos deben tener los mismos valores en la hoja modificada
+        leidos = []
+        for metodo in ('openpyxl', 'parche'):
+            wb = load_workbook(os.path.join(carpeta, f"{metodo}.xlsx"), read_only=True)
+            leidos.append(list(wb["Hoja1"].iter_rows(values_only=True)))
+            wb.close()
+        print(f"Resultados idénticos: {'sí' if leidos[0] == leidos[1] else 'NO'}")
+
+        print(f"\n{'Método':<10} {'Tiempo':>10} {'Memoria pico':>14}")
+        for metodo, (duracion, pico) in tiempos.items():
+            print(f"{metodo:<10} {duracion:>9.2f}s {pico / 1024 / 1024:>12.1f} MB")
+        base, nuevo = tiempos['openpyxl'], tiempos['parche']
+        print(f"\nParche: {base[0] / nuevo[0]:.1f}x más rápido, {base[1] / max(nuevo[1], 1):.0f}x menos memoria")
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
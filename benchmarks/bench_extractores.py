@@ -0,0 +1,90 @@
+# ============================================================================
+# benchmarks/bench_extractores.py
+# Paridad y velocidad de los extractores de texto HTML frente a BeautifulSoup
+# Uso: python -m benchmarks.bench_extractores
+# ============================================================================
+
+import time
+
+from config.constants import TAMANO_BLOQUE_HTML
+from model.analizador_html import ExtractorTextoHTML, ExtractorTextoRapido
+
+try:
+    from bs4 import BeautifulSoup
+except ImportError:
+    BeautifulSoup = None
+
+MUESTRAS_PARIDAD = [
+    '<html><head><title>Page Not Found</title></head><body><h1>Hola</h1><p>mundo &amp; m&aacute;s</p></body></html>',
+    '<html><head><title>T</title><style>x{}</style></head><body>a<script>if(a<b){}</script>b<!-- c -->'
+    '<template><p>tt</p></template><textarea>ta</textarea></body>z</html>',
+    '<title>solo titulo</title><p>sin body</p>',
+    '<html><body><div>Sign <b>in</b></div><noscript>enable js</noscript></body></html>',
+    '<html><head><meta charset="utf-8"><title>Página no encontrada</title></head><body>Contraseña requerida</body></html>',
+    '<!DOCTYPE html><HTML><HEAD><TITLE>Mayus</TITLE></HEAD><BODY><P>Texto<BR>linea</BODY></HTML>',
+    '<html><body><p>uno<p>dos<table><tr><td>c1<td>c2</table></body></html>',
+    '<html><head><title>a</title></head><body>x</body></html>texto final',
+    '</p><body>hola',
+    '<title>hola<body>',
+    'hola<body>Sign In',
+    '<body><pre> \n </pre> \n <p>a &#65;&#x42; &foo; &#128;</p><br>b</br>c<![CDATA[ d ]]></body>',
+]
+
+
+def texto_beautifulsoup(html):
+    # Réplica exacta del análisis anterior con BeautifulSoup
+    soup = BeautifulSoup(html.encode('utf-8'), 'html.parser')
+    title = soup.find('title')
+    body = soup.find('body')
+    return (title.get_text().lower() if title else "") + " " + (body.get_text().lower() if body else "")
+
+
+def texto_extractor(clase, html, tamano_bloque=TAMANO_BLOQUE_HTML):
+    extractor = clase()
+    for inicio in range(0, len(html), tamano_bloque):
+        extractor.feed(html[inicio:inicio + tamano_bloque])
+    extractor.close()
+    return extractor.texto_completo()
+
+
+def generar_pagina(num_bloques=15000):
+    partes = ['<html><head><title>Pagina</title><script>var a = 1;</script></head><body>']
+    for i in range(num_bloques):
+        partes.append(
+            f'<div class="c{i % 7}"><a href="/x/{i}">enlace {i}</a> texto &amp; más '
+            f'<span>palabra{i}</span></div>\n'
+        )
+    partes.append('</body></html>')
+    return ''.join(partes)
+
+
+def main():
+    extractores = [('html.parser', ExtractorTextoHTML), ('rápido', ExtractorTextoRapido)]
+    
+    if BeautifulSoup is not None:
+        print("Paridad con BeautifulSoup (bloques de 7 caracteres para forzar cortes):")
+        for nombre, clase in extractores:
+            fallos = [
+                html for html in MUESTRAS_PARIDAD
+                if texto_extractor(clase, html, 7) != texto_beautifulsoup(html)
+            ]
+            print(f"  {nombre:<12} {len(MUESTRAS_PARIDAD) - len(fallos)}/{len(MUESTRAS_PARIDAD)} iguales")
+    else:
+        print("BeautifulSoup no instalado: se omite la comprobación de paridad")
+    
+    pagina = generar_pagina()
+    print(f"\nPágina de {len(pagina) / 1e6:.1f} MB:")
+    candidatos = list(extractores)
+    if BeautifulSoup is not None:
+        candidatos.append(('BeautifulSoup', None))
+    for nombre, clase in candidatos:
+        inicio = time.perf_counter()
+        if clase is None:
+            texto = texto_beautifulsoup(pagina)
+        else:
+            texto = texto_extractor(clase, pagina)
+        print(f"  {nombre:<14} {(time.perf_counter() - inicio) * 1000:8.1f} ms | {len(texto)} caracteres")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+# ============================================================================
+# benchmarks/bench_keywords.py
+# Compara la búsqueda de palabras clave original con el clasificador compilado
+# Uso: python -m benchmarks.bench_keywords
+# ============================================================================
+
+import random
+import string
+import time
+
+from config.constants import (
+    KEYWORDS_ERROR_CRITICO,
+    KEYWORDS_AD_BLOCKER,
+    KEYWORDS_LOGIN,
+    TAMANO_BLOQUE_HTML,
+)
+from model.clasificador_keywords import CLASIFICADOR_CONTENIDO
+
+REPETICIONES = 20
+
+
+def clasificar_original(texto):
+    # Copia del análisis anterior: texto completo en minúsculas + tres barridos
+    contenido = texto.lower()
+    if any(err in contenido for err in KEYWORDS_ERROR_CRITICO):
+        return 'error'
+    if any(keyword in contenido for keyword in KEYWORDS_AD_BLOCKER):
+        return 'validar'
+    if any(keyword in contenido for keyword in KEYWORDS_LOGIN):
+        return 'validar'
+    return 'ok'
+
+
+def clasificar_por_bloques(texto):
+    escaner = CLASIFICADOR_CONTENIDO.crear_escaner()
+    for inicio in range(0, len(texto), TAMANO_BLOQUE_HTML):
+        if escaner.agregar(texto[inicio:inicio + TAMANO_BLOQUE_HTML]):
+            break
+    return escaner.veredicto()
+
+
+def generar_texto(tamano, semilla=1):
+    aleatorio = random.Random(semilla)
+    palabras = [
+        ''.join(aleatorio.choice(string.ascii_letters) for _ in range(aleatorio.randint(2, 9)))
+        for _ in range(5000)
+    ]
+    texto = []
+    longitud = 0
+    while longitud < tamano:
+        palabra = aleatorio.choice(palabras)
+        texto.append(palabra)
+        longitud += len(palabra) + 1
+    return ' '.join(texto)[:tamano]
+
+
+def medir(funcion, texto):
+    inicio = time.perf_counter()
+    for _ in range(REPETICIONES):
+        resultado = funcion(texto)
+    return (time.perf_counter() - inicio) / REPETICIONES * 1000, resultado
+
+
+def main():
+    for tamano in (100_000, 1_000_000, 2_000_000):
+        base = generar_texto(tamano)
+        casos = {
+            'sin keywords': base,
+            'login al final': base + ' please Sign In',
+            'error al inicio': '404 Not Found ' + base,
+        }
+        for nombre, texto in casos.items():
+            t_original, r_original = medir(clasificar_original, texto)
+            t_nuevo, r_nuevo = medir(clasificar_por_bloques, texto)
+            assert r_original == r_nuevo, (nombre, r_original, r_nuevo)
+            print(
+                f"{tamano / 1e6:>4.1f} MB | {nombre:<16} | original {t_original:7.2f} ms | "
+                f"compilado {t_nuevo:7.2f} ms | x{t_original / t_nuevo:5.1f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# ============================================================================
+# benchmarks/bench_memoria.py
+# Memoria pico del pipeline en streaming frente a listas completas en memoria
+# Uso: python -m benchmarks.bench_memoria [filas ...]   (por defecto 1000 10000 100000)
+# ============================================================================
+
+import json
+import os
+import resource
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+
+from openpyxl import Workbook
+
+
+def generar_libro(ruta, filas):
+    # Mezcla de URLs que no salen a la red (http://, texto, vacías) y https://
+    # a dominios .invalid, que fallan en la resolución DNS: se recorren todas
+    # las fases del pipeline sin depender de Internet
+    wb = Workbook(write_only=True)
+    ws = wb.create_sheet("Datos")
+    ws.append(["URL", "Notas"])
+    for i in range(2, filas + 2):
+        tipo = i % 4
+        if tipo == 0:
+            url = f"https://sitio{i % 20}.invalid/p/{i}"
+        elif tipo == 1:
+            url = f"http://sitio{i % 500}.example.com/p/{i}"
+        elif tipo == 2:
+            url = f"texto {i}"
+        else:
+            url = None
+        ws.append([url, f"fila {i}"])
+    wb.save(ruta)
+
+
+def memoria_pico_mb():
+    pico = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux da KB; macOS, bytes
+    return pico / 1024 / 1024 if sys.platform == 'darwin' else pico / 1024
+
+
+def medir_en_proceso(ruta, filas, modo):
+    # Se ejecuta en un proceso hijo: ru_maxrss es el pico de todo el proceso
+    from model.link_validator import LinkValidator
+    from model.trabajo_validacion import ObjetivoValidacion, TrabajoValidacion
+
+    validador = LinkValidator(cache=None)
+    objetivo = ObjetivoValidacion("Datos", "A", 2, filas + 1, "C")
+    trabajo = TrabajoValidacion(ruta, [objetivo], validador)
+    base = memoria_pico_mb()
+
+    inicio = time.perf_counter()
+    if modo == 'streaming':
+        procesadas = trabajo.validar(trabajo.iterar_entradas(), delay=0, total=filas)
+        contadores = trabajo.guardar()
+    else:
+        # Forma anterior: todas las entradas y todos los resultados en listas
+        entradas = list(trabajo.iterar_entradas())
+        resultados = validador.validar_lote_con_filas(entradas, delay=0)
+        procesadas = len(resultados)
+        contadores = trabajo.guardar(resultados)
+    duracion = time.perf_counter() - inicio
+
+    print(json.dumps({
+        'procesadas': procesadas,
+        'contadores': contadores,
+        'segundos': duracion,
+        'base_mb': base,
+        'pico_mb': memoria_pico_mb(),
+    }))
+
+
+def medir(ruta, filas, modo):
+    copia = f"{ruta}.{modo}.xlsx"
+    shutil.copy(ruta, copia)
+    salida = subprocess.run(
+        [sys.executable, "-m", "benchmarks.bench_memoria", "--hijo", copia, str(filas), modo],
+        capture_output=True, text=True, check=True
+    ).stdout
+    os.remove(copia)
+    # La última línea es el JSON; antes puede haber logs
+    return json.loads(salida.strip().splitlines()[-1])
+
+
+def main():
+    tamanos = [int(arg) for arg in sys.argv[1:]] or [1000, 10000, 100000]
+
+    carpeta = tempfile.mkdtemp()
+    try:
+        print(f"{'Filas':>9} {'Modo':<10} {'Tiempo':>9} {'Filas/s':>9} {'RSS base':>10} {'RSS pico':>10} {'Pipeline':>10}")
+        for filas in tamanos:
+            ruta = os.path.join(carpeta, f"libro_{filas}.xlsx")
+            generar_libro(ruta, filas)
+            for modo in ('streaming', 'listas'):
+                r = medir(ruta, filas, modo)
+                print(f"{filas:>9} {modo:<10} {r['segundos']:>8.1f}s {r['procesadas'] / r['segundos']:>9.0f} "
+                      f"{r['base_mb']:>7.1f} MB {r['pico_mb']:>7.1f} MB {r['pico_mb'] - r['base_mb']:>7.1f} MB")
+            os.remove(ruta)
+    finally:
+        shutil.rmtree(carpeta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5 and sys.argv[1] == "--hijo":
+        medir_en_proceso(sys.argv[2], int(sys.argv[3]), sys.argv[4])
+    else:
+        main()
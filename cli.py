@@ -0,0 +1,415 @@
+# ============================================================================
+# cli.py
+# Punto de entrada sin interfaz gráfica (servidores, tareas programadas)
+# Uso: python cli.py libro.xlsx -c C -r Z [-H Hoja1] [--desde 2] [--hasta 500]
+#      python cli.py carpeta/ -c C -r Z          (todos los .xlsx/.xlsm)
+#      python cli.py inventario.csv -c url -o resultados.parquet
+# No importa tkinter: usa directamente las clases del modelo.
+# ============================================================================
+
+import argparse
+import os
+import re
+import signal
+import sqlite3
+import sys
+import time
+import traceback
+
+from config.constants import (
+    DELAY_DEFAULT,
+    MAX_HILOS_VALIDACION,
+    PROCESOS_ANALISIS_HTML,
+    UI_FILA_INICIO_DEFAULT,
+    FILA_MAXIMA_EXCEL,
+    CLI_INTERVALO_PROGRESO,
+    SALIDA_OK,
+    SALIDA_HAY_NO_VALIDOS,
+    SALIDA_ERROR_USO,
+    SALIDA_ERROR_ARCHIVO,
+    SALIDA_ERROR_INTERNO,
+    SALIDA_INTERRUMPIDA,
+    EMOJI_VALIDO,
+    EMOJI_NO_VALIDO,
+    EMOJI_VALIDAR,
+    EMOJI_ARCHIVO,
+    EMOJI_ESTADO,
+    EMOJI_CUIDADO,
+    EMOJI_CONTINUAR,
+    EMOJI_TIEMPO,
+)
+from logger import get_logger
+from errors import MensajesError, errores_archivo_excel, registrar_error
+from model.link_validator import LinkValidator
+from model.cache_resultados import CacheResultados
+from model.diario_ejecucion import DiarioEjecucion
+from model.registro_detalles import RegistroDetalles
+from model.trabajo_validacion import (
+    ObjetivoValidacion,
+    TrabajoValidacion,
+    CONTADOR_POR_ESTADO,
+    contadores_vacios,
+)
+from model.lote_libros import LoteLibros, EXTENSIONES_LIBRO, expandir_rutas
+from model.adaptadores_archivos import (
+    FUENTES_POR_EXTENSION,
+    FormatoArchivoNoSoportado,
+    crear_fuente,
+    crear_destino,
+    procesar_por_bloques,
+)
+
+_PATRON_COLUMNA = re.compile(r'^[A-Z]{1,3}$')
+
+
+# ============================================================================
+# PROGRESO Y DETENCIÓN
+# ============================================================================
+
+class ProgresoConsola:
+    """Callback de progreso: cada `intervalo` segundos escribe las filas
+    procesadas, el ritmo (filas/s) y los contadores por estado"""
+
+    def __init__(self, logger, intervalo=CLI_INTERVALO_PROGRESO):
+        self.logger = logger
+        self.intervalo = intervalo
+        self.reiniciar(None)
+
+    def reiniciar(self, total, etiqueta=""):
+        # total=None si no se conoce de antemano (CSV, JSONL, Parquet)
+        self.total = total
+        self.etiqueta = etiqueta
+        self.procesadas = 0
+        self.contadores = contadores_vacios()
+        self.inicio = time.monotonic()
+        self._ultima_linea = self.inicio
+
+    def __call__(self, url, idx, total, resultado, fila_excel):
+        self.procesadas += 1
+        estado = resultado.get('estado')
+        if estado:
+            self.contadores[CONTADOR_POR_ESTADO.get(estado, 'no_validos')] += 1
+        ahora = time.monotonic()
+        if ahora - self._ultima_linea >= self.intervalo:
+            self._ultima_linea = ahora
+            self.logger.info(self.linea())
+
+    def ritmo(self):
+        return self.procesadas / max(time.monotonic() - self.inicio, 1e-9)
+
+    def linea(self):
+        ritmo = self.ritmo()
+        if self.total:
+            avance = f"{self.procesadas}/{self.total} ({100 * self.procesadas / self.total:.1f}%)"
+        else:
+            avance = f"{self.procesadas}"
+        texto = (f"{EMOJI_ESTADO} {self.etiqueta}{avance} filas · {ritmo:.1f} filas/s · "
+                 f"{EMOJI_VALIDO} {self.contadores['validos']} "
+                 f"{EMOJI_NO_VALIDO} {self.contadores['no_validos']} "
+                 f"{EMOJI_VALIDAR} {self.contadores['validar']}")
+        if self.total and ritmo > 0 and self.procesadas < self.total:
+            texto += f" · quedan ~{(self.total - self.procesadas) / ritmo:.0f} s"
+        return texto
+
+
+class Detencion:
+    """Ctrl+C o SIGTERM piden detener: se terminan las URLs en curso y lo
+    validado queda en el diario. Un segundo Ctrl+C sale en el acto."""
+
+    def __init__(self, logger):
+        self.logger = logger
+        self.solicitada = False
+
+    def instalar(self):
+        signal.signal(signal.SIGINT, self._manejar)
+        signal.signal(signal.SIGTERM, self._manejar)
+
+    def _manejar(self, signum, frame):
+        if self.solicitada:
+            raise KeyboardInterrupt
+        self.solicitada = True
+        self.logger.warning(f"{EMOJI_CUIDADO} Deteniendo: se terminan las URLs en curso...")
+
+    def __call__(self):
+        return self.solicitada
+
+
+def codigo_de_salida(contadores):
+    return SALIDA_HAY_NO_VALIDOS if contadores['no_validos'] else SALIDA_OK
+
+
+def log_resumen(logger, contadores, procesadas, segundos):
+    logger.info(f"{EMOJI_TIEMPO}  {procesadas} filas en {segundos:.1f} s "
+                f"({procesadas / max(segundos, 1e-9):.1f} filas/s)")
+    logger.success(f"{EMOJI_VALIDO} Válidas: {contadores['validos']}")
+    logger.warning(f"{EMOJI_VALIDAR}  Validar: {contadores['validar']}")
+    logger.error(f"{EMOJI_NO_VALIDO} No válidas: {contadores['no_validos']}")
+
+
+# ============================================================================
+# MODOS DE EJECUCIÓN
+# ============================================================================
+
+def validar_libro(args, validador, progreso, detener, logger):
+    # Un libro: mismo flujo que la interfaz (diario para reanudar, detalle
+    # por fila y una sola escritura del libro al terminar)
+    from model.lector_excel import LectorExcel
+    with LectorExcel(args.ruta) as lector:
+        hojas = [metadatos['hoja'] for metadatos in lector.leer_metadatos()]
+    if not hojas:
+        logger.error(f"{EMOJI_NO_VALIDO} El libro no tiene hojas")
+        return SALIDA_ERROR_ARCHIVO
+    hoja = args.hoja or hojas[0]
+    if hoja not in hojas:
+        logger.error(f"{EMOJI_NO_VALIDO} No existe la hoja '{hoja}' (hojas del libro: {', '.join(hojas)})")
+        return SALIDA_ERROR_USO
+    objetivo = ObjetivoValidacion(hoja, args.columna, args.desde, args.hasta, args.resultado)
+    trabajo = TrabajoValidacion(args.ruta, [objetivo], validador)
+    total = trabajo.estimar_filas()
+    logger.info(f"{EMOJI_ARCHIVO} {os.path.basename(args.ruta)} · {objetivo.descripcion()}")
+
+    # La cabecera es la misma que usa la interfaz: los diarios sirven para ambas
+    diario = DiarioEjecucion(args.ruta)
+    cabecera = {'archivo': os.path.basename(args.ruta), 'objetivos': [objetivo.como_dict()]}
+    recuperadas = 0
+    if diario.existe():
+        if args.reanudar and diario.leer_cabecera() == cabecera:
+            for resultado in diario.iterar_resultados():
+                trabajo.registrar(resultado)
+                recuperadas += 1
+            logger.info(f"{EMOJI_CONTINUAR} Reanudando: {recuperadas} filas recuperadas del diario de ejecución")
+        elif not args.reanudar:
+            logger.warning(f"{EMOJI_CUIDADO} Hay un diario de una ejecución anterior; se empieza de nuevo "
+                           f"(usa --reanudar para continuarla)")
+    diario.abrir(cabecera, continuar=bool(recuperadas))
+    detalles = None if args.sin_detalles else RegistroDetalles(args.ruta)
+
+    def callback(url, idx, total, resultado, fila_excel):
+        diario.registrar(resultado)
+        if detalles is not None:
+            resultado['hoja'] = hoja
+            detalles.registrar(resultado)
+        progreso(url, idx, total, resultado, fila_excel)
+
+    try:
+        total = max(0, total - recuperadas)
+        progreso.reiniciar(total)
+        inicio = time.monotonic()
+        procesadas = trabajo.validar(
+            trabajo.iterar_entradas(args.incremental),
+            args.delay,
+            callback=callback,
+            debe_detener=detener,
+            total=total
+        )
+        logger.info(progreso.linea())
+
+        if detener():
+            logger.warning(f"{EMOJI_CUIDADO} Detenida: {procesadas} filas validadas quedan en el diario "
+                           f"({os.path.basename(diario.ruta)}); repite con --reanudar para continuar")
+            return SALIDA_INTERRUMPIDA
+
+        contadores = trabajo.guardar()
+        diario.eliminar()
+        log_resumen(logger, contadores, procesadas + recuperadas, time.monotonic() - inicio)
+        logger.success(f"{EMOJI_VALIDO} Resultados guardados en la columna {objetivo.columna_resultado} "
+                       f"de '{hoja}'")
+        return codigo_de_salida(contadores)
+    finally:
+        diario.cerrar()
+        if detalles is not None:
+            detalles.cerrar()
+            if detalles.filas:
+                logger.info(f"{EMOJI_ARCHIVO} Detalle por fila: {detalles.ruta}")
+
+
+def validar_carpeta(args, rutas, validador, progreso, detener, logger):
+    logger.info(f"{EMOJI_ARCHIVO} {len(rutas)} libros en {args.ruta}")
+
+    def al_empezar_libro(indice, total_libros, ruta, filas):
+        progreso.reiniciar(filas, etiqueta=f"[{indice}/{total_libros}] {os.path.basename(ruta)}: ")
+
+    inicio = time.monotonic()
+    lote = LoteLibros(rutas, args.hoja, args.columna, args.desde, args.hasta, args.resultado, validador,
+                      detalles=not args.sin_detalles)
+    resumen = lote.ejecutar(
+        args.delay,
+        incremental=args.incremental,
+        callback=progreso,
+        debe_detener=detener,
+        al_empezar_libro=al_empezar_libro
+    )
+
+    for registro in resumen:
+        nombre = os.path.basename(registro['archivo'])
+        if registro['error']:
+            logger.error(f"{EMOJI_NO_VALIDO} {nombre}: {registro['error']}")
+        else:
+            c = registro['contadores']
+            logger.info(f"{EMOJI_VALIDO} {nombre}: {c['validos']} válidas, {c['no_validos']} no válidas, "
+                        f"{c['validar']} a validar ({registro['segundos']:.1f} s)")
+        if registro['detalles']:
+            logger.info(f"{EMOJI_ARCHIVO} Detalle por fila: {registro['detalles']}")
+
+    totales = LoteLibros.totales(resumen)
+    log_resumen(logger, totales, totales['filas'], time.monotonic() - inicio)
+    if detener():
+        return SALIDA_INTERRUMPIDA
+    if totales['con_error']:
+        return SALIDA_ERROR_ARCHIVO
+    return codigo_de_salida(totales)
+
+
+def validar_archivo_datos(args, validador, progreso, detener, logger):
+    # CSV / JSONL / Parquet: los resultados van a otro archivo (--salida)
+    fuente = crear_fuente(args.ruta, args.columna)
+    destino = crear_destino(args.salida)
+    logger.info(f"{EMOJI_ARCHIVO} {os.path.basename(args.ruta)} → {args.salida}")
+
+    progreso.reiniciar(None)
+    inicio = time.monotonic()
+    contadores = procesar_por_bloques(
+        fuente,
+        destino,
+        validador,
+        delay=args.delay,
+        callback=progreso,
+        debe_detener=detener
+    )
+    logger.info(progreso.linea())
+    log_resumen(logger, contadores, contadores['procesados'], time.monotonic() - inicio)
+    if detener():
+        logger.warning(f"{EMOJI_CUIDADO} Detenida: {args.salida} tiene solo las filas validadas hasta ahora")
+        return SALIDA_INTERRUMPIDA
+    return codigo_de_salida(contadores)
+
+
+# ============================================================================
+# ARGUMENTOS
+# ============================================================================
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="cli.py",
+        description="Valida los enlaces de un libro Excel, de una carpeta de libros o de un "
+                    "archivo CSV/JSONL/Parquet, sin interfaz gráfica.",
+        epilog="Códigos de salida: 0 sin enlaces no válidos, 1 hay enlaces no válidos, "
+               "2 argumentos incorrectos, 3 error de archivo, 4 error interno, 130 detenida (Ctrl+C o SIGTERM)."
+    )
+    parser.add_argument("ruta", help="libro .xlsx/.xlsm, carpeta o patrón glob de libros, "
+                                     "o archivo .csv/.tsv/.jsonl/.parquet")
+    parser.add_argument("-c", "--columna", required=True,
+                        help="columna de URLs: letra en Excel (C); nombre o índice en CSV/JSONL/Parquet")
+    parser.add_argument("-r", "--resultado", help="columna de resultados en Excel (Z)")
+    parser.add_argument("-H", "--hoja", help="hoja (por defecto, la primera de cada libro)")
+    parser.add_argument("--desde", type=int, default=UI_FILA_INICIO_DEFAULT,
+                        help=f"primera fila (por defecto {UI_FILA_INICIO_DEFAULT})")
+    parser.add_argument("--hasta", type=int, default=FILA_MAXIMA_EXCEL,
+                        help="última fila (por defecto, hasta el final de la hoja)")
+    parser.add_argument("-o", "--salida", help="archivo de resultados .csv/.jsonl/.parquet "
+                                               "(obligatorio con entradas CSV/JSONL/Parquet)")
+    parser.add_argument("--incremental", action="store_true",
+                        help="validar solo filas sin resultado o verificadas hace tiempo")
+    parser.add_argument("--reanudar", action="store_true",
+                        help="continuar una ejecución interrumpida con la misma configuración")
+    parser.add_argument("--hilos", type=int, default=MAX_HILOS_VALIDACION,
+                        help=f"hilos de validación (por defecto {MAX_HILOS_VALIDACION})")
+    parser.add_argument("--delay", type=float, default=DELAY_DEFAULT,
+                        help=f"segundos entre peticiones al mismo dominio (por defecto {DELAY_DEFAULT})")
+    parser.add_argument("--procesos-html", type=int, default=PROCESOS_ANALISIS_HTML,
+                        help="procesos para analizar el HTML en paralelo (0 = en los hilos de red; "
+                             "útil con varios núcleos)")
+    parser.add_argument("--sin-cache", action="store_true", help="no usar la caché de resultados")
+    parser.add_argument("--sin-detalles", action="store_true",
+                        help="no crear el archivo <libro>.detalles_<fecha>")
+    parser.add_argument("--intervalo", type=float, default=CLI_INTERVALO_PROGRESO,
+                        help=f"segundos entre líneas de progreso (por defecto {CLI_INTERVALO_PROGRESO:g})")
+    parser.add_argument("--log", help="guardar también los mensajes en este archivo")
+    return parser
+
+
+def modo_de_ejecucion(args, parser):
+    # 'datos' (CSV/JSONL/Parquet), 'libro' o 'carpeta', tras validar los argumentos
+    extension = os.path.splitext(args.ruta)[1].lower()
+    if extension in FUENTES_POR_EXTENSION:
+        if not args.salida:
+            parser.error("con entradas CSV/JSONL/Parquet hace falta --salida")
+        return 'datos'
+
+    args.columna = args.columna.strip().upper()
+    if not _PATRON_COLUMNA.match(args.columna):
+        parser.error(f"--columna debe ser una letra de columna de Excel (C, AB...), no '{args.columna}'")
+    if not args.resultado or not _PATRON_COLUMNA.match(args.resultado.strip().upper()):
+        parser.error("--resultado es obligatorio con libros Excel y debe ser una letra de columna")
+    if args.desde < 1 or args.hasta < args.desde:
+        parser.error("el rango de filas no es válido: debe cumplirse 1 <= --desde <= --hasta")
+    if os.path.isfile(args.ruta) and extension not in EXTENSIONES_LIBRO:
+        parser.error(f"formato no soportado: {extension or args.ruta}")
+    return 'libro' if os.path.isfile(args.ruta) else 'carpeta'
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if args.hilos < 1:
+        parser.error("--hilos debe ser al menos 1")
+    if args.procesos_html < 0:
+        parser.error("--procesos-html no puede ser negativo")
+    modo = modo_de_ejecucion(args, parser)
+
+    logger = get_logger(guardar_en_archivo=bool(args.log), ruta_archivo=args.log)
+    progreso = ProgresoConsola(logger, args.intervalo)
+    detener = Detencion(logger)
+    detener.instalar()
+
+    validador = None
+    try:
+        # Dentro del try: la caché también puede fallar (disco lleno, base dañada)
+        validador = LinkValidator(
+            max_hilos=args.hilos,
+            cache=None if args.sin_cache else CacheResultados(),
+            procesos_html=args.procesos_html
+        )
+        if modo == 'datos':
+            return validar_archivo_datos(args, validador, progreso, detener, logger)
+        if modo == 'libro':
+            return validar_libro(args, validador, progreso, detener, logger)
+        rutas = expandir_rutas(args.ruta)
+        if not rutas:
+            logger.error(f"{EMOJI_NO_VALIDO} No hay libros .xlsx/.xlsm en: {args.ruta}")
+            return SALIDA_ERROR_ARCHIVO
+        return validar_carpeta(args, rutas, validador, progreso, detener, logger)
+
+    except KeyboardInterrupt:
+        logger.warning(f"{EMOJI_CUIDADO} Interrumpida")
+        return SALIDA_INTERRUMPIDA
+    except FileNotFoundError as e:
+        logger.error(f"{EMOJI_NO_VALIDO} Archivo no encontrado: {e}")
+        return SALIDA_ERROR_ARCHIVO
+    except PermissionError as e:
+        logger.error(f"{EMOJI_NO_VALIDO} Archivo bloqueado o sin permisos (¿abierto en Excel?): {e}")
+        return SALIDA_ERROR_ARCHIVO
+    except FormatoArchivoNoSoportado as e:
+        logger.error(f"{EMOJI_NO_VALIDO} {e}")
+        return SALIDA_ERROR_USO
+    except errores_archivo_excel() as e:
+        logger.error(f"{EMOJI_NO_VALIDO} Archivo no válido: {e}")
+        return SALIDA_ERROR_ARCHIVO
+    except OSError as e:
+        logger.error(f"{EMOJI_NO_VALIDO} Error al leer o escribir un archivo: {e}")
+        return SALIDA_ERROR_ARCHIVO
+    except sqlite3.Error as e:
+        logger.error(f"{EMOJI_NO_VALIDO} Error en la caché de resultados (--sin-cache para no usarla): {e}")
+        return SALIDA_ERROR_ARCHIVO
+    except Exception as e:
+        # Un fallo del programa no puede salir con 1, que es "hay enlaces no válidos"
+        registrar_error(logger, MensajesError.error_inesperado(type(e).__name__, str(e), "cli.py"))
+        logger.error(traceback.format_exc().rstrip())
+        return SALIDA_ERROR_INTERNO
+    finally:
+        if validador is not None:
+            validador.cerrar()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,18 @@
 # Constantes y configuraciones fijas de la aplicación
 # ============================================================================
 
+import os
+import sys
+
+# Carpeta de los archivos que crea la aplicación (logs y caché): la del
+# ejecutable empaquetado o la raíz del proyecto, desde donde se lance
+if getattr(sys, 'frozen', False):
+    DIRECTORIO_DATOS = os.path.dirname(sys.executable)
+else:
+    DIRECTORIO_DATOS = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+RUTA_LOGS = os.path.join(DIRECTORIO_DATOS, "logs_validacion.txt")
+
 # Headers para las peticiones HTTP
 HEADERS_HTTP = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -24,9 +36,78 @@ TIMEOUT_HTTP = 13
 # Número máximo de reintentos
 MAX_REINTENTOS = 1 
 
-# Delay por defecto entre validaciones (segundos)
+# Intervalo mínimo por defecto entre peticiones al mismo dominio (segundos)
 DELAY_DEFAULT = 2.0
 
+# Intervalos específicos por dominio (ej: {'scholar.google.com': 5.0})
+INTERVALOS_POR_HOST = {}
+
+# Número de hilos que validan URLs en paralelo
+MAX_HILOS_VALIDACION = 8
+
+# Validación en streaming: filas como máximo entre la lectura y la escritura
+# (en la red o esperando a una fila anterior) y URLs recientes recordadas
+VENTANA_FILAS_LOTE = 2000
+MAX_URLS_RECIENTES = 5000
+
+# Descarga de HTML para análisis de contenido
+MAX_BYTES_HTML = 2 * 1024 * 1024  # No se leen más de 2 MB por página
+TAMANO_BLOQUE_HTML = 64 * 1024    # Tamaño de cada bloque leído de la red
+
+# Procesos para analizar el HTML (0 = en el hilo que descarga la página).
+# Con muchas páginas HTML el análisis retiene el GIL y frena a los hilos de
+# red; en un equipo con varios núcleos conviene usar los núcleos libres.
+PROCESOS_ANALISIS_HTML = 0
+# Veces que se rehace el pool si un proceso muere; después se analiza en hilos
+MAX_REINICIOS_POOL_HTML = 3
+
+# Circuit breaker por dominio
+UMBRAL_FALLOS_HOST = 3          # Timeouts/errores de conexión seguidos para abrirlo
+TIEMPO_CIRCUITO_ABIERTO = 60.0  # Segundos antes de probar de nuevo el host
+
+# Resolución DNS previa a la fase HTTP
+MAX_HILOS_DNS = 32
+TTL_CACHE_DNS = 300  # Segundos que se recuerda si un dominio existe
+
+# Hosts recordados como máximo por el planificador, el circuit breaker y la
+# caché DNS (el servicio HTTP ve dominios nuevos mientras esté en marcha)
+MAX_HOSTS_RECORDADOS = 10000
+
+# Caché persistente de resultados (junto a logs_validacion.txt)
+RUTA_CACHE_RESULTADOS = os.path.join(DIRECTORIO_DATOS, "cache_validacion.db")
+
+# Tiempo de vida en caché según el resultado (segundos); 0 = no guardar
+TTL_CACHE_POR_ESTADO = {
+    'valido': 7 * 24 * 3600,   # Los enlaces válidos cambian poco
+    'validar': 24 * 3600,
+    'no_valido': 3600,         # Los errores pueden ser temporales
+}
+
+# Escritura de resultados: tamaño de bloque al copiar/parchear el .xlsx
+TAMANO_BLOQUE_XLSX = 1024 * 1024
+
+# Lectura de libros: a partir de este tamaño de sharedStrings.xml la tabla de
+# cadenas compartidas se guarda en archivos temporales en lugar de en memoria
+UMBRAL_CADENAS_EN_DISCO = 4 * 1024 * 1024
+
+# Fuentes CSV / JSONL / Parquet: filas por bloque (acota la memoria)
+TAMANO_BLOQUE_FILAS = 5000
+
+# Archivo de detalle por fila junto al libro (Parquet si hay pyarrow, si no CSV)
+TAMANO_BLOQUE_DETALLES = 1000  # Filas acumuladas antes de cada escritura
+
+# Modo incremental: las filas que ya tienen resultado se vuelven a validar
+# solo si su URL se verificó hace más de este tiempo (None = nunca)
+ANTIGUEDAD_REVALIDACION = 30 * 24 * 3600
+
+# Diario de ejecución para reanudar validaciones interrumpidas
+SUFIJO_DIARIO_EJECUCION = ".diario_validacion.jsonl"  # libro.xlsx -> libro.diario_validacion.jsonl
+DIARIO_FSYNC_CADA = 50  # Resultados entre cada escritura forzada a disco
+
+# Pool de conexiones HTTP reutilizables
+POOL_HOSTS_HTTP = 50          # Hosts distintos con conexiones guardadas
+POOL_CONEXIONES_POR_HOST = 10  # Conexiones abiertas como máximo por host
+
 
 # ============================================================================
 # PALABRAS CLAVE PARA DETECCIÓN DE CONTENIDO
@@ -97,8 +178,12 @@ MENSAJE_TIMEOUT = "Timeout"
 MENSAJE_ERROR_CONEXION = "Error de conexión"
 MENSAJE_DEMASIADAS_REDIRECCIONES = "Demasiadas redirecciones"
 MENSAJE_ERROR_REINTENTOS = "Error después de reintentos"
+MENSAJE_HOST_NO_DISPONIBLE = "Host no disponible (demasiados fallos seguidos)"
 MENSAJE_PAGINA_PROBLEMATICA = "Página de error/bloqueada/dominio en venta"
 MENSAJE_REQUIERE_LOGIN = "Requiere login"
+MENSAJE_ANALISIS_FALLIDO = "No se pudo analizar el contenido"
+MENSAJE_CUERPO_CORTADO = "Conexión cortada al leer la página"
+MENSAJE_ERROR_INESPERADO = "Error inesperado al validar"
 
 # Valores que se escriben en Excel
 VALOR_EXCEL_VALIDO = "VÁLIDO"
@@ -106,6 +191,41 @@ VALOR_EXCEL_NO_VALIDO = "NO VÁLIDO"
 VALOR_EXCEL_VALIDAR = "VALIDAR"
 
 
+# ============================================================================
+# LÍNEA DE COMANDOS (cli.py)
+# ============================================================================
+
+# Última fila de una hoja de Excel (--hasta por defecto)
+FILA_MAXIMA_EXCEL = 1048576
+
+# Segundos entre líneas de progreso
+CLI_INTERVALO_PROGRESO = 2.0
+
+# Códigos de salida
+SALIDA_OK = 0
+SALIDA_HAY_NO_VALIDOS = 1      # Terminó, pero hay enlaces no válidos
+SALIDA_ERROR_USO = 2           # Argumentos incorrectos (igual que argparse)
+SALIDA_ERROR_ARCHIVO = 3       # No se pudo leer o guardar algún archivo
+SALIDA_ERROR_INTERNO = 4       # Fallo no previsto del programa (ver el traceback en el log)
+SALIDA_INTERRUMPIDA = 130      # Ctrl+C o SIGTERM; lo validado queda en el diario
+
+
+# ============================================================================
+# SERVICIO HTTP LOCAL (servicio.py)
+# ============================================================================
+
+# Solo escucha en la propia máquina salvo que se indique otra dirección
+SERVICIO_HOST = "127.0.0.1"
+SERVICIO_PUERTO = 8787
+
+# Tamaño máximo de un lote enviado como JSON (se carga entero); los lotes
+# NDJSON o de texto se leen línea a línea y no tienen límite
+SERVICIO_MAX_BYTES_JSON = 10 * 1024 * 1024
+
+# Los lotes NDJSON o de texto pasan a disco a partir de este tamaño
+SERVICIO_BYTES_LOTE_EN_MEMORIA = 1024 * 1024
+
+
 # ============================================================================
 # CONFIGURACIÓN DE LA INTERFAZ
 # ============================================================================
@@ -167,4 +287,5 @@ EMOJI_CONFIGURACION = "⚙️"
 EMOJI_INICIO = "🔄"
 EMOJI_CADENA = "🔗"
 EMOJI_DETENER = "⏹"
-EMOJI_PAUSAR = "⏸"
\ No newline at end of file
+EMOJI_PAUSAR = "⏸"
+EMOJI_CARGANDO = "⏳"
\ No newline at end of file
@@ -9,18 +9,18 @@ import time
 import subprocess
 import platform
 from tkinter import filedialog, messagebox
-import pandas as pd
-from openpyxl import load_workbook
 
-from model.link_validator import LinkValidator
+from model.link_validator import LinkValidator, es_vacia
+from model.cache_resultados import CacheResultados
+from model.diario_ejecucion import DiarioEjecucion
+from model.registro_detalles import RegistroDetalles
+from model.trabajo_validacion import ObjetivoValidacion, TrabajoValidacion
+from model.lote_libros import LoteLibros, expandir_rutas
 from view.validador_view import ValidadorView
 from logger import get_logger
-from errors import MensajesError, registrar_error, mostrar_error
+from errors import MensajesError, registrar_error, mostrar_error, errores_archivo_excel
 from config.constants import (
     DELAY_DEFAULT,
-    VALOR_EXCEL_VALIDO,
-    VALOR_EXCEL_NO_VALIDO,
-    VALOR_EXCEL_VALIDAR,
     EMOJI_VALIDO,
     EMOJI_NO_VALIDO,
     EMOJI_VALIDAR,
@@ -32,26 +32,32 @@ from config.constants import (
     EMOJI_CONTINUAR,
     EMOJI_CONFIGURACION,
     EMOJI_GUARDADO,
-    EMOJI_INICIO
+    EMOJI_CARGANDO,
+    EMOJI_INICIO,
+    RUTA_LOGS
 )
 
 
 class ValidadorController:    
     def __init__(self, root):
         self.root = root
-        self.logger = get_logger(guardar_en_archivo=True, ruta_archivo="logs_validacion.txt")
+        self.logger = get_logger(guardar_en_archivo=True, ruta_archivo=RUTA_LOGS)
         
         # Crear Modelo y Vista
-        self.modelo = LinkValidator()
+        self.modelo = LinkValidator(cache=CacheResultados())
         self.vista = ValidadorView(root)
         
         # Variables de estado del controlador
         self.excel_path = None
-        self.df = None
-        self.columnas = []
+        self.hojas_info = {}
+        self.cargando_archivo = False
         self.validacion_corriendo = False
         self.detener_validacion = False
         self.pausar_validacion = False  
+        self.diario = None
+        self.detalles = None
+        self.objetivos = []
+        self.trabajo = None
         
         # Conectar eventos de la Vista con métodos del Controlador
         self.conectar_eventos()
@@ -70,6 +76,9 @@ class ValidadorController:
         self.vista.vincular_boton_ver_logs(self.abrir_logs)
         self.vista.vincular_boton_pausar(self.pausar_reanudar_validacion)
         self.vista.vincular_boton_detener(self.detener_validacion_manual)
+        self.vista.vincular_boton_agregar_objetivo(self.agregar_objetivo)
+        self.vista.vincular_boton_quitar_objetivo(self.quitar_objetivo)
+        self.vista.vincular_boton_carpeta(self.iniciar_validacion_carpeta)
     
     def configurar_drag_drop(self):
         try:
@@ -90,7 +99,7 @@ class ValidadorController:
     
     def abrir_logs(self):
        
-        ruta_logs = "logs_validacion.txt"
+        ruta_logs = RUTA_LOGS
         if not os.path.exists(ruta_logs):
             messagebox.showinfo(
                 "Logs no disponibles",
@@ -133,50 +142,46 @@ class ValidadorController:
         self.cargar_archivo(filepath)
     
     def cargar_archivo(self, filepath):
+        if self.cargando_archivo or self.validacion_corriendo:
+            messagebox.showwarning("Advertencia", "Espera a que termine la operación en curso")
+            return
+        
+        nombre_archivo = os.path.basename(filepath)
+        self.logger.info(f"{EMOJI_ARCHIVO} Intentando cargar archivo: {nombre_archivo}")
+        self.cargando_archivo = True
+        self.vista.mostrar_cargando_archivo(nombre_archivo)
+        
+        # Solo se leen los metadatos del libro, en un hilo para no congelar la ventana
+        thread = threading.Thread(target=self.leer_metadatos_archivo, args=(filepath,), daemon=True)
+        thread.start()
+    
+    def leer_metadatos_archivo(self, filepath):
+        nombre_archivo = os.path.basename(filepath)
+        
+        def progreso_hojas(idx, total, hoja):
+            texto = f"{EMOJI_CARGANDO} Leyendo hoja {idx}/{total}: {hoja}"
+            self.root.after(0, lambda: self.vista.actualizar_carga_archivo(texto))
+        
         try:
-            nombre_archivo = os.path.basename(filepath)
-            self.logger.info(f"{EMOJI_ARCHIVO} Intentando cargar archivo: {nombre_archivo}")
-            
-            # Leer archivo Excel y obtener hojas
-            xls = pd.ExcelFile(filepath)
-            hojas = xls.sheet_names
-            
-            # Leer la primera hoja
-            self.df = pd.read_excel(filepath, sheet_name=0)
-            self.excel_path = filepath
-            self.columnas = self.df.columns.tolist()
-            
-            # Actualizar la Vista
-            self.vista.mostrar_archivo_cargado(
-                nombre_archivo,
-                len(self.df),
-                len(self.columnas),
-                hojas
-            )
-            
-            # Log de éxito usando el logger
-            self.logger.log_carga_archivo(nombre_archivo, len(self.df), len(self.columnas), hojas)
+            from model.lector_excel import LectorExcel
+            with LectorExcel(filepath) as lector:
+                metadatos = lector.leer_metadatos(callback=progreso_hojas)
+            self.root.after(0, lambda: self.archivo_cargado(filepath, metadatos))
             
         except FileNotFoundError as e:
             # Usar mensaje centralizado
             msg = MensajesError.archivo_no_encontrado(filepath, str(e))
-            registrar_error(self.logger, msg)
-            self.vista.mostrar_error_carga()
-            mostrar_error(msg, messagebox)
+            self.root.after(0, lambda: self.error_carga_archivo(msg))
             
         except PermissionError as e:
             # Usar mensaje centralizado
             msg = MensajesError.archivo_bloqueado(nombre_archivo, str(e))
-            registrar_error(self.logger, msg)
-            self.vista.mostrar_error_carga()
-            mostrar_error(msg, messagebox)
+            self.root.after(0, lambda: self.error_carga_archivo(msg))
             
-        except ValueError as e:
+        except errores_archivo_excel() as e:
             # Usar mensaje centralizado
             msg = MensajesError.archivo_corrupto(nombre_archivo, str(e))
-            registrar_error(self.logger, msg)
-            self.vista.mostrar_error_carga()
-            mostrar_error(msg, messagebox)
+            self.root.after(0, lambda: self.error_carga_archivo(msg))
             
         except Exception as e:
             # Usar mensaje centralizado para error inesperado
@@ -185,19 +190,51 @@ class ValidadorController:
                 str(e),
                 f"Cargando archivo: {nombre_archivo}"
             )
-            registrar_error(self.logger, msg)
-            self.vista.mostrar_error_carga()
-            mostrar_error(msg, messagebox)
+            self.root.after(0, lambda: self.error_carga_archivo(msg))
+    
+    def archivo_cargado(self, filepath, metadatos):
+        # Corre en el hilo de la interfaz (vía root.after)
+        self.cargando_archivo = False
+        nombre_archivo = os.path.basename(filepath)
+        self.excel_path = filepath
+        self.hojas_info = {info['hoja']: info for info in metadatos}
+        self.objetivos = []
+        self.vista.mostrar_objetivos([])
+        hojas = [info['hoja'] for info in metadatos]
+        
+        primera = metadatos[0] if metadatos else {'filas': None, 'columnas': None}
+        num_filas = primera['filas'] if primera['filas'] is not None else "?"
+        num_columnas = primera['columnas'] if primera['columnas'] is not None else "?"
+        
+        # Actualizar la Vista
+        self.vista.mostrar_archivo_cargado(nombre_archivo, num_filas, num_columnas, hojas)
+        
+        # Log de éxito usando el logger
+        self.logger.log_carga_archivo(nombre_archivo, num_filas, num_columnas, hojas)
+    
+    def error_carga_archivo(self, msg):
+        # Corre en el hilo de la interfaz (vía root.after)
+        self.cargando_archivo = False
+        registrar_error(self.logger, msg)
+        self.vista.mostrar_error_carga()
+        mostrar_error(msg, messagebox)
     
     # ========================================================================
     # VALIDACIÓN DE CONFIGURACIÓN
     # ========================================================================
     
     def validar_configuracion(self):
-        if not self.excel_path or self.df is None:
+        if not self.excel_path or not self.hojas_info:
             messagebox.showwarning("Advertencia", "Primero debes cargar un archivo Excel")
             return False
         
+        # Los objetivos de la lista se validaron al añadirlos
+        if self.objetivos:
+            return True
+        
+        return self.validar_campos_objetivo()
+    
+    def validar_campos_objetivo(self):
         # Obtener valores de la Vista
         columna = self.vista.obtener_columna()
         
@@ -223,13 +260,14 @@ class ValidadorController:
                 messagebox.showerror("Error", "La fila inicial debe ser menor o igual a la final")
                 return False
                 
-            # Verificar que la columna exista en el archivo
+            # Verificar que la columna exista en la hoja (si el libro trae sus dimensiones)
             col_idx = self.modelo.letra_a_indice(columna)
-            if col_idx >= len(self.df.columns):
+            num_columnas = self.hojas_info.get(self.vista.obtener_hoja(), {}).get('columnas')
+            if num_columnas is not None and col_idx >= num_columnas:
                 messagebox.showerror(
                     "Error", 
                     f"La columna '{columna}' está fuera del rango.\n"
-                    f"El archivo tiene {len(self.df.columns)} columnas."
+                    f"La hoja tiene {num_columnas} columnas."
                 )
                 return False
                 
@@ -239,6 +277,51 @@ class ValidadorController:
         
         return True
     
+    # ========================================================================
+    # OBJETIVOS DEL TRABAJO (varias hojas / columnas en una sola ejecución)
+    # ========================================================================
+    
+    def objetivo_desde_vista(self):
+        return ObjetivoValidacion(
+            self.vista.obtener_hoja(),
+            self.vista.obtener_columna(),
+            self.vista.obtener_fila_inicio(),
+            self.vista.obtener_fila_fin(),
+            self.vista.obtener_columna_resultado()
+        )
+    
+    def objetivos_a_validar(self):
+        return list(self.objetivos) or [self.objetivo_desde_vista()]
+    
+    def agregar_objetivo(self):
+        if self.validacion_corriendo:
+            return
+        if not self.excel_path or not self.hojas_info:
+            messagebox.showwarning("Advertencia", "Primero debes cargar un archivo Excel")
+            return
+        if not self.validar_campos_objetivo():
+            return
+        
+        objetivo = self.objetivo_desde_vista()
+        if objetivo in self.objetivos:
+            messagebox.showwarning("Advertencia", "Ese objetivo ya está en la lista")
+            return
+        
+        self.objetivos.append(objetivo)
+        self.vista.mostrar_objetivos([o.descripcion() for o in self.objetivos])
+        self.logger.info(f"{EMOJI_HOJA} Objetivo añadido: {objetivo.descripcion()}")
+    
+    def quitar_objetivo(self):
+        if self.validacion_corriendo:
+            return
+        indice = self.vista.obtener_objetivo_seleccionado()
+        if indice is None or indice >= len(self.objetivos):
+            return
+        
+        objetivo = self.objetivos.pop(indice)
+        self.vista.mostrar_objetivos([o.descripcion() for o in self.objetivos])
+        self.logger.info(f"{EMOJI_HOJA} Objetivo quitado: {objetivo.descripcion()}")
+    
     # ========================================================================
     # INICIO Y EJECUCIÓN DE VALIDACIÓN
     # ========================================================================
@@ -249,6 +332,10 @@ class ValidadorController:
             messagebox.showwarning("Advertencia", "Ya hay una validación en curso")
             return
         
+        if self.cargando_archivo:
+            messagebox.showwarning("Advertencia", "Espera a que termine de cargarse el archivo")
+            return
+        
         # Validar configuración
         if not self.validar_configuracion():
             return
@@ -286,7 +373,8 @@ class ValidadorController:
         respuesta = messagebox.askyesno(
             "Confirmar detención",
             "¿Estás seguro de que quieres detener la validación?\n\n"
-            "Los resultados procesados hasta ahora se perderán."
+            "Los resultados procesados hasta ahora quedan guardados en el diario\n"
+            "de ejecución y podrás reanudar la validación más tarde."
         )
         
         if respuesta:
@@ -296,127 +384,132 @@ class ValidadorController:
     
     def ejecutar_validacion(self):
         try:
-            # Obtener valores de la Vista
-            columna = self.vista.obtener_columna()
-            fila_ini = self.vista.obtener_fila_inicio()
-            fila_fin = self.vista.obtener_fila_fin()
-            hoja = self.vista.obtener_hoja()
+            # Objetivos del trabajo: los de la lista o, si está vacía, el de los campos
+            objetivos = self.objetivos_a_validar()
+            incremental = self.vista.obtener_modo_incremental()
             
             delay = DELAY_DEFAULT
             
             self.logger.info(f"{EMOJI_CONFIGURACION} Configuración de validación:")
             self.logger.info(f"{EMOJI_ARCHIVO}  → Archivo: {os.path.basename(self.excel_path)}")
-            self.logger.info(f"   → Hoja: {hoja}")
-            self.logger.info(f"   → Columna: {columna}")
-            self.logger.info(f"   → Rango: Filas {fila_ini} a {fila_fin}")
+            for objetivo in objetivos:
+                self.logger.info(f"   → Hoja: {objetivo.hoja}")
+                self.logger.info(f"   → Columna: {objetivo.columna}")
+                self.logger.info(f"   → Rango: Filas {objetivo.fila_ini} a {objetivo.fila_fin}")
+            
+            # Pipeline en streaming: leer → clasificar → consultar → guardar. Solo
+            # se leen las columnas y rangos pedidos, a medida que el validador
+            # tiene sitio; de cada fila validada se guarda un byte hasta escribir.
+            # Con modo incremental se lee también la columna de resultados actual.
+            self.trabajo = TrabajoValidacion(self.excel_path, objetivos, self.modelo)
+            total = self.trabajo.estimar_filas()
+            
+            # Diario de ejecución: cada resultado terminado se guarda en disco
+            # para poder reanudar si la validación se detiene o la app se cierra
+            self.diario = DiarioEjecucion(self.excel_path)
+            recuperadas = self.resultados_para_reanudar(objetivos)
+            self.diario.abrir(self.cabecera_diario(objetivos), continuar=bool(recuperadas))
+            total = max(0, total - recuperadas)
+            
+            # Detalle por fila (código, URL final, bytes, tiempo) en un archivo aparte
+            self.detalles = RegistroDetalles(self.excel_path)
             
-            # Cargar la hoja seleccionada (sin encabezados)
-            self.df = pd.read_excel(self.excel_path, sheet_name=hoja, header=None)
+            # Log de inicio usando el logger
+            self.logger.log_inicio_validacion(
+                ", ".join(dict.fromkeys(o.hoja for o in objetivos)),
+                ", ".join(dict.fromkeys(o.columna for o in objetivos)),
+                min(o.fila_ini for o in objetivos),
+                max(o.fila_fin for o in objetivos),
+                total,
+                delay
+            )
             
-            # Calcular índices de pandas (empiezan en 0)
-            idx_inicio_pandas = fila_ini - 1
-            idx_fin_pandas = fila_fin
+            # Configurar barra de progreso (en modo incremental, total es un máximo)
+            self.vista.configurar_progreso_maximo(max(total, 1))
             
-            # Convertir letra de columna a índice
-            col_idx = self.modelo.letra_a_indice(columna)
+            # Registrar tiempo de inicio
+            inicio = time.time()
+            
+            # VALIDAR EN STREAMING usando el Modelo (varios hilos en paralelo)
+            self.logger.info(f"{EMOJI_INICIO} Iniciando validación de hasta {total} URLs con {self.modelo.max_hilos} hilos...")
+            procesadas = self.trabajo.validar(
+                self.trabajo.iterar_entradas(incremental),
+                delay,
+                callback=self.callback_progreso,
+                debe_detener=self.verificar_detencion,
+                total=total
+            )
             
-            # Filtrar el DataFrame
-            df_filtrado = self.df.iloc[idx_inicio_pandas:idx_fin_pandas].copy()
-            total = len(df_filtrado)
+            # URLs repetidas (también entre hojas y columnas): cada una se consulta
+            # una sola vez; el resumen final lo indica
+            solicitudes_ahorradas = self.trabajo.estadisticas.get('ahorradas', 0)
+            
+            # Verificar si se solicitó detener
+            if self.detener_validacion:
+                self.diario.cerrar()
+                self.logger.warning(f"{EMOJI_CUIDADO} Validación detenida por el usuario")
+                self.logger.warning(f"   → Procesadas: {procesadas}/{total} URLs")
+                messagebox.showinfo(
+                    "Validación detenida",
+                    f"Validación detenida por el usuario.\n\n"
+                    f"URLs procesadas: {procesadas}/{total}\n\n"
+                    f"Los resultados aún no se escribieron en el Excel, pero quedaron en el diario\n"
+                    f"de ejecución. Al volver a ejecutar con la misma configuración podrás reanudar."
+                )
+                return
             
-            if total == 0:
+            if not self.trabajo.filas_leidas:
                 # Usar mensaje centralizado
-                msg = MensajesError.rango_sin_datos(fila_ini, fila_fin)
+                self.diario.eliminar()
+                msg = MensajesError.rango_sin_datos(
+                    min(o.fila_ini for o in objetivos), max(o.fila_fin for o in objetivos)
+                )
                 self.logger.warning(f"{EMOJI_VALIDAR} {msg['que_paso']}")
                 self.logger.warning(f"   → {msg['por_que']}")
                 messagebox.showwarning(msg['titulo'], MensajesError.formatear_para_popup(msg))
                 return
             
-            # Log de inicio usando el logger
-            self.logger.log_inicio_validacion(hoja, columna, fila_ini, fila_fin, total, delay)
-            
-            # Configurar barra de progreso
-            self.vista.configurar_progreso_maximo(total)
-            
-            # Registrar tiempo de inicio
-            inicio = time.time()
-            
-            # Preparar lista de URLs con sus filas de Excel
-            urls_a_validar_con_fila = []
-            for idx_pandas, row in df_filtrado.iterrows():
-                fila_excel = idx_pandas + 1
-                
-                if col_idx < len(row):
-                    urls_a_validar_con_fila.append((fila_excel, row[col_idx]))
-                else:
-                    # Usar mensaje centralizado
-                    msg = MensajesError.columna_fuera_limites(columna, fila_excel, len(row))
-                    self.logger.warning(f"{EMOJI_VALIDAR} {msg['que_paso']}")
-                    self.logger.warning(f"   → {msg['por_que']}")
-                    self.logger.warning(f"   → Solución: {msg['como_resolver']}")
-            
-            if not urls_a_validar_con_fila:
-                self.logger.error(f"{EMOJI_NO_VALIDO} ERROR: No se encontraron URLs válidas en el rango especificado")
-                raise ValueError("No se encontraron URLs válidas en el rango especificado")
-            
-            # VALIDAR EN LOTE usando el Modelo
-            self.logger.info(f"{EMOJI_INICIO} Iniciando validación de {len(urls_a_validar_con_fila)} URLs...")
-            resultados = []
-            
-            for idx, (fila_excel, url) in enumerate(urls_a_validar_con_fila, 1):
-                # Verificar si se solicitó detener
-                if self.detener_validacion:
-                    self.logger.warning(f"{EMOJI_CUIDADO} Validación detenida por el usuario")
-                    self.logger.warning(f"   → Procesadas: {idx-1}/{len(urls_a_validar_con_fila)} URLs")
+            if incremental:
+                self.logger.info(
+                    f"{EMOJI_CONTINUAR} Modo incremental: {procesadas} de "
+                    f"{self.trabajo.filas_leidas} filas necesitaban validación"
+                )
+                if not procesadas and not recuperadas:
+                    self.diario.eliminar()
                     messagebox.showinfo(
-                        "Validación detenida",
-                        f"Validación detenida por el usuario.\n\n"
-                        f"URLs procesadas: {idx-1}/{len(urls_a_validar_con_fila)}\n\n"
-                        f"Los resultados NO se guardaron."
+                        "Modo incremental",
+                        f"Las {self.trabajo.filas_leidas} filas del rango ya tienen un resultado reciente.\n\n"
+                        f"No hay nada que validar."
                     )
                     return
-                
-                # Verificar si está pausado (esperar hasta que reanude)
-                while self.pausar_validacion:
-                    time.sleep(0.5)  # Esperar medio segundo
-                    if self.detener_validacion:  # Por si detiene mientras está pausado
-                        return
-                try:
-                    disp_url = str(url) if not pd.isna(url) else "<VACÍA>"
-                except:
-                    disp_url = "<VACÍA>"
-                short_disp = disp_url[:60] + "..." if len(disp_url) > 60 else disp_url
-                
-                self.vista.actualizar_progreso(f"Analizando {idx}/{len(urls_a_validar_con_fila)} (Fila {fila_excel}): {short_disp}", idx - 1)
-
-                # Validar URL
-                resultado = self.modelo.validar_url(url, delay)
-                resultado['fila_excel'] = fila_excel
-                resultados.append(resultado)
-                
-                # Callback de progreso
-                self.callback_progreso(url, idx, len(urls_a_validar_con_fila), resultado, fila_excel)
             
             # Calcular tiempo total
             tiempo_total = time.time() - inicio
             
             # Guardar resultados en Excel
             self.logger.info(f"{EMOJI_GUARDADO} Guardando resultados en el archivo Excel...")
-            contadores = self.guardar_resultados(hoja, resultados)
+            contadores = self.guardar_resultados()
+            
+            # Con el Excel guardado, el diario ya no hace falta
+            self.diario.eliminar()
+            self.detalles.cerrar()
+            if self.detalles.filas:
+                self.logger.info(f"{EMOJI_ARCHIVO} Detalle por fila: {os.path.basename(self.detalles.ruta)}")
             
             # Log final usando el logger
             self.logger.log_fin_validacion(
                 tiempo_total,
                 contadores['validos'],
                 contadores['no_validos'],
-                contadores['validar']
+                contadores['validar'],
+                solicitudes_ahorradas
             )
             
             # Mostrar mensaje de éxito
             messagebox.showinfo(
                 f"{EMOJI_VALIDO} Validación Completada", 
                 f"Validación finalizada exitosamente\n\n"
-                f"{EMOJI_ESTADO} Procesadas: {total} URLs\n"
+                f"{EMOJI_ESTADO} Procesadas: {procesadas + recuperadas} URLs\n"
                 f"{EMOJI_VALIDO}  Válidas: {contadores['validos']}\n"
                 f"{EMOJI_NO_VALIDO}  No válidas: {contadores['no_validos']}\n"
                 f"{EMOJI_VALIDAR}  Validar manualmente: {contadores['validar']}\n\n"
@@ -444,22 +537,191 @@ class ValidadorController:
         
         finally:
             # Siempre resetear estado al finalizar
-            self.logger.info(f"{EMOJI_INICIO} Finalizando proceso de validación...")
-            self.validacion_corriendo = False
-            self.detener_validacion = False
-            self.pausar_validacion = False
-            self.vista.habilitar_boton_ejecutar()
-            self.vista.deshabilitar_boton_pausar()
-            self.vista.deshabilitar_boton_detener()
-            self.vista.resetear_progreso()
+            self.finalizar_ejecucion()
+    
+    def finalizar_ejecucion(self):
+        self.logger.info(f"{EMOJI_INICIO} Finalizando proceso de validación...")
+        if self.diario is not None:
+            self.diario.cerrar()
+            self.diario = None
+        if self.detalles is not None:
+            self.detalles.cerrar()
+            self.detalles = None
+        self.validacion_corriendo = False
+        self.detener_validacion = False
+        self.pausar_validacion = False
+        self.vista.habilitar_boton_ejecutar()
+        self.vista.deshabilitar_boton_pausar()
+        self.vista.deshabilitar_boton_detener()
+        self.vista.resetear_progreso()
     
     # ========================================================================
-    # CALLBACK DE PROGRESO
+    # VALIDACIÓN DE UNA CARPETA DE LIBROS
     # ========================================================================
     
+    def iniciar_validacion_carpeta(self):
+        if self.validacion_corriendo:
+            messagebox.showwarning("Advertencia", "Ya hay una validación en curso")
+            return
+        
+        if self.cargando_archivo:
+            messagebox.showwarning("Advertencia", "Espera a que termine de cargarse el archivo")
+            return
+        
+        # La columna, el rango y la columna de resultados de los campos valen para todos los libros
+        if not self.validar_campos_objetivo():
+            return
+        
+        carpeta = filedialog.askdirectory(title="Carpeta con los libros a validar")
+        if not carpeta:
+            return
+        
+        self.validacion_corriendo = True
+        self.detener_validacion = False
+        self.pausar_validacion = False
+        self.vista.deshabilitar_boton_ejecutar()
+        
+        thread = threading.Thread(target=self.ejecutar_validacion_carpeta, args=(carpeta,), daemon=True)
+        thread.start()
+    
+    def ejecutar_validacion_carpeta(self, carpeta):
+        try:
+            rutas = expandir_rutas(carpeta)
+            if not rutas:
+                messagebox.showwarning("Advertencia", f"No hay libros .xlsx en:\n{carpeta}")
+                return
+            
+            # Hoja: la elegida si hay un libro cargado; si no, la primera de cada libro
+            hoja = self.vista.obtener_hoja() or None
+            objetivo = self.objetivo_desde_vista()
+            
+            self.logger.info(f"{EMOJI_CONFIGURACION} Validación de carpeta: {carpeta}")
+            self.logger.info(f"   → Libros: {len(rutas)}")
+            self.logger.info(f"   → Hoja: {hoja or '(primera de cada libro)'}")
+            self.logger.info(f"   → Columna: {objetivo.columna} | Filas {objetivo.fila_ini} a {objetivo.fila_fin}")
+            self.logger.info(f"   → Columna resultado: {objetivo.columna_resultado}")
+            
+            self.trabajo = None
+            lote = LoteLibros(
+                rutas, hoja, objetivo.columna, objetivo.fila_ini, objetivo.fila_fin,
+                objetivo.columna_resultado, self.modelo
+            )
+            
+            def al_empezar_libro(indice, total_libros, ruta, filas):
+                self.logger.info(f"{EMOJI_ARCHIVO} [{indice}/{total_libros}] {os.path.basename(ruta)}: hasta {filas} filas")
+                self.vista.configurar_progreso_maximo(max(filas, 1))
+                self.vista.actualizar_progreso(f"Libro {indice}/{total_libros}: {os.path.basename(ruta)}", 0)
+            
+            inicio = time.time()
+            resumen = lote.ejecutar(
+                DELAY_DEFAULT,
+                incremental=self.vista.obtener_modo_incremental(),
+                callback=self.callback_progreso,
+                debe_detener=self.verificar_detencion,
+                al_empezar_libro=al_empezar_libro
+            )
+            totales = LoteLibros.totales(resumen)
+            
+            # Resumen combinado: una línea por libro y los totales
+            lineas = []
+            for registro in resumen:
+                nombre = os.path.basename(registro['archivo'])
+                if registro['error']:
+                    self.logger.error(f"{EMOJI_NO_VALIDO} {nombre}: {registro['error']}")
+                    lineas.append(f"{EMOJI_NO_VALIDO} {nombre}: {registro['error']}")
+                else:
+                    c = registro['contadores']
+                    self.logger.success(
+                        f"{EMOJI_VALIDO} {nombre}: {c['validos']} válidas, {c['no_validos']} no válidas, "
+                        f"{c['validar']} a validar ({registro['segundos']:.1f} s)"
+                    )
+                    lineas.append(f"{EMOJI_VALIDO} {nombre}: {c['validos']} / {c['no_validos']} / {c['validar']}")
+                if registro['detalles']:
+                    self.logger.info(f"{EMOJI_ARCHIVO} Detalle por fila: {os.path.basename(registro['detalles'])}")
+            
+            self.logger.log_fin_validacion(
+                time.time() - inicio,
+                totales['validos'],
+                totales['no_validos'],
+                totales['validar']
+            )
+            
+            if len(lineas) > 15:
+                lineas = lineas[:15] + [f"... y {len(lineas) - 15} libros más (ver logs)"]
+            messagebox.showinfo(
+                f"{EMOJI_VALIDO} Validación de carpeta",
+                f"Libros procesados: {totales['libros'] - totales['con_error']}/{len(rutas)}\n"
+                f"{EMOJI_ESTADO} Filas: {totales['filas']}\n"
+                f"{EMOJI_VALIDO}  Válidas: {totales['validos']}\n"
+                f"{EMOJI_NO_VALIDO}  No válidas: {totales['no_validos']}\n"
+                f"{EMOJI_VALIDAR}  Validar manualmente: {totales['validar']}\n\n"
+                f"Por libro (válidas / no válidas / validar):\n" + "\n".join(lineas)
+            )
+        
+        except Exception as e:
+            msg = MensajesError.error_inesperado(type(e).__name__, str(e), "Validación de carpeta")
+            registrar_error(self.logger, msg)
+            mostrar_error(msg, messagebox)
+        
+        finally:
+            self.finalizar_ejecucion()
+    
+    def cabecera_diario(self, objetivos):
+        return {
+            'archivo': os.path.basename(self.excel_path),
+            'objetivos': [objetivo.como_dict() for objetivo in objetivos],
+        }
+    
+    def resultados_para_reanudar(self, objetivos):
+        # Si el diario coincide con la configuración y el usuario quiere reanudar,
+        # registra sus resultados en el trabajo (que ya no volverá a leer esas
+        # filas) y devuelve cuántos hay; si no, 0
+        if not self.diario.existe():
+            return 0
+        
+        if self.diario.leer_cabecera() != self.cabecera_diario(objetivos):
+            self.logger.info(f"{EMOJI_CUIDADO} Hay un diario de otra configuración; se empezará uno nuevo")
+            return 0
+        
+        # Se cuenta recorriendo el diario, sin cargarlo en memoria
+        registrados = sum(1 for _ in self.diario.iterar_resultados())
+        if not registrados:
+            return 0
+        
+        reanudar = messagebox.askyesno(
+            "Reanudar validación",
+            f"Se encontró una validación anterior sin terminar.\n\n"
+            f"{registrados} filas del rango ya tienen resultado.\n\n"
+            f"¿Quieres reanudarla y validar solo las filas pendientes?"
+        )
+        if not reanudar:
+            return 0
+        
+        for resultado in self.diario.iterar_resultados():
+            self.trabajo.registrar(resultado)
+        self.logger.info(f"{EMOJI_CONTINUAR} Reanudando: {registrados} filas recuperadas del diario de ejecución")
+        return registrados
+    
+    # ========================================================================
+    # CALLBACKS DE PROGRESO Y CONTROL
+    # ========================================================================
+    
+    def verificar_detencion(self):
+        # Mientras está pausado no se envían nuevas URLs a los hilos
+        while self.pausar_validacion and not self.detener_validacion:
+            time.sleep(0.5)
+        return self.detener_validacion
+    
     def callback_progreso(self, url, idx, total, resultado, fila_excel):
+        if self.diario is not None:
+            self.diario.registrar(resultado)
+        if self.detalles is not None:
+            if self.trabajo is not None:
+                resultado['hoja'] = self.trabajo.objetivos[resultado.get('objetivo', 0)].hoja
+            self.detalles.registrar(resultado)
+        
         try:
-            display_url = str(url) if not pd.isna(url) else "<VACÍA>"
+            display_url = str(url) if not es_vacia(url) else "<VACÍA>"
         except Exception:
             display_url = "<VACÍA>"
 
@@ -468,6 +730,8 @@ class ValidadorController:
 
         # Actualizar Vista
         fila_info = f"(Fila {fila_excel})"
+        if self.trabajo is not None and len(self.trabajo.objetivos) > 1:
+            fila_info = f"({self.trabajo.objetivos[resultado.get('objetivo', 0)].hoja}, fila {fila_excel})"
         texto_progreso = f"Validando {idx}/{total} {fila_info}: {short_display}"
         self.vista.actualizar_progreso(texto_progreso, idx)
 
@@ -490,54 +754,19 @@ class ValidadorController:
     # GUARDADO DE RESULTADOS EN EXCEL
     # ========================================================================
     
-    def guardar_resultados(self, hoja, resultados):
+    def guardar_resultados(self, resultados=()):
         try:
-            self.logger.info(f"{EMOJI_GUARDADO} Abriendo archivo para guardar resultados...")
-            wb = load_workbook(self.excel_path)
-            ws = wb[hoja]
-            
-            # Obtener columna de resultados
-            col_resultado = self.vista.obtener_columna_resultado()
-            col_resultado_idx = self.modelo.letra_a_indice(col_resultado) + 1
-            
-            self.logger.info(f"{EMOJI_HOJA} Escribiendo resultados en columna '{col_resultado}'...")
-            
-            # Contadores para el resumen
-            contadores = {'validos': 0, 'no_validos': 0, 'validar': 0}
-            
-            # Escribir resultados
-            for res in resultados:
-                fila_excel = res.get('fila_excel')
-                estado = res.get('estado')
-                
-                if fila_excel is None:
-                    continue
-                
-                # Si no hay estado (celda vacía), no escribir nada
-                if estado is None:
-                    ws.cell(row=fila_excel, column=col_resultado_idx, value=None)
-                    continue
-                
-                # Determinar valor a escribir usando constantes
-                if estado == 'valido':
-                    valor = VALOR_EXCEL_VALIDO
-                    contadores['validos'] += 1
-                elif estado == 'validar':
-                    valor = VALOR_EXCEL_VALIDAR
-                    contadores['validar'] += 1
-                else:  # no_valido
-                    valor = VALOR_EXCEL_NO_VALIDO
-                    contadores['no_validos'] += 1
-                
-                # Escribir en la celda
-                ws.cell(row=fila_excel, column=col_resultado_idx, value=valor)
+            for objetivo in self.trabajo.objetivos:
+                self.logger.info(
+                    f"{EMOJI_HOJA} Escribiendo resultados en columna '{objetivo.columna_resultado}' "
+                    f"de la hoja '{objetivo.hoja}'..."
+                )
             
-            # Guardar y cerrar
+            # Todas las hojas se escriben en una sola reescritura del libro
             self.logger.info(f"{EMOJI_GUARDADO} Guardando cambios en el archivo...")
-            wb.save(self.excel_path)
-            wb.close()
+            contadores = self.trabajo.guardar(resultados)
             
-            self.logger.success(f"{EMOJI_VALIDO} Resultados guardados exitosamente en columna '{col_resultado}'")
+            self.logger.success(f"{EMOJI_VALIDO} Resultados guardados exitosamente")
             
             return contadores
             
@@ -144,4 +144,15 @@ def mostrar_error(mensaje_dict, messagebox):
     messagebox.showerror(
         mensaje_dict['titulo'],
         MensajesError.formatear_para_popup(mensaje_dict)
-    )
\ No newline at end of file
+    )
+
+
+def errores_archivo_excel():
+    # Excepciones de un libro dañado o que no es Excel. Es una función para no
+    # importar openpyxl al arrancar: la expresión de un except solo se evalúa
+    # cuando ya ha saltado una excepción. Un ValueError cualquiera no entra:
+    # sería un fallo del programa, no del archivo.
+    from zipfile import BadZipFile
+    from openpyxl.utils.exceptions import InvalidFileException
+    from model.lector_excel import ArchivoExcelNoValido
+    return (ArchivoExcelNoValido, InvalidFileException, BadZipFile)
@@ -14,13 +14,15 @@ from config.constants import (
     EMOJI_INICIO,
     EMOJI_VALIDO,
     EMOJI_TIEMPO,
-    EMOJI_ESTADO
+    EMOJI_ESTADO,
+    EMOJI_CADENA,
+    RUTA_LOGS
 )
 
 class Logger:    
     def __init__(self, guardar_en_archivo=True, ruta_archivo=None):
         self.guardar_en_archivo = guardar_en_archivo
-        self.ruta_archivo = ruta_archivo or "logs_validacion.txt"
+        self.ruta_archivo = ruta_archivo or RUTA_LOGS
         
         # Si se va a guardar en archivo, crear/limpiar el archivo
         if self.guardar_en_archivo:
@@ -126,10 +128,10 @@ class Logger:
         self.separador()
         self.info(f"{EMOJI_HOJA} Hoja: {hoja}")
         self.info(f"{EMOJI_ESTADO} Columna: {columna} | Filas: {fila_ini} a {fila_fin}")
-        self.info(f"{EMOJI_TIEMPO}  Total URLs: {total} | Delay: {delay} seg")
+        self.info(f"{EMOJI_TIEMPO}  Total URLs: {total} | Delay por dominio: {delay} seg")
         self.separador()
     
-    def log_fin_validacion(self, tiempo_total, validos, no_validos, validar):
+    def log_fin_validacion(self, tiempo_total, validos, no_validos, validar, solicitudes_ahorradas=None):
         self.separador()
         self.success(f"{EMOJI_VALIDO} VALIDACIÓN COMPLETADA")
         self.separador()
@@ -137,6 +139,8 @@ class Logger:
         self.success(f"{EMOJI_VALIDO} Válidas: {validos}")
         self.warning(f"{EMOJI_VALIDAR}  Validar: {validar}")
         self.error(f"{EMOJI_NO_VALIDO} No válidas: {no_validos}")
+        if solicitudes_ahorradas:
+            self.info(f"{EMOJI_CADENA} Solicitudes ahorradas por URLs repetidas: {solicitudes_ahorradas}")
         self.separador()
     
     def log_carga_archivo(self, nombre_archivo, num_filas, num_columnas, hojas):
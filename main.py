@@ -2,11 +2,12 @@
 import tkinter as tk
 from controller.validator_Controller import ValidadorController
 from logger import get_logger
+from config.constants import RUTA_LOGS
 
 
 def main(): 
     # Inicializar el logger para capturar el arranque
-    logger = get_logger(guardar_en_archivo=True, ruta_archivo="logs_validacion.txt")
+    logger = get_logger(guardar_en_archivo=True, ruta_archivo=RUTA_LOGS)
     
     # Intentar usar TkinterDnD para drag & drop
     try:
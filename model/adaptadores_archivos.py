@@ -0,0 +1,256 @@
+# ============================================================================
+# model/adaptadores_archivos.py
+# MODELO - Fuentes y destinos en streaming (CSV, JSONL, Parquet)
+# ============================================================================
+
+import csv
+import importlib.util
+import json
+import os
+
+from config.constants import TAMANO_BLOQUE_FILAS
+from model.trabajo_validacion import VALORES_POR_ESTADO, CONTADOR_POR_ESTADO, contadores_vacios
+
+# pyarrow es opcional: solo hace falta para leer o escribir Parquet
+PYARROW_DISPONIBLE = importlib.util.find_spec('pyarrow') is not None
+
+# Campos de cada registro en los destinos
+CAMPOS_RESULTADO = ['fila', 'url', 'resultado', 'estado', 'detalles', 'codigo_http',
+                    'url_final', 'bytes_leidos', 'tiempo_ms', 'desde_cache', 'timestamp']
+
+# Tipos de cada campo al escribir Parquet
+TIPOS_PARQUET = {
+    'hoja': 'string', 'fila': 'int64', 'url': 'string', 'resultado': 'string',
+    'estado': 'string', 'detalles': 'string', 'codigo_http': 'int32',
+    'url_final': 'string', 'bytes_leidos': 'int64', 'tiempo_ms': 'float64',
+    'desde_cache': 'bool', 'timestamp': 'string',
+}
+
+
+class FormatoArchivoNoSoportado(ValueError):
+    pass
+
+
+def _bloques(filas, tamano):
+    bloque = []
+    for fila in filas:
+        bloque.append(fila)
+        if len(bloque) >= tamano:
+            yield bloque
+            bloque = []
+    if bloque:
+        yield bloque
+
+
+def registro_de_resultado(resultado, campos=CAMPOS_RESULTADO):
+    estado = resultado.get('estado')
+    url = resultado.get('url_original')
+    valores = {
+        'fila': resultado.get('fila_excel'),
+        'url': None if url is None else str(url),
+        'resultado': VALORES_POR_ESTADO.get(estado, VALORES_POR_ESTADO['no_valido']) if estado else None,
+        'desde_cache': bool(resultado.get('desde_cache')),
+    }
+    return {campo: valores[campo] if campo in valores else resultado.get(campo) for campo in campos}
+
+
+# ============================================================================
+# FUENTES: generan bloques de (fila, url)
+# ============================================================================
+
+class FuenteCSV:
+    """La fila 1 es la cabecera; los datos empiezan en la fila 2, como en Excel"""
+
+    def __init__(self, ruta, columna, delimitador=None, codificacion='utf-8-sig'):
+        self.ruta = ruta
+        self.columna = columna
+        self.delimitador = delimitador
+        self.codificacion = codificacion
+
+    def _detectar_delimitador(self, archivo):
+        muestra = archivo.read(64 * 1024)
+        archivo.seek(0)
+        try:
+            return csv.Sniffer().sniff(muestra, delimiters=',;\t|').delimiter
+        except csv.Error:
+            return ','
+
+    def leer_bloques(self, tamano=TAMANO_BLOQUE_FILAS):
+        with open(self.ruta, 'r', encoding=self.codificacion, newline='') as archivo:
+            lector = csv.reader(archivo, delimiter=self.delimitador or self._detectar_delimitador(archivo))
+            cabecera = next(lector, [])
+            if self.columna in cabecera:
+                indice = cabecera.index(self.columna)
+            elif str(self.columna).isdigit():
+                indice = int(self.columna)
+            else:
+                raise FormatoArchivoNoSoportado(f"La columna '{self.columna}' no está en la cabecera del CSV")
+            filas = (
+                (numero, registro[indice] if indice < len(registro) else None)
+                for numero, registro in enumerate(lector, start=2)
+            )
+            yield from _bloques(filas, tamano)
+
+
+class FuenteJSONL:
+    """Un objeto JSON por línea; la fila es el número de línea"""
+
+    def __init__(self, ruta, campo, codificacion='utf-8'):
+        self.ruta = ruta
+        self.campo = campo
+        self.codificacion = codificacion
+
+    def leer_bloques(self, tamano=TAMANO_BLOQUE_FILAS):
+        def filas(archivo):
+            for numero, linea in enumerate(archivo, start=1):
+                if not linea.strip():
+                    continue
+                try:
+                    registro = json.loads(linea)
+                except ValueError:
+                    # Línea corrupta: se trata como celda vacía, sin cortar el lote
+                    registro = {}
+                yield numero, registro.get(self.campo) if isinstance(registro, dict) else None
+
+        with open(self.ruta, 'r', encoding=self.codificacion) as archivo:
+            yield from _bloques(filas(archivo), tamano)
+
+
+class FuenteParquet:
+    """Lee solo la columna pedida, por lotes de filas (requiere pyarrow)"""
+
+    def __init__(self, ruta, columna):
+        if not PYARROW_DISPONIBLE:
+            raise FormatoArchivoNoSoportado("Para leer Parquet instala pyarrow: pip install pyarrow")
+        self.ruta = ruta
+        self.columna = columna
+
+    def leer_bloques(self, tamano=TAMANO_BLOQUE_FILAS):
+        import pyarrow.parquet as pq
+
+        archivo = pq.ParquetFile(self.ruta)
+        if self.columna not in archivo.schema_arrow.names:
+            raise FormatoArchivoNoSoportado(f"La columna '{self.columna}' no está en el archivo Parquet")
+        numero = 1
+        for lote in archivo.iter_batches(batch_size=tamano, columns=[self.columna]):
+            valores = lote.column(0).to_pylist()
+            yield list(enumerate(valores, start=numero))
+            numero += len(valores)
+
+
+# ============================================================================
+# DESTINOS: reciben bloques de resultados y los escriben a medida que llegan
+# ============================================================================
+
+class DestinoCSV:
+
+    def __init__(self, ruta, campos=CAMPOS_RESULTADO, codificacion='utf-8'):
+        self.ruta = ruta
+        self.campos = campos
+        self._archivo = open(ruta, 'w', encoding=codificacion, newline='')
+        self._escritor = csv.DictWriter(self._archivo, fieldnames=campos)
+        self._escritor.writeheader()
+
+    def escribir(self, resultados):
+        self._escritor.writerows(registro_de_resultado(r, self.campos) for r in resultados)
+        self._archivo.flush()
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class DestinoJSONL:
+
+    def __init__(self, ruta, campos=CAMPOS_RESULTADO, codificacion='utf-8'):
+        self.ruta = ruta
+        self.campos = campos
+        self._archivo = open(ruta, 'w', encoding=codificacion)
+
+    def escribir(self, resultados):
+        self._archivo.writelines(
+            json.dumps(registro_de_resultado(r, self.campos), ensure_ascii=False) + '\n' for r in resultados
+        )
+        self._archivo.flush()
+
+    def cerrar(self):
+        self._archivo.close()
+
+
+class DestinoParquet:
+    """Cada bloque se escribe como un row group (requiere pyarrow)"""
+
+    def __init__(self, ruta, campos=CAMPOS_RESULTADO):
+        if not PYARROW_DISPONIBLE:
+            raise FormatoArchivoNoSoportado("Para escribir Parquet instala pyarrow: pip install pyarrow")
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        self.ruta = ruta
+        self.campos = campos
+        self._pa = pa
+        self._esquema = pa.schema([(campo, pa.type_for_alias(TIPOS_PARQUET[campo])) for campo in campos])
+        self._escritor = pq.ParquetWriter(ruta, self._esquema)
+
+    def escribir(self, resultados):
+        registros = [registro_de_resultado(r, self.campos) for r in resultados]
+        if registros:
+            self._escritor.write_table(self._pa.Table.from_pylist(registros, schema=self._esquema))
+
+    def cerrar(self):
+        self._escritor.close()
+
+
+# ============================================================================
+# FÁBRICAS Y PROCESO POR BLOQUES
+# ============================================================================
+
+FUENTES_POR_EXTENSION = {'.csv': FuenteCSV, '.tsv': FuenteCSV, '.jsonl': FuenteJSONL,
+                         '.ndjson': FuenteJSONL, '.parquet': FuenteParquet}
+DESTINOS_POR_EXTENSION = {'.csv': DestinoCSV, '.jsonl': DestinoJSONL,
+                          '.ndjson': DestinoJSONL, '.parquet': DestinoParquet}
+
+
+def crear_fuente(ruta, columna):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in FUENTES_POR_EXTENSION:
+        raise FormatoArchivoNoSoportado(f"Formato de entrada no soportado: {extension or ruta}")
+    return FUENTES_POR_EXTENSION[extension](ruta, columna)
+
+
+def crear_destino(ruta):
+    extension = os.path.splitext(ruta)[1].lower()
+    if extension not in DESTINOS_POR_EXTENSION:
+        raise FormatoArchivoNoSoportado(f"Formato de salida no soportado: {extension or ruta}")
+    return DESTINOS_POR_EXTENSION[extension](ruta)
+
+
+def procesar_por_bloques(fuente, destino, validador, tamano_bloque=TAMANO_BLOQUE_FILAS,
+                         delay=None, callback=None, debe_detener=None):
+    # Valida la fuente en streaming y escribe los resultados en el destino por
+    # bloques de tamano_bloque: la memoria depende del tamaño de bloque y de la
+    # ventana del validador, no del archivo. Las URLs repetidas comparten
+    # consulta dentro de la ventana y entre las URLs recientes; más allá, la
+    # caché persistente del validador evita repetir consultas.
+    contadores = contadores_vacios()
+    procesados = 0
+    entradas = (fila for bloque in fuente.leer_bloques(tamano_bloque) for fila in bloque)
+    resultados = validador.iterar_lote(
+        entradas,
+        delay,
+        callback=callback,  # total no se conoce de antemano al leer en streaming
+        debe_detener=debe_detener
+    )
+    try:
+        for bloque in _bloques(resultados, tamano_bloque):
+            destino.escribir(bloque)
+            procesados += len(bloque)
+            for resultado in bloque:
+                estado = resultado.get('estado')
+                if estado:
+                    contadores[CONTADOR_POR_ESTADO.get(estado, 'no_validos')] += 1
+    finally:
+        resultados.close()
+        destino.cerrar()
+
+    contadores['procesados'] = procesados
+    return contadores
@@ -0,0 +1,429 @@
+# ============================================================================
+# model/analizador_html.py
+# MODELO - Extracción incremental del texto de páginas HTML
+# ============================================================================
+
+import codecs
+import re
+from html.entities import html5
+from html.parser import HTMLParser
+
+from config.constants import TAMANO_BLOQUE_HTML
+from model.clasificador_keywords import CLASIFICADOR_CONTENIDO
+
+# ============================================================================
+# REGLAS DE BEAUTIFULSOUP (html.parser)
+# El texto extraído debe ser idéntico al de soup.find('title').get_text() y
+# soup.find('body').get_text(), así que se reproduce el árbol que construye
+# BeautifulSoup sobre html.parser: pila de etiquetas abiertas, cierre hasta
+# la última etiqueta con el mismo nombre, etiquetas vacías y espacios.
+# ============================================================================
+
+# Etiquetas que BeautifulSoup cierra nada más abrirlas
+ETIQUETAS_VACIAS = {
+    'area', 'base', 'basefont', 'bgsound', 'br', 'col', 'command', 'embed',
+    'frame', 'hr', 'image', 'img', 'input', 'isindex', 'keygen', 'link',
+    'menuitem', 'meta', 'nextid', 'param', 'source', 'spacer', 'track', 'wbr',
+}
+
+# Contenido que BeautifulSoup no incluye en get_text()
+ETIQUETAS_SIN_TEXTO = {'script', 'style', 'template', 'rt', 'rp'}
+
+# Etiquetas dentro de las que no se colapsan los espacios
+ETIQUETAS_CON_ESPACIOS = {'pre', 'textarea'}
+
+_ESPACIOS_ASCII = ' \n\t\x0c\r'
+
+# Entidades con nombre, sin el ';' final (la primera en orden alfabético gana)
+_ENTIDADES = {}
+for _nombre, _caracter in sorted(html5.items()):
+    _ENTIDADES.setdefault(_nombre.rstrip(';'), _caracter)
+
+_PATRON_CHARSET = re.compile(rb'<meta[^>]+charset=["\']?\s*([a-zA-Z0-9_\-]+)', re.IGNORECASE)
+_ENTIDAD_FINAL = re.compile(r'&(?:[a-zA-Z][-.a-zA-Z0-9]*)?')
+_PATRON_NUMERICA = {10: re.compile(r'([0-9]+)(.*)'), 16: re.compile(r'([0-9a-f]+)(.*)')}
+
+
+def caracter_numerico(numero):
+    # Referencia &#N; según el estándar HTML, como la resuelve BeautifulSoup
+    if numero == 0 or numero > 0x10FFFF or 0xD800 <= numero <= 0xDFFF:
+        return '\ufffd'
+    if 0x80 <= numero <= 0x9F:
+        # Controles C1: casi siempre texto en Windows-1252 mal declarado
+        try:
+            return bytes([numero]).decode('cp1252')
+        except UnicodeDecodeError:
+            pass
+    return chr(numero)
+
+
+class ExtractorTextoHTML(HTMLParser):
+    """Acumula el texto de <title> y <body> a medida que llegan los bloques"""
+    
+    def __init__(self):
+        super().__init__(convert_charrefs=False)
+        self.partes_titulo = []
+        self.partes_cuerpo = []
+        self._texto_nuevo = []
+        self._datos = []
+        self._pila = []
+        self._abiertas = {}
+        self._ya_cerradas = {}
+        self._sin_texto = 0
+        self._con_espacios = 0
+        # Posición en la pila del primer <title> y del primer <body> mientras
+        # siguen abiertos (soup.find() devuelve el primero)
+        self._pos_titulo = None
+        self._pos_cuerpo = None
+        self._titulo_visto = False
+        self._cuerpo_visto = False
+        self._diferido = False
+        self._resto = []
+        self._cola = ''
+    
+    # ------------------------------------------------------------------------
+    # Árbol de BeautifulSoup
+    # ------------------------------------------------------------------------
+    
+    def _fin_datos(self, cdata=False):
+        # Cierra la cadena en curso (endData de BeautifulSoup)
+        if not self._datos:
+            return
+        texto = ''.join(self._datos)
+        self._datos.clear()
+        if not self._con_espacios and not texto.strip(_ESPACIOS_ASCII):
+            texto = '\n' if '\n' in texto else ' '
+        if self._sin_texto and not cdata:
+            return
+        if self._pos_titulo is not None:
+            self.partes_titulo.append(texto)
+        if self._pos_cuerpo is not None:
+            self.partes_cuerpo.append(texto)
+        if self._pos_titulo is not None or self._pos_cuerpo is not None:
+            self._texto_nuevo.append(texto)
+    
+    def _abrir(self, nombre):
+        self._fin_datos()
+        if nombre == 'title' and not self._titulo_visto:
+            self._titulo_visto = True
+            self._pos_titulo = len(self._pila)
+        elif nombre == 'body' and not self._cuerpo_visto:
+            self._cuerpo_visto = True
+            self._pos_cuerpo = len(self._pila)
+        self._pila.append(nombre)
+        self._abiertas[nombre] = self._abiertas.get(nombre, 0) + 1
+        if nombre in ETIQUETAS_SIN_TEXTO:
+            self._sin_texto += 1
+        if nombre in ETIQUETAS_CON_ESPACIOS:
+            self._con_espacios += 1
+    
+    def _cerrar(self, nombre):
+        # Desapila hasta la última etiqueta abierta con ese nombre, si la hay
+        self._fin_datos()
+        if not self._abiertas.get(nombre):
+            return
+        pila = self._pila
+        while True:
+            ultima = pila.pop()
+            self._abiertas[ultima] -= 1
+            if ultima in ETIQUETAS_SIN_TEXTO:
+                self._sin_texto -= 1
+            if ultima in ETIQUETAS_CON_ESPACIOS:
+                self._con_espacios -= 1
+            if len(pila) == self._pos_titulo:
+                self._pos_titulo = None
+                # Separador entre título y cuerpo, igual que en texto_completo()
+                self._texto_nuevo.append(" ")
+            if len(pila) == self._pos_cuerpo:
+                self._pos_cuerpo = None
+            if ultima == nombre:
+                return
+    
+    def _etiqueta_inicio(self, nombre):
+        self._abrir(nombre)
+        if nombre in ETIQUETAS_VACIAS:
+            self._cerrar(nombre)
+            # Un </br> posterior se ignora sin cortar el texto
+            self._ya_cerradas[nombre] = self._ya_cerradas.get(nombre, 0) + 1
+    
+    def _etiqueta_fin(self, nombre):
+        if self._ya_cerradas.get(nombre):
+            self._ya_cerradas[nombre] -= 1
+        else:
+            self._cerrar(nombre)
+    
+    # ------------------------------------------------------------------------
+    # Eventos de html.parser
+    # ------------------------------------------------------------------------
+    
+    def handle_starttag(self, tag, attrs):
+        self._etiqueta_inicio(tag)
+    
+    def handle_startendtag(self, tag, attrs):
+        self._abrir(tag)
+        self._cerrar(tag)
+    
+    def handle_endtag(self, tag):
+        self._etiqueta_fin(tag)
+    
+    def handle_data(self, data):
+        if data == '&#':
+            # '&#' que no es referencia: html.parser deja de avanzar y el
+            # resto del documento solo se procesa en close(). BeautifulSoup
+            # lo da todo en un único feed(), así que aquí también se espera
+            # a close() para obtener el mismo texto.
+            self._diferido = True
+        self._datos.append(data)
+    
+    def handle_entityref(self, name):
+        self._datos.append(_ENTIDADES.get(name, '&' + name))
+    
+    def handle_charref(self, name):
+        base = 16 if name[:1] in 'xX' else 10
+        digitos = name[1:] if base == 16 else name
+        resto = ''
+        try:
+            numero = int(digitos, base)
+        except ValueError:
+            coincidencia = _PATRON_NUMERICA[base].match(digitos)
+            if coincidencia is None:
+                self._datos.append(digitos)
+                return
+            numero = int(coincidencia.group(1), base)
+            resto = coincidencia.group(2)
+        self._datos.append(caracter_numerico(numero))
+        self._datos.append(resto)
+    
+    def handle_comment(self, data):
+        self._fin_datos()
+    
+    def handle_decl(self, decl):
+        self._fin_datos()
+    
+    def handle_pi(self, data):
+        self._fin_datos()
+    
+    def unknown_decl(self, data):
+        self._fin_datos()
+        # Las secciones CDATA sí cuentan como texto
+        if data.upper().startswith('CDATA['):
+            self._datos.append(data[len('CDATA['):])
+            self._fin_datos(cdata=True)
+    
+    # ------------------------------------------------------------------------
+    # Interfaz común de los extractores
+    # ------------------------------------------------------------------------
+    
+    def feed(self, data):
+        # Una entidad al final del bloque se guarda para el siguiente: con
+        # "&a." html.parser daría por terminada la entidad "&a" en el punto
+        data = self._cola + data
+        inicio = data.rfind('&')
+        if inicio >= 0 and _ENTIDAD_FINAL.fullmatch(data, inicio):
+            self._cola = data[inicio:]
+            data = data[:inicio]
+        else:
+            self._cola = ''
+        self._procesar(data)
+    
+    def _procesar(self, data):
+        if self._diferido:
+            self._resto.append(data)
+        else:
+            super().feed(data)
+    
+    def close(self):
+        self._procesar(self._cola)
+        self._cola = ''
+        if self._diferido:
+            self.rawdata += ''.join(self._resto)
+            self._resto = []
+        super().close()
+        self._fin_datos()
+    
+    def tomar_texto_nuevo(self):
+        # Texto visible agregado desde la última llamada
+        texto = ''.join(self._texto_nuevo)
+        self._texto_nuevo = []
+        return texto
+    
+    def texto_completo(self):
+        # Mismo formato que usaba el análisis con BeautifulSoup: "<título> <cuerpo>"
+        return (''.join(self.partes_titulo) + " " + ''.join(self.partes_cuerpo)).lower()
+
+
+def detectar_codificacion(content_type, primer_bloque=b''):
+    # 1) charset del header, 2) <meta charset> del HTML, 3) UTF-8
+    coincidencia = re.search(r'charset=["\']?([a-zA-Z0-9_\-]+)', content_type or '', re.IGNORECASE)
+    candidato = coincidencia.group(1) if coincidencia else None
+    
+    if not candidato:
+        coincidencia = _PATRON_CHARSET.search(primer_bloque[:2048])
+        candidato = coincidencia.group(1).decode('ascii') if coincidencia else None
+    
+    try:
+        return codecs.lookup(candidato).name if candidato else 'utf-8'
+    except LookupError:
+        return 'utf-8'
+
+
+# ============================================================================
+# EXTRACTOR RÁPIDO
+# Las etiquetas, comentarios y entidades de forma sencilla (el grueso de una
+# página) se reconocen con una sola expresión regular y alimentan el mismo
+# árbol; todo lo demás (<script>, <!DOCTYPE>, atributos raros, etiquetas
+# cortadas entre bloques...) lo procesa html.parser. Ambos caminos dan
+# exactamente el mismo texto.
+# ============================================================================
+
+_ESP = r'[\t\n\x0c\r ]'
+_TOKEN_SIMPLE = re.compile(r"""
+    ([^<&]+)                                          # 1: texto
+  | <([a-zA-Z][a-zA-Z0-9-]*)                          # 2: etiqueta de inicio
+     (?:{esp}+[a-zA-Z_:@][-a-zA-Z0-9_:.@]*
+        (?:{esp}*={esp}*(?:"[^"]*"|'[^']*'|[^\s"'=<>`/]+(?=[\t\n\x0c\r >])))?
+     )*
+     {esp}*(/?)>                                      # 3: "/" de <br/>
+  | </([a-zA-Z][a-zA-Z0-9-]*){esp}*>                  # 4: etiqueta de cierre
+  | &([a-zA-Z][a-zA-Z0-9]*);                          # 5: entidad con nombre
+  | &\#([0-9]+|[xX][0-9a-fA-F]+);                     # 6: referencia numérica
+  | <!--(?!-?>)(?:[^-]|-(?!-))*-->                    # comentario sin "--"
+""".format(esp=_ESP), re.VERBOSE)
+
+_FIN_COMENTARIO = re.compile(r'--\s*>')
+_MAX_PENDIENTE = 4096
+
+
+class ExtractorTextoRapido(ExtractorTextoHTML):
+    """Mismo texto que ExtractorTextoHTML, sin pasar cada etiqueta por html.parser"""
+    
+    def _procesar(self, data):
+        if self._diferido:
+            self._resto.append(data)
+            return
+        pos = 0
+        total = len(data)
+        while pos < total:
+            if not self.rawdata and self.cdata_elem is None:
+                pos = self._tokens_simples(data, pos)
+                if pos == total:
+                    break
+            # html.parser sigue desde aquí hasta quedarse sin nada a medias
+            fin = self._fin_de_paso(data, pos)
+            HTMLParser.feed(self, data[pos:fin])
+            pos = fin
+            if self._diferido:
+                self._resto.append(data[pos:])
+                return
+    
+    def _fin_de_paso(self, data, pos):
+        # Hasta dónde darle el texto a html.parser: el final del <script> o
+        # del comentario en curso, el siguiente '<' tras una entidad o el
+        # siguiente '>'. html.parser vuelve a analizar lo que tiene pendiente
+        # en cada feed(), así que si ya es largo se le da el bloque entero.
+        pendiente = self.rawdata
+        if self.cdata_elem is not None:
+            patron = re.compile(r'</\s*%s\s*>' % self.cdata_elem, re.IGNORECASE)
+            coincidencia = patron.search(data, pos)
+        elif (pendiente or data[pos:pos + 4]).startswith('<!--'):
+            coincidencia = _FIN_COMENTARIO.search(data, pos if pendiente else pos + 4)
+        elif len(pendiente) > _MAX_PENDIENTE:
+            return len(data)
+        else:
+            fin = data.find('<' if data.startswith('&', pos) and not pendiente else '>', pos + 1)
+            if fin < 0:
+                return len(data)
+            return fin if data[fin] == '<' else fin + 1
+        return coincidencia.end() if coincidencia else len(data)
+    
+    def _tokens_simples(self, data, pos):
+        coincidir = _TOKEN_SIMPLE.match
+        datos = self._datos
+        total = len(data)
+        while pos < total:
+            m = coincidir(data, pos)
+            if m is None:
+                return pos
+            tipo = m.lastindex
+            if tipo == 1:
+                datos.append(m.group(1))
+            elif tipo == 3:
+                nombre = m.group(2).lower()
+                if nombre in self.CDATA_CONTENT_ELEMENTS:
+                    return pos
+                if m.group(3):
+                    self._abrir(nombre)
+                    self._cerrar(nombre)
+                else:
+                    self._etiqueta_inicio(nombre)
+            elif tipo == 4:
+                self._etiqueta_fin(m.group(4).lower())
+            elif tipo == 5:
+                self.handle_entityref(m.group(5))
+            elif tipo == 6:
+                self.handle_charref(m.group(6))
+            else:
+                self._fin_datos()
+            pos = m.end()
+        return pos
+
+
+def crear_extractor():
+    return ExtractorTextoRapido()
+
+
+def analizar_bloques_html(bloques, content_type, max_bytes, medidas=None):
+    # Veredicto del contenido: 'error' (página de error / dominio en venta),
+    # 'validar' (bloqueador o login) u 'ok'. Los bloques se consumen de uno en
+    # uno y se para en cuanto hay veredicto o se llega a max_bytes.
+    # medidas (opcional): diccionario donde se anota 'bytes_leidos'
+    bytes_leidos = 0
+    try:
+        extractor = crear_extractor()
+        escaner = CLASIFICADOR_CONTENIDO.crear_escaner()
+        decodificador = None
+        
+        for bloque in bloques:
+            if decodificador is None:
+                codificacion = detectar_codificacion(content_type, bloque)
+                decodificador = codecs.getincrementaldecoder(codificacion)(errors='replace')
+            
+            bytes_leidos += len(bloque)
+            extractor.feed(decodificador.decode(bloque))
+            
+            # Un error crítico decide el resultado sin leer el resto
+            if escaner.agregar(extractor.tomar_texto_nuevo()):
+                return escaner.veredicto()
+            
+            if bytes_leidos >= max_bytes:
+                break
+        
+        if decodificador is not None:
+            extractor.feed(decodificador.decode(b'', final=True))
+        extractor.close()
+        escaner.agregar(extractor.tomar_texto_nuevo())
+        return escaner.veredicto()
+    
+    finally:
+        if medidas is not None:
+            medidas['bytes_leidos'] = bytes_leidos
+
+
+def analizar_html(contenido, content_type):
+    # Punto de entrada en los procesos de análisis: recibe solo los bytes ya
+    # descargados y el Content-Type (para la codificación)
+    bloques = (contenido[inicio:inicio + TAMANO_BLOQUE_HTML]
+               for inicio in range(0, len(contenido), TAMANO_BLOQUE_HTML))
+    return analizar_bloques_html(bloques, content_type, len(contenido))
+
+
+def analizar_inicio_html(bloque, content_type):
+    # Primer bloque de una página que se sigue descargando: su veredicto si
+    # ya decide (lo mismo que pararía analizar_bloques_html) o None
+    extractor = crear_extractor()
+    escaner = CLASIFICADOR_CONTENIDO.crear_escaner()
+    decodificador = codecs.getincrementaldecoder(detectar_codificacion(content_type, bloque))(errors='replace')
+    extractor.feed(decodificador.decode(bloque))
+    if escaner.agregar(extractor.tomar_texto_nuevo()):
+        return escaner.veredicto()
+    return None
@@ -0,0 +1,192 @@
+# ============================================================================
+# model/cache_resultados.py
+# MODELO - Caché persistente (SQLite) de resultados de validación por URL
+# ============================================================================
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+
+from config.constants import (
+    RUTA_CACHE_RESULTADOS,
+    TTL_CACHE_POR_ESTADO,
+    ANTIGUEDAD_REVALIDACION,
+    EMOJI_VALIDAR,
+)
+from logger import get_logger
+
+
+# Columnas añadidas después de la primera versión de la tabla: las cachés
+# creadas antes se amplían al abrirlas (las filas antiguas quedan a NULL)
+COLUMNAS_ANADIDAS = {
+    'url_final': 'TEXT',
+    'bytes_leidos': 'INTEGER',
+}
+
+
+class CacheResultados:
+    
+    def __init__(self, ruta=RUTA_CACHE_RESULTADOS, ttl_por_estado=None):
+        self.ruta = ruta
+        self.ttl_por_estado = dict(TTL_CACHE_POR_ESTADO if ttl_por_estado is None else ttl_por_estado)
+        self.logger = get_logger()
+        self.activa = True
+        self._lock = threading.Lock()
+        self._conexion = None
+        
+        try:
+            # Una sola conexión compartida por los hilos, protegida con el lock
+            self._conexion = sqlite3.connect(ruta, check_same_thread=False, isolation_level=None)
+            self._conexion.execute("PRAGMA journal_mode=WAL")
+            self._conexion.execute("PRAGMA synchronous=NORMAL")
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS resultados ("
+                " url TEXT PRIMARY KEY,"
+                " estado TEXT NOT NULL,"
+                " detalles TEXT,"
+                " codigo_http INTEGER,"
+                " verificado REAL NOT NULL,"
+                " url_final TEXT,"
+                " bytes_leidos INTEGER)"
+            )
+            existentes = {fila[1] for fila in self._conexion.execute("PRAGMA table_info(resultados)")}
+            for columna, tipo in COLUMNAS_ANADIDAS.items():
+                if columna not in existentes:
+                    try:
+                        self._conexion.execute(f"ALTER TABLE resultados ADD COLUMN {columna} {tipo}")
+                    except sqlite3.OperationalError as e:
+                        # Otro proceso abrió la misma caché a la vez y ya la amplió
+                        if 'duplicate column' not in str(e):
+                            raise
+            # Fecha de las URLs verificadas cuyo resultado no se guarda como
+            # acierto (http://, dominio inexistente, análisis fallido...): solo
+            # la usa el modo incremental
+            self._conexion.execute(
+                "CREATE TABLE IF NOT EXISTS verificaciones ("
+                " url TEXT PRIMARY KEY,"
+                " verificado REAL NOT NULL)"
+            )
+            self._purgar_caducadas()
+        except sqlite3.Error as e:
+            self._desactivar(e)
+    
+    def _purgar_caducadas(self):
+        # Sin esto el archivo solo crece. Una fila caducada aún le sirve al
+        # modo incremental (fechas_verificacion) mientras sea más reciente
+        # que ANTIGUEDAD_REVALIDACION; después ya no sirve para nada.
+        ahora = time.time()
+        conservar = ANTIGUEDAD_REVALIDACION or 0
+        for estado, ttl in self.ttl_por_estado.items():
+            self._conexion.execute(
+                "DELETE FROM resultados WHERE estado = ? AND verificado < ?",
+                (estado, ahora - max(ttl, conservar))
+            )
+        estados = list(self.ttl_por_estado)
+        marcas = ','.join('?' * len(estados))
+        self._conexion.execute(
+            f"DELETE FROM resultados WHERE estado NOT IN ({marcas}) AND verificado < ?",
+            (*estados, ahora - conservar)
+        )
+        self._conexion.execute("DELETE FROM verificaciones WHERE verificado < ?", (ahora - conservar,))
+    
+    def _desactivar(self, error):
+        # Si la caché falla, la validación sigue sin ella
+        self.logger.warning(f"{EMOJI_VALIDAR} Caché de resultados desactivada ({self.ruta}): {error}")
+        self.activa = False
+    
+    def obtener(self, url_norm):
+        if not self.activa:
+            return None
+        try:
+            with self._lock:
+                fila = self._conexion.execute(
+                    "SELECT estado, detalles, codigo_http, verificado, url_final, bytes_leidos"
+                    " FROM resultados WHERE url = ?",
+                    (url_norm,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self._desactivar(e)
+            return None
+        
+        if fila is None:
+            return None
+        
+        estado, detalles, codigo_http, verificado, url_final, bytes_leidos = fila
+        if time.time() - verificado > self.ttl_por_estado.get(estado, 0):
+            return None
+        
+        return {
+            'estado': estado,
+            'detalles': detalles,
+            'codigo_http': codigo_http,
+            'url_final': url_final,
+            'bytes_leidos': bytes_leidos,
+            'timestamp': datetime.fromtimestamp(verificado).strftime("%Y-%m-%d %H:%M:%S"),
+            'desde_cache': True,
+        }
+    
+    def fechas_verificacion(self, urls_norm):
+        # {url_norm: epoch de la última verificación} de las URLs que estén
+        # en la caché, aunque su vigencia haya expirado, o marcadas como
+        # verificadas
+        fechas = {}
+        if not self.activa:
+            return fechas
+        urls_norm = list(urls_norm)
+        try:
+            with self._lock:
+                for i in range(0, len(urls_norm), 500):
+                    bloque = urls_norm[i:i + 500]
+                    marcas = ','.join('?' * len(bloque))
+                    fechas.update(self._conexion.execute(
+                        f"SELECT url, MAX(verificado) FROM ("
+                        f" SELECT url, verificado FROM resultados WHERE url IN ({marcas})"
+                        f" UNION ALL"
+                        f" SELECT url, verificado FROM verificaciones WHERE url IN ({marcas})"
+                        f") GROUP BY url",
+                        bloque + bloque
+                    ).fetchall())
+        except sqlite3.Error as e:
+            self._desactivar(e)
+        return fechas
+    
+    def marcar_verificada(self, url_norm):
+        # Anota la fecha de verificación sin guardar el resultado como acierto
+        if not self.activa:
+            return
+        try:
+            with self._lock:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO verificaciones (url, verificado) VALUES (?, ?)",
+                    (url_norm, time.time())
+                )
+        except sqlite3.Error as e:
+            self._desactivar(e)
+    
+    def guardar(self, url_norm, resultado):
+        estado = resultado.get('estado')
+        if not self.activa:
+            return
+        if not self.ttl_por_estado.get(estado):
+            # Estado que no se guarda: la URL cuenta igual como verificada
+            self.marcar_verificada(url_norm)
+            return
+        try:
+            with self._lock:
+                self._conexion.execute(
+                    "INSERT OR REPLACE INTO resultados"
+                    " (url, estado, detalles, codigo_http, verificado, url_final, bytes_leidos)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (url_norm, estado, resultado.get('detalles'), resultado.get('codigo_http'), time.time(),
+                     resultado.get('url_final'), resultado.get('bytes_leidos'))
+                )
+        except sqlite3.Error as e:
+            self._desactivar(e)
+    
+    def cerrar(self):
+        if self._conexion is not None:
+            with self._lock:
+                self._conexion.close()
+                self._conexion = None
+            self.activa = False
@@ -0,0 +1,117 @@
+# ============================================================================
+# model/clasificador_keywords.py
+# MODELO - Búsqueda de palabras clave compilada una sola vez al arrancar
+# ============================================================================
+
+from config.constants import (
+    KEYWORDS_ERROR_CRITICO,
+    KEYWORDS_AD_BLOCKER,
+    KEYWORDS_LOGIN,
+)
+
+# Categorías en orden de prioridad: la primera que aparezca decide el resultado
+CATEGORIA_ERROR = 'error'
+CATEGORIA_VALIDAR = 'validar'
+CATEGORIA_OK = 'ok'
+
+
+def _podar_keywords(keywords):
+    # Quita duplicados y frases que contienen otra frase más corta de la misma
+    # categoría: si la larga aparece, la corta también, así que sobra buscarla
+    unicas = sorted({k.lower() for k in keywords}, key=len)
+    podadas = []
+    for keyword in unicas:
+        if not any(corta in keyword for corta in podadas):
+            podadas.append(keyword)
+    return tuple(podadas)
+
+
+def _agrupar_por_factor(keywords):
+    # Agrupa las frases que comparten una palabra (el "factor"): si el factor no
+    # aparece en el texto, ninguna frase del grupo puede aparecer y se ahorran
+    # sus búsquedas. Devuelve ((factor, frases), ...) y las frases sueltas.
+    pendientes = list(keywords)
+    grupos = []
+    while pendientes:
+        candidatos = {
+            palabra for keyword in pendientes
+            for palabra in keyword.replace(',', ' ').split() if len(palabra) >= 3
+        }
+        mejor_factor, mejor_grupo = None, []
+        for factor in sorted(candidatos):
+            grupo = [keyword for keyword in pendientes if factor in keyword]
+            if (len(grupo), len(factor)) > (len(mejor_grupo), len(mejor_factor or '')):
+                mejor_factor, mejor_grupo = factor, grupo
+        if len(mejor_grupo) < 2:
+            break
+        grupos.append((mejor_factor, tuple(mejor_grupo)))
+        pendientes = [keyword for keyword in pendientes if keyword not in mejor_grupo]
+    return tuple(grupos), tuple(pendientes)
+
+
+def _contiene_alguna(texto, grupos, sueltas):
+    for factor, frases in grupos:
+        if factor in texto and any(frase in texto for frase in frases):
+            return True
+    return any(frase in texto for frase in sueltas)
+
+
+class ClasificadorKeywords:
+    
+    def __init__(self, grupos):
+        # grupos: lista de (categoria, keywords) ordenada por prioridad
+        self.grupos = tuple(
+            (categoria, _agrupar_por_factor(_podar_keywords(kws))) for categoria, kws in grupos
+        )
+        # Caracteres que se guardan entre bloques para no perder frases partidas
+        self.solape = max(len(k) for _, kws in grupos for k in kws) - 1
+    
+    def clasificar(self, texto):
+        escaner = self.crear_escaner()
+        escaner.agregar(texto)
+        return escaner.veredicto()
+    
+    def crear_escaner(self):
+        return EscanerKeywords(self)
+
+
+class EscanerKeywords:
+    """Recorre el texto por bloques una sola vez y recuerda qué categorías ya vio"""
+    
+    def __init__(self, clasificador):
+        self.clasificador = clasificador
+        self.encontradas = set()
+        self._pendientes = list(clasificador.grupos)
+        self._cola = ""
+    
+    def agregar(self, texto):
+        # Devuelve True cuando el veredicto ya no puede cambiar
+        if not texto or self.decidido():
+            return self.decidido()
+        
+        ventana = self._cola + texto.lower()
+        for grupo in list(self._pendientes):
+            categoria, (factores, sueltas) = grupo
+            if _contiene_alguna(ventana, factores, sueltas):
+                self.encontradas.add(categoria)
+                self._pendientes.remove(grupo)
+        
+        self._cola = ventana[-self.clasificador.solape:]
+        return self.decidido()
+    
+    def decidido(self):
+        # La categoría de mayor prioridad ya apareció
+        return self.clasificador.grupos[0][0] in self.encontradas
+    
+    def veredicto(self):
+        for categoria, _ in self.clasificador.grupos:
+            if categoria in self.encontradas:
+                return categoria
+        return CATEGORIA_OK
+
+
+# Instancia compartida, compilada al importar el módulo
+CLASIFICADOR_CONTENIDO = ClasificadorKeywords([
+    (CATEGORIA_ERROR, KEYWORDS_ERROR_CRITICO),
+    (CATEGORIA_VALIDAR, KEYWORDS_AD_BLOCKER + KEYWORDS_LOGIN),
+])
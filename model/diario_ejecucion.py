@@ -0,0 +1,145 @@
+# ============================================================================
+# model/diario_ejecucion.py
+# MODELO - Diario en disco de resultados para reanudar validaciones
+# ============================================================================
+
+import json
+import os
+import threading
+
+from config.constants import (
+    SUFIJO_DIARIO_EJECUCION,
+    DIARIO_FSYNC_CADA,
+    EMOJI_VALIDAR,
+)
+from logger import get_logger
+
+
+class DiarioEjecucion:
+    """Archivo JSONL junto al libro: una cabecera con la configuración y
+    una línea compacta por cada resultado terminado"""
+    
+    def __init__(self, ruta_excel):
+        base, _ = os.path.splitext(ruta_excel)
+        self.ruta = base + SUFIJO_DIARIO_EJECUCION
+        self.logger = get_logger()
+        self.activo = True
+        self._archivo = None
+        self._sin_sincronizar = 0
+        self._lock = threading.Lock()
+    
+    def existe(self):
+        return os.path.exists(self.ruta)
+    
+    def _registros(self):
+        # Una última línea a medias (cierre inesperado mientras se escribía)
+        # simplemente se ignora
+        with open(self.ruta, 'r', encoding='utf-8') as f:
+            for linea in f:
+                try:
+                    yield json.loads(linea)
+                except ValueError:
+                    continue
+    
+    def leer_cabecera(self):
+        # Configuración con la que se creó el diario, o None si no se puede leer
+        try:
+            return next(self._registros(), None)
+        except OSError:
+            return None
+    
+    def iterar_resultados(self):
+        # Genera los resultados registrados línea a línea, sin cargar el diario
+        # entero: en libros muy grandes puede tener cientos de miles de filas
+        registros = self._registros()
+        try:
+            next(registros, None)  # cabecera
+            for registro in registros:
+                if not isinstance(registro, dict) or not isinstance(registro.get('f'), int):
+                    continue
+                yield {
+                    'objetivo': registro.get('o', 0),
+                    'fila_excel': registro['f'],
+                    'estado': registro.get('e'),
+                    'detalles': registro.get('d', ''),
+                    'codigo_http': registro.get('c'),
+                    'desde_diario': True,
+                }
+        except OSError:
+            return
+    
+    def abrir(self, cabecera, continuar=False):
+        # continuar=False empieza un diario nuevo con la cabecera indicada
+        try:
+            if continuar and self.existe():
+                self._archivo = open(self.ruta, 'a', encoding='utf-8')
+                # Si la última línea quedó a medias, cerrarla para no pegarle la siguiente
+                if not self._termina_en_salto():
+                    self._archivo.write('\n')
+            else:
+                self._archivo = open(self.ruta, 'w', encoding='utf-8')
+                self._escribir(cabecera)
+                self._sincronizar()
+        except OSError as e:
+            self._desactivar(e)
+    
+    def _termina_en_salto(self):
+        with open(self.ruta, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+    
+    def _escribir(self, registro):
+        self._archivo.write(json.dumps(registro, ensure_ascii=False, separators=(',', ':')) + '\n')
+        self._archivo.flush()
+    
+    def _sincronizar(self):
+        os.fsync(self._archivo.fileno())
+        self._sin_sincronizar = 0
+    
+    def _desactivar(self, error):
+        self.logger.warning(f"{EMOJI_VALIDAR} No se puede escribir el diario de ejecución ({self.ruta}): {error}")
+        self.activo = False
+        self._archivo = None
+    
+    def registrar(self, resultado):
+        if not self.activo or self._archivo is None:
+            return
+        registro = {'f': resultado.get('fila_excel'), 'e': resultado.get('estado')}
+        if resultado.get('objetivo'):
+            registro['o'] = resultado['objetivo']
+        if resultado.get('detalles'):
+            registro['d'] = resultado['detalles']
+        if resultado.get('codigo_http') is not None:
+            registro['c'] = resultado['codigo_http']
+        try:
+            with self._lock:
+                self._escribir(registro)
+                self._sin_sincronizar += 1
+                # flush por línea protege ante un cierre de la app; fsync cada
+                # cierto número de líneas, ante un corte del sistema
+                if self._sin_sincronizar >= DIARIO_FSYNC_CADA:
+                    self._sincronizar()
+        except OSError as e:
+            self._desactivar(e)
+    
+    def cerrar(self):
+        with self._lock:
+            if self._archivo is not None:
+                try:
+                    self._sincronizar()
+                    self._archivo.close()
+                except OSError:
+                    pass
+                self._archivo = None
+    
+    def eliminar(self):
+        self.cerrar()
+        try:
+            os.remove(self.ruta)
+        except FileNotFoundError:
+            pass
+        except OSError as e:
+            self.logger.warning(f"{EMOJI_VALIDAR} No se pudo borrar el diario de ejecución: {e}")
@@ -0,0 +1,361 @@
+# ============================================================================
+# model/escritor_xlsx.py
+# MODELO - Escritura de resultados parcheando solo la hoja destino del .xlsx
+# ============================================================================
+
+import codecs
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from xml.sax.saxutils import escape
+
+from openpyxl import load_workbook
+from openpyxl.utils.cell import column_index_from_string, get_column_letter, range_boundaries
+
+from config.constants import TAMANO_BLOQUE_XLSX, EMOJI_VALIDAR
+from logger import get_logger
+
+
+class FormatoXlsxNoSoportado(Exception):
+    """El paquete tiene algo que el parche de texto no sabe tratar con seguridad"""
+    pass
+
+
+_NS_RELACIONES = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+_PATRON_DECLARACION = re.compile(r'<\?xml[^>]*encoding="([^"]+)"')
+_PATRON_DIMENSION = re.compile(r'<dimension ref="([^"]+)"\s*/>')
+_PATRON_SHEETDATA = re.compile(r'<sheetData\s*(/?)>')
+_PATRON_FILA = re.compile(r'\s*(<row\b[^>]*?(?:/>|>.*?</row>))', re.S)
+_PATRON_FIN_SHEETDATA = re.compile(r'\s*</sheetData>')
+_PATRON_CELDA = re.compile(r'<c\b[^>]*?(?:/>|>.*?</c>)', re.S)
+_PATRON_R_FILA = re.compile(r'\sr="(\d+)"')
+_PATRON_R_CELDA = re.compile(r'^<c\b[^>]*?\sr="([A-Z]+)(\d+)"')
+_PATRON_ESTILO = re.compile(r'^<c\b[^>]*?(\ss="\d+")')
+_PATRON_SPANS = re.compile(r'\sspans="[^"]*"')
+_PATRON_REL_CALC_CHAIN = re.compile(r'<Relationship\b[^>]*\bType="[^"]*/calcChain"[^>]*/>')
+_PATRON_TIPO_CALC_CHAIN = re.compile(r'<Override\b[^>]*\bPartName="/xl/calcChain\.xml"[^>]*/>')
+
+# Cadena de cálculo de Excel: orden en que se evalúan las celdas con fórmula
+_CALC_CHAIN = 'xl/calcChain.xml'
+_RELACIONES_LIBRO = 'xl/_rels/workbook.xml.rels'
+_TIPOS_CONTENIDO = '[Content_Types].xml'
+
+
+class EscritorXlsx:
+    """Escribe celdas en un .xlsx existente. Solo se reescribe el XML de las
+    hojas con cambios; el resto del paquete (otras hojas, estilos, imágenes)
+    se copia entrada a entrada sin interpretarlo, salvo la cadena de cálculo
+    (calcChain.xml), que se quita. Si la hoja tiene una forma que el parche
+    no soporta, se usa openpyxl como antes."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self.logger = get_logger()
+
+    def escribir(self, cambios):
+        # cambios = {hoja: {(fila, columna): valor}}, fila y columna desde 1
+        # como en openpyxl. En lugar del dict, cada hoja admite un iterable
+        # reiterable de (fila, {columna: valor}) en orden de fila, para no
+        # tener todos los cambios en memoria a la vez.
+        # Devuelve el método usado: 'parche' u 'openpyxl'.
+        try:
+            self.escribir_parche(cambios)
+            return 'parche'
+        except FormatoXlsxNoSoportado as e:
+            self.logger.warning(f"{EMOJI_VALIDAR} Escritura directa no disponible ({e}); se usa openpyxl")
+            self.escribir_openpyxl(cambios)
+            return 'openpyxl'
+
+    def escribir_openpyxl(self, cambios):
+        # Sin keep_vba, openpyxl guarda un .xlsm sin sus macros
+        wb = load_workbook(self.ruta, keep_vba=self.ruta.lower().endswith('.xlsm'))
+        try:
+            for hoja, celdas in cambios.items():
+                ws = wb[hoja]
+                for fila, celdas_fila in self._filas_ordenadas(celdas):
+                    for columna, valor in celdas_fila.items():
+                        ws.cell(row=fila, column=columna, value=valor)
+            wb.save(self.ruta)
+        finally:
+            wb.close()
+
+    @staticmethod
+    def _filas_ordenadas(celdas):
+        # (fila, {columna: valor}) en orden de fila, venga un dict o un iterable
+        if not isinstance(celdas, dict):
+            return iter(celdas)
+        por_fila = {}
+        for (fila, columna), valor in celdas.items():
+            por_fila.setdefault(fila, {})[columna] = valor
+        return ((fila, por_fila[fila]) for fila in sorted(por_fila))
+
+    # ========================================================================
+    # PARCHE DEL PAQUETE
+    # ========================================================================
+
+    def escribir_parche(self, cambios):
+        carpeta = os.path.dirname(os.path.abspath(self.ruta))
+        # Se escribe a un temporal junto al original y se reemplaza al final:
+        # si algo falla a mitad, el libro original queda intacto. Con el
+        # prefijo de Excel ('~$') el lote de una carpeta no lo toma por un libro.
+        fd, temporal = tempfile.mkstemp(prefix='~$', suffix='.xlsx', dir=carpeta)
+        os.close(fd)
+        try:
+            with zipfile.ZipFile(self.ruta) as zin, zipfile.ZipFile(temporal, 'w') as zout:
+                partes = self._partes_de_hojas(zin, cambios)
+                con_calc_chain = _CALC_CHAIN in zin.NameToInfo
+                for info in zin.infolist():
+                    if info.filename == _CALC_CHAIN:
+                        continue
+                    nuevo = zipfile.ZipInfo(info.filename, info.date_time)
+                    nuevo.compress_type = info.compress_type
+                    nuevo.external_attr = info.external_attr
+                    nuevo.create_system = info.create_system
+                    # El tamaño de una hoja parcheada no se sabe hasta
+                    # escribirla: zip64 siempre, por si pasa del límite
+                    zip64 = info.filename in partes or info.file_size > zipfile.ZIP64_LIMIT // 2
+                    with zin.open(info) as origen, zout.open(nuevo, 'w', force_zip64=zip64) as destino:
+                        if info.filename in partes:
+                            self._parchear_hoja(origen, destino, self._filas_ordenadas(partes[info.filename]))
+                        elif info.filename in (_RELACIONES_LIBRO, _TIPOS_CONTENIDO) and con_calc_chain:
+                            destino.write(self._sin_calc_chain(origen.read()))
+                        else:
+                            shutil.copyfileobj(origen, destino, TAMANO_BLOQUE_XLSX)
+            shutil.copymode(self.ruta, temporal)
+            # Con el libro abierto en Excel (Windows) falla aquí, con PermissionError
+            os.replace(temporal, self.ruta)
+        except BaseException:
+            os.remove(temporal)
+            raise
+
+    @staticmethod
+    def _sin_calc_chain(xml):
+        # calcChain.xml lista las celdas con fórmula; si una de ellas se
+        # sobrescribe con un valor, Excel da el libro por dañado. Se quita
+        # junto con su relación y su tipo de contenido, como hace openpyxl
+        # al guardar, y Excel la reconstruye al abrir el libro.
+        try:
+            texto = xml.decode('utf-8')
+        except UnicodeDecodeError:
+            raise FormatoXlsxNoSoportado("relaciones del libro en una codificación distinta de UTF-8")
+        texto = _PATRON_TIPO_CALC_CHAIN.sub('', _PATRON_REL_CALC_CHAIN.sub('', texto))
+        return texto.encode('utf-8')
+
+    def _partes_de_hojas(self, zin, cambios):
+        # {nombre de la parte XML: cambios de esa hoja}, a partir de
+        # workbook.xml (nombre -> r:id) y sus relaciones (r:id -> ruta)
+        try:
+            libro = ET.fromstring(zin.read('xl/workbook.xml'))
+            relaciones = ET.fromstring(zin.read('xl/_rels/workbook.xml.rels'))
+        except (KeyError, ET.ParseError) as e:
+            raise FormatoXlsxNoSoportado(f"estructura del libro no reconocida: {e}")
+
+        destinos = {rel.get('Id'): rel.get('Target') for rel in relaciones.findall('{*}Relationship')}
+        ids_hojas = {hoja.get('name'): hoja.get(_NS_RELACIONES) for hoja in libro.findall('{*}sheets/{*}sheet')}
+
+        partes = {}
+        for hoja, celdas in cambios.items():
+            if hoja not in ids_hojas:
+                raise KeyError(f"Worksheet {hoja} does not exist.")
+            destino = destinos.get(ids_hojas[hoja])
+            if not destino:
+                raise FormatoXlsxNoSoportado(f"hoja '{hoja}' sin relación en el libro")
+            if destino.startswith('/'):
+                parte = destino.lstrip('/')
+            else:
+                parte = posixpath.normpath(posixpath.join('xl', destino))
+            if parte not in zin.namelist():
+                raise FormatoXlsxNoSoportado(f"la hoja '{hoja}' no es una hoja de cálculo XML")
+            partes[parte] = celdas
+        return partes
+
+    # ========================================================================
+    # PARCHE DEL XML DE UNA HOJA (en streaming, fila a fila)
+    # ========================================================================
+
+    def _parchear_hoja(self, origen, destino, filas):
+        # filas: iterador de (fila, {columna: valor}) en orden de fila.
+        # <dimension> va antes de <sheetData> pero sus límites solo se conocen
+        # al terminar; por eso el cuerpo pasa por un temporal (en memoria si
+        # es pequeño) y la cabecera se escribe al final.
+        proxima = next(filas, None)
+        limites = None  # [min_fila, min_col, max_fila, max_col] de lo escrito
+        ultima_fila = 0
+        decodificador = codecs.getincrementaldecoder('utf-8')()
+        buffer = ''
+        cabecera = ''
+        fase = 'cabecera'
+        cuerpo = tempfile.SpooledTemporaryFile(max_size=TAMANO_BLOQUE_XLSX)
+
+        def escribir(texto):
+            cuerpo.write(texto.encode('utf-8'))
+
+        def tomar():
+            # Devuelve los cambios de la fila actual, anota sus límites y avanza
+            nonlocal proxima, limites
+            fila, celdas_fila = proxima
+            columnas = [col for col, valor in celdas_fila.items() if valor is not None]
+            if columnas:
+                if limites is None:
+                    limites = [fila, min(columnas), fila, max(columnas)]
+                else:
+                    limites = [min(limites[0], fila), min(limites[1], *columnas),
+                               max(limites[2], fila), max(limites[3], *columnas)]
+            proxima = next(filas, None)
+            if proxima is not None and proxima[0] <= fila:
+                raise ValueError("Los cambios deben llegar en orden de fila")
+            return fila, celdas_fila
+
+        def filas_nuevas_hasta(limite):
+            # Filas con cambios que no existen en el XML y van antes de 'limite'
+            partes = []
+            while proxima is not None and proxima[0] < limite:
+                partes.append(self._fila_nueva(*tomar()))
+            return ''.join(partes)
+
+        with cuerpo:
+            while True:
+                bloque = origen.read(TAMANO_BLOQUE_XLSX)
+                final = not bloque
+                buffer += decodificador.decode(bloque, final)
+
+                if fase == 'cabecera':
+                    m = _PATRON_SHEETDATA.search(buffer)
+                    if not m:
+                        if final:
+                            raise FormatoXlsxNoSoportado("hoja sin <sheetData> (¿prefijos de namespace?)")
+                        continue
+                    declaracion = _PATRON_DECLARACION.search(buffer, 0, m.start())
+                    if declaracion and declaracion.group(1).lower() not in ('utf-8', 'utf8'):
+                        raise FormatoXlsxNoSoportado(f"codificación {declaracion.group(1)}")
+                    cabecera = buffer[:m.start()]
+                    if m.group(1):
+                        # <sheetData/>: hoja sin celdas
+                        escribir('<sheetData>' + filas_nuevas_hasta(float('inf')) + '</sheetData>')
+                        buffer = buffer[m.end():]
+                        fase = 'resto'
+                    else:
+                        escribir(m.group(0))
+                        buffer = buffer[m.end():]
+                        fase = 'filas'
+
+                if fase == 'filas':
+                    pos = 0
+                    salida = []
+                    while True:
+                        m = _PATRON_FILA.match(buffer, pos)
+                        if m:
+                            fila_xml = m.group(1)
+                            r = _PATRON_R_FILA.search(fila_xml, 0, fila_xml.find('>'))
+                            if not r:
+                                raise FormatoXlsxNoSoportado("fila sin atributo r")
+                            numero = int(r.group(1))
+                            if numero <= ultima_fila:
+                                raise FormatoXlsxNoSoportado("filas fuera de orden")
+                            ultima_fila = numero
+                            salida.append(filas_nuevas_hasta(numero))
+                            if proxima is not None and proxima[0] == numero:
+                                fila_xml = self._parchear_fila(fila_xml, tomar()[1])
+                            salida.append(m.group(0)[:m.start(1) - m.start(0)] + fila_xml)
+                            pos = m.end()
+                            continue
+                        m = _PATRON_FIN_SHEETDATA.match(buffer, pos)
+                        if m:
+                            salida.append(filas_nuevas_hasta(float('inf')))
+                            pos = m.start()
+                            fase = 'resto'
+                        break
+                    escribir(''.join(salida))
+                    buffer = buffer[pos:]
+                    if fase == 'filas' and final:
+                        raise FormatoXlsxNoSoportado("contenido inesperado dentro de <sheetData>")
+
+                if fase == 'resto':
+                    escribir(buffer)
+                    buffer = ''
+
+                if final:
+                    break
+
+            destino.write(self._actualizar_dimension(cabecera, limites).encode('utf-8'))
+            cuerpo.seek(0)
+            shutil.copyfileobj(cuerpo, destino, TAMANO_BLOQUE_XLSX)
+
+    def _actualizar_dimension(self, cabecera, limites):
+        # Amplía <dimension ref="A1:C10"/> para incluir las celdas nuevas
+        m = _PATRON_DIMENSION.search(cabecera)
+        if not m or limites is None:
+            return cabecera
+        try:
+            min_col, min_fila, max_col, max_fila = range_boundaries(m.group(1))
+        except (ValueError, TypeError):
+            return cabecera
+        min_fila = min(min_fila or 1, limites[0])
+        min_col = min(min_col or 1, limites[1])
+        max_fila = max(max_fila or 1, limites[2])
+        max_col = max(max_col or 1, limites[3])
+        ref = f"{get_column_letter(min_col)}{min_fila}:{get_column_letter(max_col)}{max_fila}"
+        return cabecera[:m.start(1)] + ref + cabecera[m.end(1):]
+
+    def _parchear_fila(self, fila_xml, celdas_fila):
+        if fila_xml.endswith('/>'):
+            apertura = fila_xml[:-2].rstrip() + '>'
+            interior = ''
+        else:
+            fin_apertura = fila_xml.index('>') + 1
+            apertura = fila_xml[:fin_apertura]
+            interior = fila_xml[fin_apertura:-len('</row>')]
+
+        existentes = _PATRON_CELDA.findall(interior)
+        if _PATRON_CELDA.sub('', interior).strip():
+            raise FormatoXlsxNoSoportado("fila con elementos distintos de celdas")
+
+        por_columna = {}
+        for celda in existentes:
+            r = _PATRON_R_CELDA.match(celda)
+            if not r:
+                raise FormatoXlsxNoSoportado("celda sin atributo r")
+            por_columna[column_index_from_string(r.group(1))] = celda
+
+        numero = _PATRON_R_FILA.search(apertura).group(1)
+        for columna, valor in celdas_fila.items():
+            anterior = por_columna.get(columna, '')
+            if valor is None and not anterior:
+                continue
+            if '<f' in anterior and ' ref="' in anterior:
+                # Celda origen de una fórmula compartida o matricial
+                raise FormatoXlsxNoSoportado("la celda destino contiene una fórmula compartida")
+            estilo = _PATRON_ESTILO.match(anterior)
+            por_columna[columna] = self._celda(
+                f"{get_column_letter(columna)}{numero}", valor, estilo.group(1) if estilo else ''
+            )
+
+        # spans es solo una pista opcional; se quita porque puede quedar corta
+        apertura = _PATRON_SPANS.sub('', apertura)
+        return apertura + ''.join(por_columna[col] for col in sorted(por_columna)) + '</row>'
+
+    def _fila_nueva(self, fila, celdas_fila):
+        # Vaciar una celda que no existe no requiere escribir nada
+        celdas = ''.join(
+            self._celda(f"{get_column_letter(col)}{fila}", celdas_fila[col], '')
+            for col in sorted(celdas_fila) if celdas_fila[col] is not None
+        )
+        return f'<row r="{fila}">{celdas}</row>' if celdas else ''
+
+    @staticmethod
+    def _celda(ref, valor, estilo):
+        # Texto como inlineStr: no hace falta tocar sharedStrings.xml
+        if valor is None:
+            return f'<c r="{ref}"{estilo}/>'
+        if isinstance(valor, bool):
+            return f'<c r="{ref}"{estilo} t="b"><v>{int(valor)}</v></c>'
+        if isinstance(valor, (int, float)):
+            return f'<c r="{ref}"{estilo}><v>{valor!r}</v></c>'
+        texto = escape(str(valor))
+        espacio = ' xml:space="preserve"' if texto != texto.strip() else ''
+        return f'<c r="{ref}"{estilo} t="inlineStr"><is><t{espacio}>{texto}</t></is></c>'
@@ -0,0 +1,108 @@
+# ============================================================================
+# model/interruptor_hosts.py
+# MODELO - Circuit breaker por dominio para hosts caídos
+# ============================================================================
+
+import threading
+import time
+from collections import OrderedDict
+
+from config.constants import (
+    UMBRAL_FALLOS_HOST,
+    TIEMPO_CIRCUITO_ABIERTO,
+    MAX_HOSTS_RECORDADOS,
+    EMOJI_CUIDADO,
+    EMOJI_CONTINUAR,
+)
+from logger import get_logger
+
+CERRADO = 'cerrado'          # Funcionamiento normal
+ABIERTO = 'abierto'          # Host caído: no se hacen peticiones
+SEMIABIERTO = 'semiabierto'  # Se deja pasar una petición de prueba
+
+
+class InterruptorHosts:
+    
+    def __init__(self, umbral_fallos=UMBRAL_FALLOS_HOST, tiempo_apertura=TIEMPO_CIRCUITO_ABIERTO):
+        self.umbral_fallos = max(1, int(umbral_fallos))
+        self.tiempo_apertura = tiempo_apertura
+        self.logger = get_logger()
+        # host -> {'estado', 'fallos', 'reintentar_en', 'sonda_en_curso'}.
+        # Solo hosts con fallos, del que falló hace más tiempo al más reciente:
+        # un host sin entrada tiene el circuito cerrado
+        self._hosts = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def _circuito(self, host):
+        circuito = self._hosts.get(host)
+        if circuito is None:
+            circuito = self._hosts[host] = {
+                'estado': CERRADO,
+                'fallos': 0,
+                'reintentar_en': 0.0,
+                'sonda_en_curso': False,
+            }
+            if len(self._hosts) > MAX_HOSTS_RECORDADOS:
+                self._hosts.popitem(last=False)
+        return circuito
+    
+    def estado(self, host):
+        with self._lock:
+            circuito = self._hosts.get(host)
+            return circuito['estado'] if circuito else CERRADO
+    
+    def permitir(self, host):
+        with self._lock:
+            circuito = self._hosts.get(host)
+            if circuito is None or circuito['estado'] == CERRADO:
+                return True
+            
+            if circuito['estado'] == ABIERTO:
+                if time.monotonic() < circuito['reintentar_en']:
+                    return False
+                # Pasó el tiempo de espera: esta petición sondea si el host volvió
+                circuito['estado'] = SEMIABIERTO
+                circuito['sonda_en_curso'] = True
+                return True
+            
+            # SEMIABIERTO: solo una sonda a la vez
+            if circuito['sonda_en_curso']:
+                return False
+            circuito['sonda_en_curso'] = True
+            return True
+    
+    def registrar_exito(self, host):
+        with self._lock:
+            # Un éxito deja el circuito como nuevo: basta con olvidar el host
+            circuito = self._hosts.pop(host, None)
+            recuperado = circuito is not None and circuito['estado'] != CERRADO
+        if recuperado:
+            self.logger.info(f"{EMOJI_CONTINUAR} {host} responde de nuevo, se reanudan sus peticiones")
+    
+    def liberar_sonda(self, host):
+        # La sonda terminó sin éxito ni fallo de red (una excepción inesperada):
+        # no dice nada del host, que sigue semiabierto para la siguiente petición
+        with self._lock:
+            circuito = self._hosts.get(host)
+            if circuito is not None:
+                circuito['sonda_en_curso'] = False
+    
+    def registrar_fallo(self, host):
+        # Timeout o error de conexión
+        with self._lock:
+            circuito = self._circuito(host)
+            self._hosts.move_to_end(host)
+            circuito['fallos'] += 1
+            circuito['sonda_en_curso'] = False
+            abrir = circuito['estado'] == SEMIABIERTO or (
+                circuito['estado'] == CERRADO and circuito['fallos'] >= self.umbral_fallos
+            )
+            if abrir:
+                circuito['estado'] = ABIERTO
+                circuito['reintentar_en'] = time.monotonic() + self.tiempo_apertura
+            fallos = circuito['fallos']
+        if abrir:
+            self.logger.warning(
+                f"{EMOJI_CUIDADO} {host}: {fallos} fallos seguidos, se pausan sus peticiones "
+                f"{self.tiempo_apertura:g} seg"
+            )
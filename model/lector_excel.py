@@ -0,0 +1,524 @@
+# ============================================================================
+# model/lector_excel.py
+# MODELO - Lectura en streaming de libros Excel directamente del XML del .xlsx
+# ============================================================================
+
+import functools
+import posixpath
+import re
+import struct
+import tempfile
+import zipfile
+import xml.etree.ElementTree as ET
+from array import array
+
+from config.constants import UMBRAL_CADENAS_EN_DISCO, TAMANO_BLOQUE_XLSX
+
+_NS_HOJA = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+_TAG_SHEETDATA = '{%s}sheetData' % _NS_HOJA
+_TAG_DIMENSION = '{%s}dimension' % _NS_HOJA
+_TAG_FILA = '{%s}row' % _NS_HOJA
+_TAG_VALOR = '{%s}v' % _NS_HOJA
+_TAG_TEXTO_EN_LINEA = '{%s}is' % _NS_HOJA
+_TAG_SI = '{%s}si' % _NS_HOJA
+_NS_RELACIONES = '{http://schemas.openxmlformats.org/officeDocument/2006/relationships}id'
+
+# Referencia de <dimension>: "A1:C10" o una sola celda
+_PATRON_REF = re.compile(r'^\$?([A-Za-z]{1,3})\$?(\d+)(?::\$?([A-Za-z]{1,3})\$?(\d+))?$')
+
+# sharedStrings.xml: etiqueta raíz (con su prefijo, si lo hay) y codificación
+_PATRON_SST = re.compile(rb'<(?:([^\s<>/:]+):)?sst[\s>]')
+_PATRON_CODIFICACION = re.compile(rb'encoding=["\']([^"\']+)')
+
+
+class ArchivoExcelNoValido(ValueError):
+    """El archivo no es un libro que se pueda leer: falta el libro, hay XML
+    dañado o una celda con un valor imposible"""
+    pass
+
+
+def _texto_rico(elemento):
+    # Texto de <si> o <is> como Text.content de openpyxl: el <t> directo y
+    # después el <t> de cada <r>; la fonética (<rPh>) no cuenta
+    partes = []
+    plano = None
+    for hijo in elemento:
+        nombre = hijo.tag.rpartition('}')[2]
+        if nombre == 't':
+            plano = hijo.text
+        elif nombre == 'r':
+            texto = None
+            for parte in hijo:
+                if parte.tag.rpartition('}')[2] == 't':
+                    texto = parte.text
+            if texto is not None:
+                partes.append(texto)
+    if plano is not None:
+        partes.insert(0, plano)
+    return ''.join(partes)
+
+
+class CadenasCompartidas:
+    """Índice de la tabla de cadenas compartidas (sharedStrings.xml): solo
+    se anota dónde empieza cada <si> en el XML descomprimido, y cada cadena
+    se decodifica al pedirla. El XML se recorre a medida que se piden
+    índices más altos, así que leer unas filas no cuesta convertir cientos
+    de miles de cadenas que no se usan. Si el XML supera
+    UMBRAL_CADENAS_EN_DISCO, el XML y las posiciones van a temporales."""
+
+    def __init__(self, paquete, parte):
+        self._paquete = paquete
+        self._parte = parte
+        self._textos = None
+        self._conocidas = 0  # posiciones anotadas (la última es el fin del XML)
+        if paquete.getinfo(parte).file_size > UMBRAL_CADENAS_EN_DISCO:
+            self._datos = tempfile.TemporaryFile()
+            self._posiciones = tempfile.TemporaryFile()
+        else:
+            self._datos = bytearray()
+            self._posiciones = array('Q')
+        self._origen = paquete.open(parte)
+        if not self._empezar():
+            self._leer_entera()
+
+    def _empezar(self):
+        # Lee el primer bloque y la etiqueta raíz; False si el XML no admite
+        # el índice por bytes (DOCTYPE o una codificación que no es UTF-8)
+        primero = self._origen.read(TAMANO_BLOQUE_XLSX)
+        raiz = _PATRON_SST.search(primero)
+        if raiz is None or primero.find(b'>', raiz.start()) < 0:
+            return False
+        prologo = primero[:raiz.start()]
+        codificacion = _PATRON_CODIFICACION.search(prologo)
+        if b'<!' in prologo or (codificacion and codificacion.group(1).lower() not in (b'utf-8', b'utf8')):
+            return False
+
+        prefijo = (raiz.group(1) + b':') if raiz.group(1) else b''
+        fin_raiz = primero.index(b'>', raiz.start()) + 1
+        self._raiz = primero[raiz.start():fin_raiz]
+        self._cierre_raiz = b'</' + prefijo + b'sst>'
+        self._cierre_si = b'</' + prefijo + b'si>'
+        self._simple = re.compile(
+            rb'<%(p)ssi>\s*<%(p)st(?: xml:space="preserve")?>([^<&\r]*)</%(p)st>\s*</%(p)ssi>'
+            % {b'p': re.escape(prefijo)}
+        )
+        self._patron_si = re.compile(rb'<' + re.escape(prefijo) + rb'si[\s/>]')
+        self._solape = len(prefijo) + 3  # una etiqueta <si partida entre dos bloques
+        self._guardar(primero)
+        self._guardados = len(primero)
+        self._pendiente, self._base = primero[fin_raiz:], fin_raiz
+        return True
+
+    def _avanzar(self):
+        # Anota las posiciones del bloque pendiente y lee el siguiente. Un
+        # comentario o CDATA podría contener un "<si" falso: en ese caso la
+        # tabla se lee entera, como hace openpyxl.
+        if b'<!' in self._pendiente or b'<?' in self._pendiente:
+            self._leer_entera()
+            return
+        posiciones = array('Q', (self._base + coincidencia.start()
+                                 for coincidencia in self._patron_si.finditer(self._pendiente)))
+        bloque = self._origen.read(TAMANO_BLOQUE_XLSX)
+        if not bloque:
+            posiciones.append(self._guardados)  # fin de la última cadena
+            self._origen.close()
+            self._origen = None
+        else:
+            self._guardar(bloque)
+            cola = self._pendiente[-self._solape:]
+            self._base = self._guardados - len(cola)
+            self._guardados += len(bloque)
+            self._pendiente = cola + bloque
+        self._guardar_posiciones(posiciones)
+
+    def _leer_entera(self):
+        self.cerrar()
+        with self._paquete.open(self._parte) as origen:
+            self._textos = self._leer_textos(origen)
+
+    def _guardar(self, bloque):
+        if isinstance(self._datos, bytearray):
+            self._datos += bloque
+        else:
+            self._datos.seek(0, 2)
+            self._datos.write(bloque)
+
+    def _guardar_posiciones(self, posiciones):
+        if isinstance(self._posiciones, array):
+            self._posiciones.extend(posiciones)
+        else:
+            self._posiciones.seek(0, 2)
+            self._posiciones.write(posiciones.tobytes())
+        self._conocidas += len(posiciones)
+
+    @staticmethod
+    def _leer_textos(origen):
+        # Mismo texto que read_string_table de openpyxl
+        textos = []
+        try:
+            for evento, elemento in ET.iterparse(origen):
+                if elemento.tag == _TAG_SI:
+                    textos.append(_texto_rico(elemento).replace('x005F_', ''))
+                    elemento.clear()
+        except ET.ParseError as e:
+            raise ArchivoExcelNoValido(f"XML no válido en sharedStrings.xml: {e}")
+        return textos
+
+    def _fragmento(self, indice):
+        # Bytes desde el <si> pedido hasta el siguiente
+        if isinstance(self._posiciones, array):
+            inicio, fin = self._posiciones[indice], self._posiciones[indice + 1]
+            return bytes(self._datos[inicio:fin])
+        self._posiciones.seek(indice * 8)
+        inicio, fin = struct.unpack('<2Q', self._posiciones.read(16))
+        self._datos.seek(inicio)
+        return self._datos.read(fin - inicio)
+
+    def __len__(self):
+        while self._textos is None and self._origen is not None:
+            self._avanzar()
+        return len(self._textos) if self._textos is not None else self._conocidas - 1
+
+    def __getitem__(self, indice):
+        # Para la cadena 'indice' hace falta saber dónde empieza la siguiente
+        while self._textos is None and self._origen is not None and self._conocidas <= indice + 1:
+            self._avanzar()
+        if self._textos is not None:
+            return self._textos[indice]
+        if not 0 <= indice < self._conocidas - 1:
+            raise IndexError(indice)
+        fragmento = self._fragmento(indice)
+        simple = self._simple.match(fragmento)
+        if simple:
+            texto = simple.group(1).decode('utf-8')
+        else:
+            # Texto con entidades o formato: se analiza solo este <si>,
+            # dentro de la etiqueta raíz para conservar los namespaces
+            fin = fragmento.rfind(self._cierre_si)
+            fragmento = fragmento[:fin + len(self._cierre_si)] if fin >= 0 else fragmento[:fragmento.index(b'>') + 1]
+            try:
+                texto = _texto_rico(ET.fromstring(self._raiz + fragmento + self._cierre_raiz)[0])
+            except ET.ParseError as e:
+                raise ArchivoExcelNoValido(f"XML no válido en sharedStrings.xml: {e}")
+        return texto.replace('x005F_', '')
+
+    def cerrar(self):
+        if self._origen is not None:
+            self._origen.close()
+            self._origen = None
+        for temporal in (self._datos, self._posiciones):
+            if not isinstance(temporal, (bytearray, array)):
+                temporal.close()
+        self._datos, self._posiciones = bytearray(), array('Q')
+
+
+@functools.lru_cache(maxsize=None)
+def _indice_columna(letras):
+    # "A" -> 1, "AA" -> 27
+    indice = 0
+    for letra in letras.upper():
+        indice = indice * 26 + ord(letra) - 64
+    return indice
+
+
+def _columna_de_celda(ref):
+    # "B12" -> 2; admite referencias absolutas ("$B$12")
+    return _indice_columna(ref.rstrip('0123456789').strip('$'))
+
+
+def _numero_de_fila(ref, anterior):
+    # Como openpyxl: sin atributo r es la siguiente; "12.0" vale, "12.5" no
+    if ref is None:
+        return anterior + 1
+    try:
+        return int(ref)
+    except ValueError:
+        numero = float(ref)
+        if not numero.is_integer():
+            raise ArchivoExcelNoValido(f"{ref} no es un número de fila válido")
+        return int(numero)
+
+
+def _limites(ref):
+    # (filas, columnas) de la referencia de <dimension>, o (None, None)
+    coincidencia = _PATRON_REF.match(ref or '')
+    if not coincidencia:
+        return None, None
+    letras, fila = coincidencia.group(3) or coincidencia.group(1), coincidencia.group(4) or coincidencia.group(2)
+    return int(fila), _indice_columna(letras)
+
+
+class LectorExcel:
+    """Lee un libro .xlsx directamente del zip, sin el lector de openpyxl:
+    la estructura (hojas y dimensiones) sale de workbook.xml y sus
+    relaciones, y las celdas del XML de la hoja, fila a fila. Los valores
+    son los mismos que da openpyxl en modo read-only con data_only (el
+    resultado calculado de las fórmulas). De la tabla de cadenas
+    compartidas solo se decodifican las que usa el rango leído. El zip se
+    abre la primera vez que hace falta y sigue abierto hasta cerrar() o el
+    final del bloque with: un mismo lector sirve para todo un trabajo."""
+
+    def __init__(self, ruta):
+        self.ruta = ruta
+        self._zip = None
+        self._hojas = None  # nombre -> parte XML de la hoja (None si no tiene celdas)
+        self._parte_cadenas = None
+        self._parte_estilos = None
+        self._fecha_1904 = False
+        self._cadenas = None
+        self._estilos_fecha = None
+        self._estilos_duracion = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.cerrar()
+
+    def cerrar(self):
+        if self._cadenas is not None:
+            self._cadenas.cerrar()
+            self._cadenas = None
+        if self._zip is not None:
+            self._zip.close()
+            self._zip = None
+
+    # ========================================================================
+    # ESTRUCTURA DEL PAQUETE
+    # ========================================================================
+
+    def _libro(self):
+        if self._zip is None:
+            self._zip = zipfile.ZipFile(self.ruta)
+            try:
+                self._leer_estructura()
+            except BaseException:
+                self.cerrar()
+                raise
+        return self._zip
+
+    def _leer_estructura(self):
+        # Hojas en el orden de workbook.xml, con la parte XML de cada una
+        # según las relaciones del libro. Como openpyxl, se omiten las hojas
+        # cuya parte no está en el paquete y las de gráficos no tienen celdas.
+        nombres = set(self._zip.namelist())
+        libro = next((destino for tipo, destino in self._relaciones('').values()
+                      if tipo.endswith('/officeDocument')), 'xl/workbook.xml')
+        if libro not in nombres:
+            raise ArchivoExcelNoValido(f"El archivo no contiene un libro de Excel (falta {libro})")
+        relaciones = self._relaciones(libro)
+        xml_libro = self._xml(libro)
+
+        self._hojas = {}
+        for hoja in xml_libro.findall('{*}sheets/{*}sheet'):
+            tipo, destino = relaciones.get(hoja.get(_NS_RELACIONES), ('', None))
+            if destino not in nombres:
+                continue
+            self._hojas[hoja.get('name')] = None if 'chartsheet' in tipo else destino
+
+        propiedades = xml_libro.find('{*}workbookPr')
+        self._fecha_1904 = propiedades is not None and propiedades.get('date1904') in ('1', 'true')
+        for tipo, destino in relaciones.values():
+            if destino in nombres and tipo.endswith('/sharedStrings'):
+                self._parte_cadenas = destino
+            elif destino in nombres and tipo.endswith('/styles'):
+                self._parte_estilos = destino
+        # Algunos generadores no declaran estas partes en las relaciones
+        if self._parte_cadenas is None and 'xl/sharedStrings.xml' in nombres:
+            self._parte_cadenas = 'xl/sharedStrings.xml'
+        if self._parte_estilos is None and 'xl/styles.xml' in nombres:
+            self._parte_estilos = 'xl/styles.xml'
+
+    def _relaciones(self, parte):
+        # {Id: (Type, parte destino)} del .rels de una parte ('' = el paquete)
+        carpeta, nombre = posixpath.split(parte)
+        ruta_rels = posixpath.join(carpeta, '_rels', nombre + '.rels')
+        if ruta_rels not in self._zip.NameToInfo:
+            return {}
+        relaciones = {}
+        for relacion in self._xml(ruta_rels).findall('{*}Relationship'):
+            if relacion.get('TargetMode') == 'External':
+                continue
+            destino = relacion.get('Target', '')
+            if destino.startswith('/'):
+                destino = destino.lstrip('/')
+            else:
+                destino = posixpath.normpath(posixpath.join(carpeta, destino))
+            relaciones[relacion.get('Id')] = (relacion.get('Type', ''), destino)
+        return relaciones
+
+    def _xml(self, parte):
+        try:
+            return ET.fromstring(self._zip.read(parte))
+        except KeyError:
+            # zipfile avisa así de una parte que no está en el paquete
+            raise ArchivoExcelNoValido(f"Falta {parte} en el paquete")
+        except ET.ParseError as e:
+            raise ArchivoExcelNoValido(f"XML no válido en {parte}: {e}")
+
+    def _dimensiones(self, parte):
+        # (filas, columnas) de <dimension>, que va antes de <sheetData>: se
+        # deja de leer la hoja al llegar a sus filas
+        with self._zip.open(parte) as origen:
+            try:
+                for evento, elemento in ET.iterparse(origen, events=('start', 'end')):
+                    if evento == 'start':
+                        if elemento.tag == _TAG_SHEETDATA:
+                            break
+                    elif elemento.tag == _TAG_DIMENSION:
+                        return _limites(elemento.get('ref'))
+            except ET.ParseError as e:
+                raise ArchivoExcelNoValido(f"XML no válido en {parte}: {e}")
+        return None, None
+
+    # ========================================================================
+    # CELDAS
+    # ========================================================================
+
+    def _cargar_estilos(self):
+        # Índices de los estilos de celda con formato de fecha o de duración,
+        # calculados como openpyxl. openpyxl solo se importa si algún estilo
+        # tiene un formato de número distinto de General.
+        self._estilos_fecha, self._estilos_duracion = set(), set()
+        if self._parte_estilos is None:
+            return
+        estilos = self._xml(self._parte_estilos)
+        propios = {int(formato.get('numFmtId')): formato.get('formatCode')
+                   for formato in estilos.findall('{*}numFmts/{*}numFmt')}
+        formatos = [int(xf.get('numFmtId', 0)) for xf in estilos.findall('{*}cellXfs/{*}xf')]
+        if not any(formatos):
+            return
+        from openpyxl.styles.numbers import BUILTIN_FORMATS, is_date_format, is_timedelta_format
+        for indice, formato in enumerate(formatos):
+            codigo = propios[formato] if formato in propios else BUILTIN_FORMATS.get(formato)
+            if is_date_format(codigo):
+                self._estilos_fecha.add(indice)
+            if is_timedelta_format(codigo):
+                self._estilos_duracion.add(indice)
+
+    def _cadena(self, indice):
+        if self._cadenas is None:
+            self._cadenas = CadenasCompartidas(self._zip, self._parte_cadenas) if self._parte_cadenas else ()
+        try:
+            return self._cadenas[indice]
+        except IndexError:
+            raise ArchivoExcelNoValido(f"La celda usa la cadena compartida {indice}, que no existe en el libro")
+
+    def _valor(self, celda):
+        # Valor de una <c> como WorkSheetParser.parse_cell de openpyxl con data_only
+        tipo = celda.get('t', 'n')
+        if tipo == 'inlineStr':
+            texto = celda.find(_TAG_TEXTO_EN_LINEA)
+            return None if texto is None else _texto_rico(texto)
+        valor = celda.findtext(_TAG_VALOR) or None
+        if valor is None:
+            return None
+        if tipo == 'n':
+            numero = float(valor) if ('.' in valor or 'E' in valor or 'e' in valor) else int(valor)
+            estilo = celda.get('s', 0)
+            if estilo:
+                estilo = int(estilo)
+            if estilo not in self._estilos_fecha:
+                return numero
+            from openpyxl.utils.datetime import from_excel, CALENDAR_MAC_1904, CALENDAR_WINDOWS_1900
+            try:
+                return from_excel(numero, CALENDAR_MAC_1904 if self._fecha_1904 else CALENDAR_WINDOWS_1900,
+                                  timedelta=estilo in self._estilos_duracion)
+            except (OverflowError, ValueError):
+                return '#VALUE!'
+        if tipo == 's':
+            return self._cadena(int(valor))
+        if tipo == 'b':
+            return bool(int(valor))
+        if tipo == 'd':
+            from openpyxl.utils.datetime import from_ISO8601
+            return from_ISO8601(valor)
+        return valor  # 'str', 'e' (errores como '#N/A') y tipos desconocidos
+
+    def _filas(self, parte, columnas, desde):
+        # Genera (fila, {columna: valor}) con solo las columnas pedidas (desde
+        # 1); las filas anteriores a 'desde' salen sin valores. Cada fila se
+        # suelta de <sheetData> al terminar con ella, así la memoria no crece
+        # con el tamaño de la hoja.
+        fila = 0
+        contenedor = None
+        with self._zip.open(parte) as origen:
+            try:
+                for evento, elemento in ET.iterparse(origen, events=('start', 'end')):
+                    if evento == 'start':
+                        if elemento.tag == _TAG_SHEETDATA:
+                            contenedor = elemento
+                        continue
+                    if elemento.tag != _TAG_FILA:
+                        continue
+                    try:
+                        fila = _numero_de_fila(elemento.get('r'), fila)
+                        valores = {}
+                        if fila >= desde:
+                            columna = 0
+                            for celda in elemento:
+                                ref = celda.get('r')
+                                columna = _columna_de_celda(ref) if ref else columna + 1
+                                if columna in columnas:
+                                    valores[columna] = self._valor(celda)
+                    except ArchivoExcelNoValido:
+                        raise
+                    except ValueError as e:
+                        # Número, referencia o booleano que no se puede convertir
+                        raise ArchivoExcelNoValido(f"Valor no válido en {parte} (fila {fila}): {e}")
+                    yield fila, valores
+                    if contenedor is not None:
+                        contenedor.clear()
+            except ET.ParseError as e:
+                raise ArchivoExcelNoValido(f"XML no válido en {parte}: {e}")
+
+    # ========================================================================
+    # LECTURA
+    # ========================================================================
+
+    def leer_metadatos(self, callback=None):
+        # Nombre y dimensiones de cada hoja, leídos de la etiqueta <dimension>
+        # del XML sin recorrer las celdas. filas/columnas = None si el archivo
+        # no trae esa información o la hoja no tiene celdas (gráficos).
+        self._libro()
+        hojas = []
+        for idx, (nombre, parte) in enumerate(self._hojas.items(), 1):
+            filas, columnas = self._dimensiones(parte) if parte else (None, None)
+            hojas.append({'hoja': nombre, 'filas': filas, 'columnas': columnas})
+            if callback:
+                callback(idx, len(self._hojas), nombre)
+        return hojas
+
+    def leer_columna(self, hoja, columna_idx, fila_ini, fila_fin):
+        # Genera (fila_excel, valor) solo para la columna y el rango pedidos
+        for fila_excel, (valor,) in self.leer_columnas(hoja, [columna_idx], fila_ini, fila_fin):
+            yield fila_excel, valor
+
+    def leer_columnas(self, hoja, columnas_idx, fila_ini, fila_fin):
+        # Genera (fila_excel, (valor, ...)) con un valor por cada índice pedido,
+        # en una sola pasada por la hoja. Las filas que faltan en el XML dentro
+        # del rango salen vacías, igual que con openpyxl.
+        self._libro()
+        if hoja not in self._hojas:
+            raise KeyError(f"Worksheet {hoja} does not exist.")
+        parte = self._hojas[hoja]
+        if parte is None:
+            raise ArchivoExcelNoValido(f"La hoja '{hoja}' es un gráfico y no tiene celdas")
+        if self._estilos_fecha is None:
+            self._cargar_estilos()
+
+        columnas = [idx + 1 for idx in columnas_idx]
+        vacia = (None,) * len(columnas)
+        siguiente = fila_ini
+        for fila_excel, valores in self._filas(parte, set(columnas), fila_ini):
+            if fila_excel > fila_fin:
+                # La hoja sigue después del rango: se completa hasta fila_fin
+                for fila_vacia in range(siguiente, fila_fin + 1):
+                    yield fila_vacia, vacia
+                break
+            if fila_excel < siguiente:
+                continue
+            for fila_vacia in range(siguiente, fila_excel):
+                yield fila_vacia, vacia
+            yield fila_excel, tuple(valores.get(columna) for columna in columnas)
+            siguiente = fila_excel + 1
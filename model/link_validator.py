@@ -3,10 +3,12 @@
 # MODELO - Lógica de negocio de validación de enlaces (MODIFICADO)
 # ============================================================================
 
-import pandas as pd
-import requests
-from bs4 import BeautifulSoup
+import math
+import threading
 import time
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from concurrent.futures.process import BrokenProcessPool
 from datetime import datetime
 from urllib.parse import urlparse
 import warnings
@@ -16,10 +18,16 @@ from config.constants import (
     CODIGOS_HTTP_EXITOSOS,
     TIMEOUT_HTTP,
     MAX_REINTENTOS,
-    DELAY_DEFAULT,
-    KEYWORDS_ERROR_CRITICO,
-    KEYWORDS_AD_BLOCKER,
-    KEYWORDS_LOGIN,
+    MAX_HILOS_VALIDACION,
+    PROCESOS_ANALISIS_HTML,
+    MAX_REINICIOS_POOL_HTML,
+    VENTANA_FILAS_LOTE,
+    MAX_URLS_RECIENTES,
+    ANTIGUEDAD_REVALIDACION,
+    MAX_BYTES_HTML,
+    TAMANO_BLOQUE_HTML,
+    POOL_HOSTS_HTTP,
+    POOL_CONEXIONES_POR_HOST,
     MENSAJE_CELDA_VACIA,
     MENSAJE_NO_ES_URL,
     MENSAJE_ERROR_NORMALIZACION,
@@ -29,20 +37,128 @@ from config.constants import (
     MENSAJE_ERROR_CONEXION,
     MENSAJE_DEMASIADAS_REDIRECCIONES,
     MENSAJE_ERROR_REINTENTOS,
+    MENSAJE_HOST_NO_DISPONIBLE,
     MENSAJE_PAGINA_PROBLEMATICA,
     MENSAJE_REQUIERE_LOGIN,
+    MENSAJE_ANALISIS_FALLIDO,
+    MENSAJE_CUERPO_CORTADO,
+    MENSAJE_ERROR_INESPERADO,
     EMOJI_NO_VALIDO,
 )
+from model.analizador_html import analizar_bloques_html, analizar_html, analizar_inicio_html
+from model.interruptor_hosts import InterruptorHosts
+from model.planificador_hosts import PlanificadorHosts
+from model.resolutor_dns import ResolutorDNS
 from logger import get_logger
 
 warnings.filterwarnings('ignore', message='Unverified HTTPS request')
 
+
+def es_vacia(valor):
+    # None, NaN (celdas vacías de Parquet o de un DataFrame) o texto en blanco.
+    # Sustituye a isna de pandas, que tarda en importarse y solo servía para esto.
+    if valor is None:
+        return True
+    if isinstance(valor, float):
+        return math.isnan(valor)
+    return isinstance(valor, str) and not valor.strip()
+
+
 class LinkValidator:
     
-    def __init__(self):
+    def __init__(self, max_hilos=MAX_HILOS_VALIDACION, pool_hosts=POOL_HOSTS_HTTP,
+                 pool_por_host=POOL_CONEXIONES_POR_HOST, planificador=None,
+                 max_bytes_html=MAX_BYTES_HTML, cache=None, resolutor=None,
+                 interruptor=None, procesos_html=PROCESOS_ANALISIS_HTML):
         self.headers = HEADERS_HTTP
         self.codigos_exitosos = CODIGOS_HTTP_EXITOSOS
+        self.max_hilos = max(1, int(max_hilos))
+        self.max_bytes_html = max_bytes_html
+        self.cache = cache
+        self.resolutor = resolutor or ResolutorDNS()
+        self.interruptor = interruptor or InterruptorHosts()
+        self.planificador = planificador or PlanificadorHosts()
         self.logger = get_logger()
+        
+        # Pool de conexiones compartido por todos los hilos (urllib3 es thread-safe).
+        # Cada hilo usa su propia Session para no compartir cookies ni estado.
+        # requests se importa con la primera petición: la ventana y la línea
+        # de comandos arrancan sin esperar a cargarlo.
+        self._pool_hosts = pool_hosts
+        self._pool_por_host = pool_por_host
+        self._adapter = None
+        self._lock_adapter = threading.Lock()
+        self._local = threading.local()
+        
+        # Análisis HTML en procesos aparte (0 = en el propio hilo de red). El
+        # pool se crea con la primera página que haya que analizar.
+        self.procesos_html = max(0, int(procesos_html or 0))
+        self._pool_procesos = None
+        self._lock_pool = threading.Lock()
+        self._reinicios_pool = 0
+    
+    def _obtener_adapter(self):
+        with self._lock_adapter:
+            if self._adapter is None:
+                from requests.adapters import HTTPAdapter
+                self._adapter = HTTPAdapter(
+                    pool_connections=self._pool_hosts,
+                    pool_maxsize=self._pool_por_host,
+                    max_retries=0
+                )
+            return self._adapter
+    
+    def _obtener_sesion(self):
+        sesion = getattr(self._local, 'sesion', None)
+        if sesion is None:
+            import requests
+            adapter = self._obtener_adapter()
+            sesion = requests.Session()
+            sesion.headers.update(self.headers)
+            sesion.mount('http://', adapter)
+            sesion.mount('https://', adapter)
+            self._local.sesion = sesion
+        # Igual que requests.get: las cookies no pasan de una URL a otra
+        sesion.cookies.clear()
+        return sesion
+    
+    def cerrar(self):
+        # Cierra las conexiones guardadas en el pool y los procesos de análisis
+        if self._adapter is not None:
+            self._adapter.close()
+        if self._pool_procesos is not None:
+            self._pool_procesos.shutdown(wait=True, cancel_futures=True)
+            self._pool_procesos = None
+    
+    def _obtener_pool_procesos(self):
+        # None si ya no se usan procesos (el pool se rompió demasiadas veces)
+        with self._lock_pool:
+            if self._pool_procesos is None and self.procesos_html:
+                import multiprocessing
+                from concurrent.futures import ProcessPoolExecutor
+                # spawn y no fork: copiar un proceso con hilos de red en marcha
+                # puede dejar locks tomados en el hijo
+                self._pool_procesos = ProcessPoolExecutor(
+                    max_workers=self.procesos_html,
+                    mp_context=multiprocessing.get_context('spawn')
+                )
+            return self._pool_procesos
+    
+    def _descartar_pool_procesos(self, pool, error):
+        # Un proceso del pool murió (falta de memoria, señal...): el pool queda
+        # roto y cada submit fallaría. Se descarta para rehacerlo con la
+        # siguiente página o, tras MAX_REINICIOS_POOL_HTML, se sigue en hilos.
+        with self._lock_pool:
+            if self._pool_procesos is not pool:
+                return  # Otro hilo ya lo descartó
+            self._pool_procesos = None
+            self._reinicios_pool += 1
+            if self._reinicios_pool >= MAX_REINICIOS_POOL_HTML:
+                self.procesos_html = 0
+        pool.shutdown(wait=False, cancel_futures=True)
+        destino = "en los hilos de red" if not self.procesos_html else "con un pool nuevo"
+        self.logger.warning(f"{EMOJI_NO_VALIDO} El pool de análisis HTML se rompió ({error}); "
+                            f"se sigue analizando {destino}")
 
     # ========================================================================
     # UTILIDADES
@@ -58,7 +174,7 @@ class LinkValidator:
     
     @staticmethod
     def normalizar_url(url):
-        if pd.isna(url) or not url:
+        if es_vacia(url) or not url:
             return None
             
         url = str(url).strip()
@@ -66,9 +182,19 @@ class LinkValidator:
             url = 'https://' + url
         return url
     
+    @staticmethod
+    def obtener_host(url):
+        url_norm = LinkValidator.normalizar_url(url)
+        if not url_norm:
+            return ''
+        try:
+            return (urlparse(url_norm).hostname or '').lower()
+        except ValueError:
+            return ''
+    
     @staticmethod
     def es_url_valida(url):
-        if pd.isna(url) or not url:
+        if es_vacia(url) or not url:
             return False
         
         url_str = str(url).strip()
@@ -83,38 +209,58 @@ class LinkValidator:
     # VERIFICACIÓN HTTP
     # ========================================================================
     
-    def hacer_request(self, url, timeout=TIMEOUT_HTTP, max_retries=MAX_REINTENTOS):
+    def hacer_request(self, url, timeout=TIMEOUT_HTTP, max_retries=MAX_REINTENTOS, intervalo=None):
+        import requests
+        host = self.obtener_host(url)
         for intento in range(max_retries + 1):
+            # Host con demasiados fallos seguidos: no se intenta
+            if not self.interruptor.permitir(host):
+                return None, MENSAJE_HOST_NO_DISPONIBLE, False
+            
             try:
-                response = requests.get(
+                # Respetar el intervalo mínimo entre peticiones al mismo dominio
+                self.planificador.esperar_turno(host, intervalo)
+                response = self._obtener_sesion().get(
                     url, 
-                    headers=self.headers, 
                     timeout=timeout,
                     allow_redirects=True,
-                    verify=False
+                    verify=False,
+                    stream=True  # El cuerpo solo se descarga si se va a analizar
                 )
+                self.interruptor.registrar_exito(host)
                 return response, None, False
                 
             except requests.exceptions.SSLError:
+                self.interruptor.registrar_exito(host)
                 return None, MENSAJE_ERROR_SSL, True
                 
             except requests.exceptions.Timeout:
+                self.interruptor.registrar_fallo(host)
                 if intento < max_retries:
                     time.sleep(1)
                     continue
                 return None, MENSAJE_TIMEOUT, False
                 
             except requests.exceptions.ConnectionError:
+                self.interruptor.registrar_fallo(host)
                 if intento < max_retries:
                     time.sleep(1)
                     continue
                 return None, MENSAJE_ERROR_CONEXION, False
                 
             except requests.exceptions.TooManyRedirects:
+                self.interruptor.registrar_exito(host)
                 return None, MENSAJE_DEMASIADAS_REDIRECCIONES, False
                 
             except requests.exceptions.RequestException as e:
+                self.interruptor.registrar_exito(host)
                 return None, f"Error: {str(e)[:50]}", False
+            
+            except BaseException:
+                # Cualquier otro error: si esta petición era la sonda de un host
+                # semiabierto, no puede quedar en curso para siempre
+                self.interruptor.liberar_sonda(host)
+                raise
         
         return None, MENSAJE_ERROR_REINTENTOS, False
     
@@ -122,48 +268,90 @@ class LinkValidator:
     # ANÁLISIS DE CONTENIDO HTML
     # ========================================================================
     
-    def analizar_contenido_html(self, response):
+    def analizar_contenido_html(self, response, medidas=None):
+        # medidas (opcional): diccionario donde se anota 'bytes_leidos'
+        import requests
+        en_procesos = bool(self.procesos_html)
         try:
-            soup = BeautifulSoup(response.content, 'html.parser')
-            title = soup.find('title')
-            title_text = title.get_text().lower() if title else ""
-            body = soup.find('body')
-            body_text = body.get_text().lower() if body else ""
-            
-            contenido_completo = title_text + " " + body_text
-            
-            # Verificar errores críticos y dominios en venta
-            if any(err in contenido_completo for err in KEYWORDS_ERROR_CRITICO):
-                return 'error'
-            
-            # Detectar bloqueadores de anuncios
-            if any(keyword in contenido_completo for keyword in KEYWORDS_AD_BLOCKER):
-                return 'validar'
-            
-            # Detección de login/contraseña
-            if any(keyword in contenido_completo for keyword in KEYWORDS_LOGIN):
-                return 'validar'
-            
-            return 'ok'
-            
+            if en_procesos:
+                return self._analizar_en_procesos(response, medidas)
+            # Leer por bloques hasta el límite, parando en cuanto haya veredicto
+            return analizar_bloques_html(
+                response.iter_content(chunk_size=TAMANO_BLOQUE_HTML),
+                response.headers.get('Content-Type', ''),
+                self.max_bytes_html,
+                medidas
+            )
+        except (requests.exceptions.ConnectionError,
+                requests.exceptions.ChunkedEncodingError,
+                requests.exceptions.Timeout) as e:
+            # Con stream=True el cuerpo se lee aquí: un corte o un servidor que
+            # deja de enviar es un fallo del host, no de la página
+            self.interruptor.registrar_fallo(self.obtener_host(response.url))
+            self.logger.warning(f"{EMOJI_NO_VALIDO} Se cortó la lectura de {response.url}: {e}")
+            return 'cortada'
         except Exception as e:
             self.logger.warning(f"{EMOJI_NO_VALIDO} No se pudo analizar el contenido HTML de {response.url}: {e}")
-            return 'ok'
+            # En los hilos solo puede fallar el análisis y la página se da por
+            # buena; con procesos el fallo puede venir del pool y se deja
+            # para revisar
+            return 'fallo' if en_procesos else 'ok'
+    
+    def _analizar_en_procesos(self, response, medidas=None):
+        # La descarga sigue en este hilo; al proceso solo van los bytes y el
+        # Content-Type. El primer bloque se mira aquí: si ya decide (dominio
+        # en venta, página de error) no se descarga el resto, como en el
+        # análisis en los hilos. Un bloque retiene poco el GIL; esperar a un
+        # proceso ocupado con otras páginas llegaba tarde.
+        content_type = response.headers.get('Content-Type', '')
+        partes = []
+        bytes_leidos = 0
+        try:
+            for bloque in response.iter_content(chunk_size=TAMANO_BLOQUE_HTML):
+                partes.append(bloque)
+                bytes_leidos += len(bloque)
+                if len(partes) == 1:
+                    veredicto = analizar_inicio_html(bloque, content_type)
+                    if veredicto is not None:
+                        return veredicto
+                if bytes_leidos >= self.max_bytes_html:
+                    break
+        finally:
+            if medidas is not None:
+                medidas['bytes_leidos'] = bytes_leidos
+        
+        contenido = b''.join(partes)
+        pool = self._obtener_pool_procesos()
+        if pool is not None:
+            try:
+                return pool.submit(analizar_html, contenido, content_type).result()
+            except BrokenProcessPool as e:
+                self._descartar_pool_procesos(pool, e)
+        # Sin pool (roto demasiadas veces) o con el pool roto: la página
+        # no tiene la culpa y se analiza en este hilo
+        return analizar_html(contenido, content_type)
     
     # ========================================================================
     # VALIDACIÓN PRINCIPAL
     # ========================================================================
     
-    def validar_url(self, url, delay=DELAY_DEFAULT):
+    def validar_url(self, url, delay=None):
+        inicio = time.perf_counter()
+        resultado = self._validar_url(url, delay)
+        resultado['tiempo_ms'] = round((time.perf_counter() - inicio) * 1000, 1)
+        return resultado
+    
+    def _validar_url(self, url, delay=None):
         resultado = {
             'url_original': url,
             'estado': None,
             'detalles': '',
+            'codigo_http': None,
             'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
         }
         
         # PASO 1: Verificar si está vacío
-        if pd.isna(url) or not str(url).strip():
+        if es_vacia(url):
             resultado['detalles'] = MENSAJE_CELDA_VACIA
             return resultado
             
@@ -182,69 +370,358 @@ class LinkValidator:
         if url_norm.startswith('http://'):
             resultado['estado'] = 'validar'
             resultado['detalles'] = MENSAJE_SIN_SSL
-            time.sleep(delay)
+            self._marcar_verificada(url_norm)
+            return resultado
+        
+        # PASO 3.6: Resultado reciente en la caché local (sin tocar la red)
+        if self.cache is not None:
+            en_cache = self.cache.obtener(url_norm)
+            if en_cache:
+                resultado.update(en_cache)
+                return resultado
+        
+        # PASO 3.7: Dominio que no existe en DNS (no se intenta la conexión)
+        if self.resolutor.host_inexistente(self.obtener_host(url_norm)):
+            resultado['estado'] = 'no_valido'
+            resultado['detalles'] = MENSAJE_ERROR_CONEXION
+            self._marcar_verificada(url_norm)
             return resultado
         
+        self._validar_en_red(url_norm, resultado, delay)
+        # Un host con el circuito abierto no se llegó a probar, y un análisis
+        # fallido o cortado no dice nada de la página: no se guardan como acierto
+        if resultado['detalles'] in (MENSAJE_HOST_NO_DISPONIBLE, MENSAJE_ANALISIS_FALLIDO,
+                                     MENSAJE_CUERPO_CORTADO):
+            self._marcar_verificada(url_norm)
+        elif self.cache is not None:
+            self.cache.guardar(url_norm, resultado)
+        return resultado
+    
+    def _marcar_verificada(self, url_norm):
+        # Resultados que no sirven de acierto en la caché: se anota solo la
+        # fecha, para que el modo incremental no los valide en cada ejecución
+        if self.cache is not None:
+            self.cache.marcar_verificada(url_norm)
+    
+    def _validar_en_red(self, url_norm, resultado, delay=None):
         # PASO 4: Hacer request HTTP
-        response, error, requiere_validacion = self.hacer_request(url_norm)
+        response, error, requiere_validacion = self.hacer_request(url_norm, intervalo=delay)
         
         # Si requiere validación (ej: SSL Error)
         if requiere_validacion:
             resultado['estado'] = 'validar'
             resultado['detalles'] = error
-            time.sleep(delay)
             return resultado
         
         # Si hay error definitivo
         if error:
             resultado['estado'] = 'no_valido'
             resultado['detalles'] = error
-            time.sleep(delay)
             return resultado
         
+        # PASO 5 en adelante: clasificar la respuesta y liberar la conexión
+        try:
+            return self._clasificar_respuesta(response, resultado)
+        finally:
+            response.close()
+    
+    def _clasificar_respuesta(self, response, resultado):
+        resultado['codigo_http'] = response.status_code
+        resultado['url_final'] = response.url
+        resultado['bytes_leidos'] = 0
+        
         # PASO 5: Verificar código HTTP
         if response.status_code not in self.codigos_exitosos and response.status_code != 403:
             resultado['estado'] = 'no_valido'
             resultado['detalles'] = f"HTTP {response.status_code}"
-            time.sleep(delay)
             return resultado
         
         # PASO 6: Análisis HTML
         content_type = response.headers.get('Content-Type', '').lower()
         if 'text/html' in content_type or 'application/xhtml' in content_type:
-            analisis = self.analizar_contenido_html(response)
+            analisis = self.analizar_contenido_html(response, medidas=resultado)
             if analisis == 'error':
                 resultado['estado'] = 'no_valido'
                 resultado['detalles'] = MENSAJE_PAGINA_PROBLEMATICA
-                time.sleep(delay)
                 return resultado
             elif analisis == 'validar':
                 resultado['estado'] = 'validar'
                 resultado['detalles'] = MENSAJE_REQUIERE_LOGIN
-                time.sleep(delay)
+                return resultado
+            elif analisis == 'fallo':
+                resultado['estado'] = 'validar'
+                resultado['detalles'] = MENSAJE_ANALISIS_FALLIDO
+                return resultado
+            elif analisis == 'cortada':
+                resultado['estado'] = 'no_valido'
+                resultado['detalles'] = MENSAJE_CUERPO_CORTADO
                 return resultado
         
         # PASO 7: Todo está bien
         resultado['estado'] = 'valido'
         resultado['detalles'] = f"OK - HTTP {response.status_code}"
-        time.sleep(delay)
         return resultado
     
     # ========================================================================
     # VALIDACIÓN EN LOTE
     # ========================================================================
     
-    def validar_lote_con_filas(self, urls_con_filas, delay=DELAY_DEFAULT, callback=None):
-        resultados = []
-        total = len(urls_con_filas)
+    def seleccionar_pendientes(self, filas_con_resultado, antiguedad_maxima=ANTIGUEDAD_REVALIDACION):
+        # Modo incremental: recibe (fila_excel, url, resultado_actual) y devuelve
+        # los (fila_excel, url) que necesitan validarse: resultado vacío, o URL
+        # verificada hace más de antiguedad_maxima según la caché. Las celdas
+        # sin URL no tienen nada que validar y se omiten.
+        pendientes = []
+        clasificadas = []
+        for fila_excel, url, resultado_actual in filas_con_resultado:
+            if es_vacia(url):
+                continue
+            if resultado_actual is None or str(resultado_actual).strip() == "":
+                pendientes.append((fila_excel, url))
+            else:
+                clasificadas.append((fila_excel, url))
+        
+        if not clasificadas or antiguedad_maxima is None or self.cache is None or not self.cache.activa:
+            return pendientes
+        
+        # Sin fecha en la caché (validadas sin caché, o con la fecha ya
+        # purgada por antigua) no se puede saber la antigüedad: se vuelven a
+        # validar. Los resultados que no se guardan como acierto (http://,
+        # DNS, circuito abierto, análisis fallido) sí dejan su fecha.
+        urls_norm = [self.normalizar_url(url) for _, url in clasificadas]
+        fechas = self.cache.fechas_verificacion({u for u in urls_norm if u})
+        limite = time.time() - antiguedad_maxima
+        for (fila_excel, url), url_norm in zip(clasificadas, urls_norm):
+            if fechas.get(url_norm, 0) < limite:
+                pendientes.append((fila_excel, url))
         
-        for idx, (fila_excel, url) in enumerate(urls_con_filas, 1):
-            resultado = self.validar_url(url, delay)
+        pendientes.sort()
+        return pendientes
+    
+    def _clave_de_url(self, url):
+        # Clave para compartir resultado entre filas: la URL normalizada si sale
+        # a la red; None si se resuelve sin conexión (vacía, texto, http://)
+        url_norm = self.normalizar_url(url)
+        if url_norm and url_norm.startswith('https://') and self.es_url_valida(url_norm):
+            return url_norm
+        return None
+    
+    def iterar_lote(self, entradas, delay=None, callback=None, max_hilos=None,
+                    debe_detener=None, total=None, ventana=VENTANA_FILAS_LOTE,
+                    estadisticas=None, en_orden=True):
+        # Generador: lee (fila, url[, objetivo]) de cualquier iterable a medida
+        # que hay sitio y devuelve los resultados en el orden de entrada, o
+        # según terminan si en_orden=False. Nunca hay más de `ventana` filas
+        # entre la lectura y la salida, y la lectura solo avanza cuando se
+        # consumen resultados: la memoria no depende del número de filas.
+        # Las filas con la misma URL comparten una sola consulta: dentro de la
+        # ventana mientras está en vuelo, y después gracias a las últimas
+        # MAX_URLS_RECIENTES URLs validadas.
+        # Para cancelar: debe_detener() -> True entrega lo ya validado y
+        # termina; close() sobre el generador termina en el acto. En ambos
+        # casos se descartan las URLs sin empezar y se esperan las que están
+        # en curso.
+        entradas = iter(entradas)
+        max_hilos = max(1, int(max_hilos or self.max_hilos))
+        ventana = max(1, int(ventana))
+        if estadisticas is None:
+            estadisticas = {}
+        estadisticas.update(leidas=0, consultas=0, ahorradas=0, dominios_inexistentes=0)
+        
+        cola = deque()             # [entrada, resultado] en orden de entrada
+        listos = deque()           # [entrada, resultado] según terminan (en_orden=False)
+        esperando = {}             # clave -> filas que esperan ese resultado
+        por_host = {}              # host -> deque de (clave, url) sin enviar
+        turno_hosts = deque()      # hosts con trabajo, en orden de turno
+        en_vuelo = {}              # futuro -> clave
+        recientes = OrderedDict()  # url_norm -> resultado (LRU acotado)
+        procesados = 0
+        entregados = 0
+        agotadas = False
+        
+        def completar(hueco, resultado_url):
+            nonlocal procesados
+            entrada = hueco[0]
+            fila_excel, url = entrada[0], entrada[1]
+            resultado = dict(resultado_url)
+            resultado['url_original'] = url
             resultado['fila_excel'] = fila_excel
-            resultados.append(resultado)
+            if len(entrada) > 2:
+                # Lotes de varios objetivos: (fila, url, objetivo)
+                resultado['objetivo'] = entrada[2]
+            hueco[1] = resultado
+            procesados += 1
+            if not en_orden:
+                listos.append(hueco)
             
             # Llamar al callback si existe (para actualizar UI)
             if callback:
-                callback(url, idx, total, resultado, fila_excel)
+                callback(url, procesados, total, resultado, fila_excel)
+        
+        executor = ThreadPoolExecutor(max_workers=max_hilos, thread_name_prefix="validador")
+        try:
+            while True:
+                detener = bool(debe_detener and debe_detener())
+                
+                # 1. Leer hasta llenar la ventana
+                hosts_nuevos = set()
+                while not agotadas and not detener and estadisticas['leidas'] - entregados < ventana:
+                    entrada = next(entradas, None)
+                    if entrada is None:
+                        agotadas = True
+                        break
+                    estadisticas['leidas'] += 1
+                    hueco = [entrada, None]
+                    if en_orden:
+                        cola.append(hueco)
+                    
+                    clave = self._clave_de_url(entrada[1])
+                    if clave is not None and clave in recientes:
+                        recientes.move_to_end(clave)
+                        estadisticas['ahorradas'] += 1
+                        completar(hueco, recientes[clave])
+                        continue
+                    if clave is not None and clave in esperando:
+                        esperando[clave].append(hueco)
+                        estadisticas['ahorradas'] += 1
+                        continue
+                    if clave is None:
+                        # Sin conexión: cada fila es su propio grupo
+                        clave = ('fila', estadisticas['leidas'])
+                    else:
+                        hosts_nuevos.add(self.obtener_host(clave))
+                    esperando[clave] = [hueco]
+                    host = self.obtener_host(entrada[1])
+                    if host not in por_host:
+                        por_host[host] = deque()
+                        turno_hosts.append(host)
+                    por_host[host].append((clave, entrada[1]))
+                
+                # Los dominios nuevos se resuelven en paralelo antes de enviarlos,
+                # así los inexistentes se marcan sin intentar la conexión
+                if hosts_nuevos:
+                    resueltos = self.resolutor.resolver_hosts(hosts_nuevos)
+                    estadisticas['dominios_inexistentes'] += sum(
+                        1 for resuelve in resueltos.values() if resuelve is False
+                    )
+                
+                # 2. Enviar alternando dominios, para que un host lento (esperando
+                # su turno) no acapare todos los hilos; en vuelo como mucho 2 por hilo
+                while turno_hosts and not detener and len(en_vuelo) < max_hilos * 2:
+                    host = turno_hosts.popleft()
+                    clave, url = por_host[host].popleft()
+                    if por_host[host]:
+                        turno_hosts.append(host)
+                    else:
+                        del por_host[host]
+                    en_vuelo[executor.submit(self.validar_url, url, delay)] = clave
+                    estadisticas['consultas'] += 1
+                
+                # 3. Entregar las filas ya resueltas
+                while cola and cola[0][1] is not None:
+                    entregados += 1
+                    yield cola.popleft()[1]
+                while listos:
+                    entregados += 1
+                    yield listos.popleft()[1]
+                
+                if not en_vuelo:
+                    if detener or (agotadas and not turno_hosts):
+                        break
+                    continue
+                
+                completados, _ = wait(en_vuelo, return_when=FIRST_COMPLETED)
+                for futuro in completados:
+                    clave = en_vuelo.pop(futuro)
+                    try:
+                        resultado_url = futuro.result()
+                    except Exception as e:
+                        # Un fallo con una URL no puede tirar el lote entero: sus
+                        # filas quedan para revisar y no se recuerda el resultado
+                        self.logger.warning(f"{EMOJI_NO_VALIDO} Error inesperado al validar {clave}: "
+                                            f"{type(e).__name__}: {e}")
+                        for hueco in esperando.pop(clave):
+                            completar(hueco, {
+                                'estado': 'validar',
+                                'detalles': f"{MENSAJE_ERROR_INESPERADO} ({type(e).__name__}: {e})",
+                                'codigo_http': None,
+                                'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+                            })
+                        continue
+                    for hueco in esperando.pop(clave):
+                        completar(hueco, resultado_url)
+                    if isinstance(clave, str):
+                        recientes[clave] = resultado_url
+                        if len(recientes) > MAX_URLS_RECIENTES:
+                            recientes.popitem(last=False)
+                
+                if debe_detener and debe_detener():
+                    # Se entregan las filas ya validadas; el resto se descarta
+                    for hueco in cola:
+                        if hueco[1] is not None:
+                            yield hueco[1]
+                    cola.clear()
+                    while listos:
+                        yield listos.popleft()[1]
+                    break
+        finally:
+            # Si se detuvo, descartar lo que aún no empezó
+            executor.shutdown(wait=True, cancel_futures=True)
+            if estadisticas['dominios_inexistentes']:
+                self.logger.warning(
+                    f"{EMOJI_NO_VALIDO} {estadisticas['dominios_inexistentes']} dominios no existen en DNS"
+                )
+    
+    async def aiterar_lote(self, entradas, delay=None, callback=None, debe_detener=None,
+                           en_orden=True, **opciones):
+        # Versión asíncrona de iterar_lote para usar el motor desde asyncio:
+        #     async for resultado in validador.aiterar_lote(filas, en_orden=False): ...
+        # El generador corre en un hilo y se le pide un resultado cada vez que
+        # el consumidor lo pide, así que la contrapresión es la misma. Cancelar
+        # la tarea, salir del bucle o aclose() detienen la validación.
+        import asyncio
+        
+        cancelada = threading.Event()
+        
+        def detener():
+            return cancelada.is_set() or bool(debe_detener and debe_detener())
+        
+        resultados = self.iterar_lote(
+            entradas, delay, callback=callback, debe_detener=detener, en_orden=en_orden, **opciones
+        )
+        fin = object()
+        # Un generador no admite next() y close() a la vez desde dos hilos
+        lock = threading.Lock()
         
-        return resultados
\ No newline at end of file
+        def siguiente():
+            with lock:
+                return next(resultados, fin)
+        
+        def cerrar():
+            with lock:
+                resultados.close()
+        
+        loop = asyncio.get_running_loop()
+        try:
+            while True:
+                resultado = await loop.run_in_executor(None, siguiente)
+                if resultado is fin:
+                    break
+                yield resultado
+        finally:
+            cancelada.set()
+            await loop.run_in_executor(None, cerrar)
+    
+    def validar_lote_con_filas(self, urls_con_filas, delay=None, callback=None,
+                               max_hilos=None, debe_detener=None):
+        # Lote ya en memoria: toda la lista cabe en la ventana
+        urls_con_filas = list(urls_con_filas)
+        return list(self.iterar_lote(
+            urls_con_filas,
+            delay,
+            callback=callback,
+            max_hilos=max_hilos,
+            debe_detener=debe_detener,
+            total=len(urls_con_filas),
+            ventana=max(1, len(urls_con_filas)),
+        ))
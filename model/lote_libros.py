@@ -0,0 +1,139 @@
+# ============================================================================
+# model/lote_libros.py
+# MODELO - Validación de muchos libros con una configuración compartida
+# ============================================================================
+
+import glob
+import os
+import time
+
+from errors import errores_archivo_excel
+from model.registro_detalles import RegistroDetalles
+from model.trabajo_validacion import ObjetivoValidacion, TrabajoValidacion, contadores_vacios
+
+EXTENSIONES_LIBRO = ('.xlsx', '.xlsm')
+
+
+def expandir_rutas(patron):
+    # Carpeta -> sus libros .xlsx/.xlsm; cualquier otra cosa se trata como glob.
+    # Se omiten los archivos de bloqueo de Excel (~$libro.xlsx).
+    if os.path.isdir(patron):
+        candidatos = [os.path.join(patron, nombre) for nombre in os.listdir(patron)]
+    else:
+        candidatos = glob.glob(patron, recursive=True)
+    return sorted(
+        ruta for ruta in candidatos
+        if os.path.isfile(ruta)
+        and ruta.lower().endswith(EXTENSIONES_LIBRO)
+        and not os.path.basename(ruta).startswith('~$')
+    )
+
+
+class LoteLibros:
+    """Valida una lista de libros con la misma columna, rango y columna de
+    resultados. Todos usan el mismo LinkValidator, así comparten pool de
+    conexiones, caché de resultados, DNS y circuit breaker: una URL que
+    aparece en varios libros solo sale a la red la primera vez."""
+
+    def __init__(self, rutas, hoja, columna, fila_ini, fila_fin, columna_resultado, validador,
+                 detalles=True):
+        self.rutas = list(rutas)
+        self.hoja = hoja  # None = primera hoja de cada libro
+        self.columna = columna
+        self.fila_ini = fila_ini
+        self.fila_fin = fila_fin
+        self.columna_resultado = columna_resultado
+        self.validador = validador
+        self.detalles = detalles  # Un RegistroDetalles junto a cada libro
+
+    def ejecutar(self, delay=None, incremental=False, callback=None, debe_detener=None,
+                 al_empezar_libro=None):
+        # Devuelve un resumen por libro: archivo, hoja, filas, contadores,
+        # segundos, detalles (ruta del detalle por fila, o None si no se
+        # escribió) y error (None si se completó). Un libro con error no
+        # detiene el resto. al_empezar_libro(indice, total_libros, ruta, filas_estimadas)
+        resumen = []
+        for indice, ruta in enumerate(self.rutas, 1):
+            if debe_detener and debe_detener():
+                break
+
+            registro = {
+                'archivo': ruta,
+                'hoja': self.hoja,
+                'filas': 0,
+                'contadores': contadores_vacios(),
+                'segundos': 0.0,
+                'detalles': None,
+                'error': None,
+            }
+            resumen.append(registro)
+            inicio = time.time()
+            detalles = None
+            try:
+                from model.lector_excel import LectorExcel
+                with LectorExcel(ruta) as lector:
+                    hojas = [metadatos['hoja'] for metadatos in lector.leer_metadatos()]
+                hoja = self.hoja or (hojas[0] if hojas else None)
+                if hoja not in hojas:
+                    registro['error'] = f"No existe la hoja '{hoja}'" if hoja else "El libro no tiene hojas"
+                    continue
+                registro['hoja'] = hoja
+                objetivo = ObjetivoValidacion(hoja, self.columna, self.fila_ini, self.fila_fin,
+                                              self.columna_resultado)
+                trabajo = TrabajoValidacion(ruta, [objetivo], self.validador)
+                total = trabajo.estimar_filas()
+
+                if al_empezar_libro:
+                    al_empezar_libro(indice, len(self.rutas), ruta, total)
+
+                callback_libro = callback
+                if self.detalles:
+                    detalles = RegistroDetalles(ruta)
+                    callback_libro = self._con_detalles(callback, detalles, hoja)
+                registro['filas'] = trabajo.validar(trabajo.iterar_entradas(incremental), delay,
+                                                    callback=callback_libro, debe_detener=debe_detener,
+                                                    total=total)
+                if debe_detener and debe_detener():
+                    # Igual que en la validación de un libro: sin completar no se escribe
+                    registro['error'] = "Detenido antes de terminar (sin guardar)"
+                    break
+                registro['contadores'] = trabajo.guardar()
+
+            except FileNotFoundError:
+                registro['error'] = "Archivo no encontrado"
+            except PermissionError:
+                registro['error'] = "Archivo bloqueado o sin permisos (¿abierto en Excel?)"
+            except errores_archivo_excel() as e:
+                registro['error'] = f"Archivo no válido: {e}"
+            except Exception as e:
+                # Cualquier otro fallo también es de este libro: se anota y se
+                # sigue con el siguiente
+                registro['error'] = f"Error inesperado ({type(e).__name__}): {e}"
+            finally:
+                if detalles is not None:
+                    detalles.cerrar()
+                    if detalles.filas:
+                        registro['detalles'] = detalles.ruta
+                registro['segundos'] = time.time() - inicio
+        return resumen
+
+    @staticmethod
+    def _con_detalles(callback, detalles, hoja):
+        # Callback que además guarda cada resultado en el detalle del libro
+        def registrar(url, idx, total, resultado, fila_excel):
+            resultado['hoja'] = hoja
+            detalles.registrar(resultado)
+            if callback:
+                callback(url, idx, total, resultado, fila_excel)
+        return registrar
+
+    @staticmethod
+    def totales(resumen):
+        totales = contadores_vacios()
+        totales['libros'] = len(resumen)
+        totales['con_error'] = sum(1 for registro in resumen if registro['error'])
+        totales['filas'] = sum(registro['filas'] for registro in resumen)
+        for registro in resumen:
+            for clave, valor in registro['contadores'].items():
+                totales[clave] += valor
+        return totales
@@ -0,0 +1,60 @@
+# ============================================================================
+# model/planificador_hosts.py
+# MODELO - Reparte los turnos de petición por dominio (cortesía por host)
+# ============================================================================
+
+import threading
+import time
+from collections import OrderedDict
+
+from config.constants import DELAY_DEFAULT, INTERVALOS_POR_HOST, MAX_HOSTS_RECORDADOS
+
+
+class PlanificadorHosts:
+    
+    def __init__(self, intervalo_default=DELAY_DEFAULT, intervalos_por_host=None):
+        self.intervalo_default = intervalo_default
+        if intervalos_por_host is None:
+            intervalos_por_host = INTERVALOS_POR_HOST
+        self.intervalos_por_host = {
+            host.lower(): intervalo for host, intervalo in intervalos_por_host.items()
+        }
+        # Momento (time.monotonic) a partir del cual cada host acepta otra petición,
+        # del host reservado hace más tiempo al más reciente
+        self._proximo_turno = OrderedDict()
+        self._lock = threading.Lock()
+    
+    def intervalo_para(self, host, intervalo=None):
+        # Prioridad: configuración del dominio > intervalo pedido > intervalo por defecto
+        if host in self.intervalos_por_host:
+            return self.intervalos_por_host[host]
+        if intervalo is not None:
+            return intervalo
+        return self.intervalo_default
+    
+    def _olvidar_turnos(self, ahora):
+        # Un turno ya pasado equivale a no tener entrada: se quitan desde los
+        # más antiguos, y también los que sobren por encima del máximo
+        turnos = self._proximo_turno
+        while turnos:
+            turno = next(iter(turnos.values()))
+            if turno > ahora and len(turnos) <= MAX_HOSTS_RECORDADOS:
+                break
+            turnos.popitem(last=False)
+    
+    def esperar_turno(self, host, intervalo=None):
+        host = (host or '').lower()
+        intervalo = max(0.0, float(self.intervalo_para(host, intervalo)))
+        
+        # Reservar el turno con el lock y dormir fuera de él,
+        # así los hilos de otros dominios no esperan
+        with self._lock:
+            ahora = time.monotonic()
+            turno = max(ahora, self._proximo_turno.pop(host, ahora))
+            self._proximo_turno[host] = turno + intervalo
+            self._olvidar_turnos(ahora)
+        
+        espera = turno - ahora
+        if espera > 0:
+            time.sleep(espera)
+        return espera
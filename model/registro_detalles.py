@@ -0,0 +1,68 @@
+# ============================================================================
+# model/registro_detalles.py
+# MODELO - Archivo de detalle por fila junto al libro (Parquet o CSV)
+# ============================================================================
+
+import os
+from datetime import datetime
+
+from config.constants import TAMANO_BLOQUE_DETALLES, EMOJI_VALIDAR
+from model.adaptadores_archivos import (
+    CAMPOS_RESULTADO,
+    PYARROW_DISPONIBLE,
+    DestinoCSV,
+    DestinoParquet,
+)
+from logger import get_logger
+
+# El detalle añade la hoja de cada fila a los campos de resultado
+CAMPOS_DETALLES = ['hoja'] + CAMPOS_RESULTADO
+
+
+class RegistroDetalles:
+    """Guarda por cada fila el código HTTP, detalle, URL final, bytes leídos
+    y tiempo empleado. Cada ejecución crea su propio archivo
+    <libro>.detalles_<fecha>.parquet, que se escribe por bloques."""
+
+    def __init__(self, ruta_excel, tamano_bloque=TAMANO_BLOQUE_DETALLES):
+        base, _ = os.path.splitext(ruta_excel)
+        marca = datetime.now().strftime("%Y%m%d_%H%M%S")
+        extension = '.parquet' if PYARROW_DISPONIBLE else '.csv'
+        self.ruta = f"{base}.detalles_{marca}{extension}"
+        self.tamano_bloque = tamano_bloque
+        self.logger = get_logger()
+        self.activo = True
+        self.filas = 0
+        self._destino = None
+        self._pendientes = []
+
+    def registrar(self, resultado):
+        if not self.activo:
+            return
+        self._pendientes.append(resultado)
+        if len(self._pendientes) >= self.tamano_bloque:
+            self.volcar()
+
+    def volcar(self):
+        if not self.activo or not self._pendientes:
+            return
+        try:
+            # El archivo se crea con el primer bloque: sin filas no queda archivo vacío
+            if self._destino is None:
+                clase = DestinoParquet if PYARROW_DISPONIBLE else DestinoCSV
+                self._destino = clase(self.ruta, campos=CAMPOS_DETALLES)
+            self._destino.escribir(self._pendientes)
+            self.filas += len(self._pendientes)
+        except OSError as e:
+            self.logger.warning(f"{EMOJI_VALIDAR} No se puede escribir el detalle por fila ({self.ruta}): {e}")
+            self.activo = False
+        self._pendientes = []
+
+    def cerrar(self):
+        self.volcar()
+        if self._destino is not None:
+            try:
+                self._destino.cerrar()
+            except OSError:
+                pass
+            self._destino = None
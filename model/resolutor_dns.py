@@ -0,0 +1,91 @@
+# ============================================================================
+# model/resolutor_dns.py
+# MODELO - Resolución DNS en paralelo, con caché, antes de la fase HTTP
+# ============================================================================
+
+import socket
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from urllib.request import getproxies
+
+from config.constants import MAX_HILOS_DNS, TTL_CACHE_DNS, MAX_HOSTS_RECORDADOS
+
+# Códigos de getaddrinfo que significan "el dominio no existe"
+_ERRORES_HOST_INEXISTENTE = {
+    codigo for codigo in (
+        getattr(socket, 'EAI_NONAME', None),
+        getattr(socket, 'EAI_NODATA', None),
+    ) if codigo is not None
+}
+
+
+class ResolutorDNS:
+    
+    def __init__(self, max_hilos=MAX_HILOS_DNS, ttl=TTL_CACHE_DNS):
+        self.max_hilos = max(1, int(max_hilos))
+        self.ttl = ttl
+        # host -> (resuelve, expira). resuelve: True, False o None (no se sabe).
+        # En orden de resolución: las primeras entradas son las que caducan antes
+        self._cache = OrderedDict()
+        self._lock = threading.Lock()
+        # Con proxy, el DNS local no dice nada sobre si el host es alcanzable
+        self.activo = 'https' not in getproxies()
+    
+    def resolver(self, host):
+        if not self.activo or not host:
+            return None
+        
+        ahora = time.monotonic()
+        with self._lock:
+            en_cache = self._cache.get(host)
+        if en_cache and en_cache[1] > ahora:
+            return en_cache[0]
+        
+        try:
+            socket.getaddrinfo(host, 443, type=socket.SOCK_STREAM)
+            resuelve = True
+        except socket.gaierror as e:
+            # Solo "no existe" es definitivo; fallos temporales los decide la fase HTTP
+            resuelve = False if e.errno in _ERRORES_HOST_INEXISTENTE else None
+        except (UnicodeError, OSError):
+            resuelve = None
+        
+        with self._lock:
+            self._cache.pop(host, None)
+            self._cache[host] = (resuelve, ahora + self.ttl)
+            self._olvidar_caducados(time.monotonic())
+        return resuelve
+    
+    def _olvidar_caducados(self, ahora):
+        # Se quitan las entradas caducadas y las que sobren por encima del máximo
+        while self._cache:
+            expira = next(iter(self._cache.values()))[1]
+            if expira > ahora and len(self._cache) <= MAX_HOSTS_RECORDADOS:
+                break
+            self._cache.popitem(last=False)
+    
+    def resolver_hosts(self, hosts):
+        hosts = [host for host in set(hosts) if host]
+        if not self.activo or not hosts:
+            return {}
+        
+        # Los hosts ya resueltos se contestan desde la caché; solo se abren
+        # hilos para los que faltan (en streaming se llama en cada bloque)
+        ahora = time.monotonic()
+        resultados = {}
+        with self._lock:
+            for host in hosts:
+                en_cache = self._cache.get(host)
+                if en_cache and en_cache[1] > ahora:
+                    resultados[host] = en_cache[0]
+        faltan = [host for host in hosts if host not in resultados]
+        if faltan:
+            with ThreadPoolExecutor(max_workers=min(self.max_hilos, len(faltan)),
+                                    thread_name_prefix="dns") as executor:
+                resultados.update(zip(faltan, executor.map(self.resolver, faltan)))
+        return resultados
+    
+    def host_inexistente(self, host):
+        return self.resolver(host) is False
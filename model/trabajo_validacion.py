@@ -0,0 +1,253 @@
+# ============================================================================
+# model/trabajo_validacion.py
+# MODELO - Trabajos con varios objetivos (hoja, columna, rango, resultado)
+# ============================================================================
+
+import heapq
+from itertools import islice
+
+from config.constants import (
+    VALOR_EXCEL_VALIDO,
+    VALOR_EXCEL_NO_VALIDO,
+    VALOR_EXCEL_VALIDAR,
+    TAMANO_BLOQUE_FILAS,
+)
+
+# Estado del modelo -> texto que se escribe en la columna de resultados
+VALORES_POR_ESTADO = {
+    'valido': VALOR_EXCEL_VALIDO,
+    'validar': VALOR_EXCEL_VALIDAR,
+    'no_valido': VALOR_EXCEL_NO_VALIDO,
+}
+
+# Estado del modelo -> clave en los contadores del resumen
+CONTADOR_POR_ESTADO = {
+    'valido': 'validos',
+    'validar': 'validar',
+    'no_valido': 'no_validos',
+}
+
+# Resultado de cada fila guardado en 1 byte mientras dura la validación:
+# 0 = sin validar (su celda no se toca), 1 = sin URL (la celda queda vacía)
+CODIGO_SIN_RESULTADO = 0
+CODIGO_VACIA = 1
+CODIGOS_POR_ESTADO = {'valido': 2, 'validar': 3, 'no_valido': 4}
+VALORES_POR_CODIGO = {CODIGO_VACIA: None}
+VALORES_POR_CODIGO.update({codigo: VALORES_POR_ESTADO[estado] for estado, codigo in CODIGOS_POR_ESTADO.items()})
+
+
+def contadores_vacios():
+    return {'validos': 0, 'no_validos': 0, 'validar': 0}
+
+
+class ObjetivoValidacion:
+    """Una columna de URLs de una hoja, con su rango y su columna de resultados"""
+
+    def __init__(self, hoja, columna, fila_ini, fila_fin, columna_resultado):
+        self.hoja = hoja
+        self.columna = columna.strip().upper()
+        self.fila_ini = int(fila_ini)
+        self.fila_fin = int(fila_fin)
+        self.columna_resultado = columna_resultado.strip().upper()
+
+    def descripcion(self):
+        return (f"{self.hoja} · {self.columna}{self.fila_ini}:{self.columna}{self.fila_fin}"
+                f" → {self.columna_resultado}")
+
+    def como_dict(self):
+        return {
+            'hoja': self.hoja,
+            'columna': self.columna,
+            'fila_ini': self.fila_ini,
+            'fila_fin': self.fila_fin,
+            'columna_resultado': self.columna_resultado,
+        }
+
+    def __eq__(self, otro):
+        return isinstance(otro, ObjetivoValidacion) and self.como_dict() == otro.como_dict()
+
+    def __hash__(self):
+        return hash(tuple(self.como_dict().values()))
+
+
+class TrabajoValidacion:
+    """Valida varios objetivos de un mismo libro en una sola pasada de red,
+    como un pipeline en streaming: las filas se leen a medida que el
+    validador tiene sitio, una URL repetida en varias hojas o columnas se
+    consulta una sola vez y de cada fila solo se guarda un byte hasta
+    escribir el libro. La memoria no crece con el número de filas."""
+
+    def __init__(self, ruta_excel, objetivos, validador):
+        self.ruta_excel = ruta_excel
+        self.objetivos = list(objetivos)
+        self.validador = validador
+        self.filas_leidas = 0
+        self.estadisticas = {}
+        # Un bytearray por objetivo; la posición es fila - fila_ini
+        self.codigos = [bytearray() for _ in self.objetivos]
+        self._lector = None
+
+    def _lector_excel(self):
+        # Un solo LectorExcel por trabajo: el libro se abre una vez para las
+        # dimensiones y todas las columnas, y se cierra al terminar de leer
+        if self._lector is None:
+            from model.lector_excel import LectorExcel
+            self._lector = LectorExcel(self.ruta_excel)
+        return self._lector
+
+    def _cerrar_lector(self):
+        if self._lector is not None:
+            self._lector.cerrar()
+            self._lector = None
+
+    def estimar_filas(self):
+        # Filas del rango que existen en cada hoja (sirve de total del progreso;
+        # en modo incremental es un máximo)
+        dimensiones = {info['hoja']: info['filas'] for info in self._lector_excel().leer_metadatos()}
+        total = 0
+        for objetivo in self.objetivos:
+            ultima = min(objetivo.fila_fin, dimensiones.get(objetivo.hoja) or objetivo.fila_fin)
+            total += max(0, ultima - objetivo.fila_ini + 1)
+        return total
+
+    def _contar_leidas(self, filas):
+        for fila in filas:
+            self.filas_leidas += 1
+            yield fila
+
+    def iterar_entradas(self, incremental=False):
+        # Genera (fila_excel, url, indice_objetivo) de todos los objetivos
+        # leyendo el libro en streaming. Se omiten las filas que ya tienen
+        # resultado (por ejemplo, recuperadas del diario de ejecución).
+        lector = self._lector_excel()
+        self.filas_leidas = 0
+        try:
+            yield from self._entradas(lector, incremental)
+        finally:
+            self._cerrar_lector()
+
+    def _entradas(self, lector, incremental):
+        for indice, objetivo in enumerate(self.objetivos):
+            col_idx = self.validador.letra_a_indice(objetivo.columna)
+            if incremental:
+                # La columna de resultados se lee en la misma pasada que la de
+                # URLs; la caché se consulta por bloques de filas
+                col_resultado_idx = self.validador.letra_a_indice(objetivo.columna_resultado)
+                filas_con_resultado = self._contar_leidas(
+                    (fila_excel, url, resultado_actual)
+                    for fila_excel, (url, resultado_actual) in lector.leer_columnas(
+                        objetivo.hoja, [col_idx, col_resultado_idx], objetivo.fila_ini, objetivo.fila_fin
+                    )
+                )
+                bloques = iter(lambda: list(islice(filas_con_resultado, TAMANO_BLOQUE_FILAS)), [])
+                filas = (fila for bloque in bloques for fila in self.validador.seleccionar_pendientes(bloque))
+            else:
+                filas = self._contar_leidas(
+                    lector.leer_columna(objetivo.hoja, col_idx, objetivo.fila_ini, objetivo.fila_fin)
+                )
+            for fila_excel, url in filas:
+                if not self.tiene_resultado(indice, fila_excel):
+                    yield fila_excel, url, indice
+
+    def tiene_resultado(self, indice, fila_excel):
+        posicion = fila_excel - self.objetivos[indice].fila_ini
+        codigos = self.codigos[indice]
+        return 0 <= posicion < len(codigos) and codigos[posicion] != CODIGO_SIN_RESULTADO
+
+    def registrar(self, resultado):
+        fila_excel = resultado.get('fila_excel')
+        if fila_excel is None:
+            return
+        indice = resultado.get('objetivo', 0)
+        posicion = fila_excel - self.objetivos[indice].fila_ini
+        if posicion < 0:
+            return
+        codigos = self.codigos[indice]
+        if posicion >= len(codigos):
+            codigos.extend(bytes(posicion - len(codigos) + 1))
+
+        # Si no hay estado (celda vacía), la celda de resultado queda vacía;
+        # cualquier estado desconocido cuenta como no válido, como antes
+        estado = resultado.get('estado')
+        if estado is None:
+            codigos[posicion] = CODIGO_VACIA
+        else:
+            codigos[posicion] = CODIGOS_POR_ESTADO.get(estado, CODIGOS_POR_ESTADO['no_valido'])
+
+    def validar(self, entradas, delay=None, callback=None, debe_detener=None, total=None):
+        # Consume las entradas (lista o generador) y registra cada resultado.
+        # Devuelve el número de filas validadas.
+        procesados = 0
+        for resultado in self.validador.iterar_lote(
+            entradas,
+            delay,
+            callback=callback,
+            debe_detener=debe_detener,
+            total=total,
+            estadisticas=self.estadisticas
+        ):
+            self.registrar(resultado)
+            procesados += 1
+        return procesados
+
+    def contadores(self):
+        contadores = contadores_vacios()
+        for codigos in self.codigos:
+            for estado, codigo in CODIGOS_POR_ESTADO.items():
+                contadores[CONTADOR_POR_ESTADO[estado]] += codigos.count(codigo)
+        return contadores
+
+    def _celdas_de_objetivo(self, indice):
+        objetivo = self.objetivos[indice]
+        columna = self.validador.letra_a_indice(objetivo.columna_resultado) + 1
+        for posicion, codigo in enumerate(self.codigos[indice]):
+            if codigo != CODIGO_SIN_RESULTADO:
+                yield objetivo.fila_ini + posicion, columna, VALORES_POR_CODIGO[codigo]
+
+    def _filas_de_hoja(self, hoja):
+        # (fila, {columna: valor}) en orden de fila, mezclando los objetivos
+        # que escriben en la misma hoja
+        celdas = heapq.merge(
+            *(self._celdas_de_objetivo(indice) for indice, objetivo in enumerate(self.objetivos)
+              if objetivo.hoja == hoja),
+            key=lambda celda: celda[0]
+        )
+        fila_actual, celdas_fila = None, {}
+        for fila, columna, valor in celdas:
+            if fila != fila_actual and celdas_fila:
+                yield fila_actual, celdas_fila
+                celdas_fila = {}
+            fila_actual = fila
+            celdas_fila[columna] = valor
+        if celdas_fila:
+            yield fila_actual, celdas_fila
+
+    def guardar(self, resultados=()):
+        # Registra los resultados recibidos (por ejemplo, los del diario) y
+        # escribe todos los objetivos con una sola reescritura del libro.
+        # Devuelve los contadores por estado.
+        for resultado in resultados:
+            self.registrar(resultado)
+        # El libro se reemplaza al escribirlo: no puede seguir abierto
+        self._cerrar_lector()
+
+        # Solo se reescribe el XML de las hojas con cambios dentro del .xlsx;
+        # cada hoja se escribe recorriendo sus filas, sin un dict de celdas
+        hojas = {objetivo.hoja for indice, objetivo in enumerate(self.objetivos)
+                 if self.codigos[indice].strip(b'\0')}
+        if hojas:
+            from model.escritor_xlsx import EscritorXlsx
+            EscritorXlsx(self.ruta_excel).escribir({hoja: _FilasDeHoja(self, hoja) for hoja in hojas})
+        return self.contadores()
+
+
+class _FilasDeHoja:
+    """Iterable reiterable de los cambios de una hoja: si el parche no es
+    posible, openpyxl vuelve a recorrerlos desde el principio"""
+
+    def __init__(self, trabajo, hoja):
+        self.trabajo = trabajo
+        self.hoja = hoja
+
+    def __iter__(self):
+        return self.trabajo._filas_de_hoja(self.hoja)
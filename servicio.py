@@ -0,0 +1,353 @@
+# ============================================================================
+# servicio.py
+# Servicio HTTP local: otras herramientas preguntan si un enlace funciona
+# sin abrir la aplicación. Un solo LinkValidator atiende a todos los clientes,
+# así comparten pool de conexiones, caché de resultados, DNS y turnos por dominio.
+# Uso: python servicio.py [--host 127.0.0.1] [--puerto 8787] [--hilos 8]
+#   GET  /salud                       estado y contadores del servicio
+#   GET  /validar?url=https://...     una URL -> JSON
+#   POST /validar  {"url": "..."}     una URL -> JSON
+#   POST /lote                        varias URLs -> NDJSON en streaming
+# El cuerpo de /lote es NDJSON o texto (una URL, "url" o {"id": ..., "url": ...}
+# por línea) o un JSON con la lista. Cada resultado se envía en cuanto
+# termina (?orden=entrada para recibirlos en el orden enviado).
+# No importa tkinter: usa directamente las clases del modelo.
+# ============================================================================
+
+import argparse
+import json
+import signal
+import sys
+import tempfile
+import threading
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs
+
+from config.constants import (
+    DELAY_DEFAULT,
+    MAX_HILOS_VALIDACION,
+    PROCESOS_ANALISIS_HTML,
+    SERVICIO_HOST,
+    SERVICIO_PUERTO,
+    SERVICIO_MAX_BYTES_JSON,
+    SERVICIO_BYTES_LOTE_EN_MEMORIA,
+    SALIDA_OK,
+    SALIDA_ERROR_USO,
+    EMOJI_INICIO,
+    EMOJI_CUIDADO,
+    EMOJI_NO_VALIDO,
+)
+from logger import get_logger
+from model.link_validator import LinkValidator
+from model.cache_resultados import CacheResultados
+from model.adaptadores_archivos import CAMPOS_RESULTADO, registro_de_resultado
+
+# Campos de cada respuesta: los de los destinos, con 'id' en lugar de 'fila'
+CAMPOS_RESPUESTA = ['id'] + [campo for campo in CAMPOS_RESULTADO if campo != 'fila']
+
+
+def como_respuesta(resultado):
+    registro = registro_de_resultado(resultado)
+    registro['id'] = registro.pop('fila')
+    return {campo: registro[campo] for campo in CAMPOS_RESPUESTA}
+
+
+def leer_entrada(valor, posicion):
+    # Un elemento del lote -> (id, url): "url" o {"id": ..., "url": ...}.
+    # Lo que no es una URL se valida igualmente y sale con su detalle, como
+    # una celda mal escrita.
+    if isinstance(valor, dict):
+        return valor.get('id', posicion), valor.get('url')
+    return posicion, valor
+
+
+def leer_linea(linea, posicion):
+    # Una línea NDJSON o de texto: JSON si se puede leer como tal, si no la URL tal cual
+    try:
+        valor = json.loads(linea)
+    except ValueError:
+        valor = linea
+    return leer_entrada(valor if isinstance(valor, (dict, str)) else linea, posicion)
+
+
+# ============================================================================
+# SERVIDOR
+# ============================================================================
+
+class ServicioValidacion(ThreadingHTTPServer):
+    """Servidor HTTP con un LinkValidator compartido por todas las peticiones"""
+
+    daemon_threads = True
+
+    def __init__(self, direccion, validador, delay=DELAY_DEFAULT):
+        super().__init__(direccion, ManejadorValidacion)
+        self.validador = validador
+        self.delay = delay
+        self.logger = get_logger()
+        self.inicio = datetime.now()
+        self._lock = threading.Lock()
+        self.contadores = {'solicitudes': 0, 'urls_validadas': 0, 'consultas_ahorradas': 0,
+                           'lotes_en_curso': 0}
+
+    def sumar(self, **incrementos):
+        with self._lock:
+            for clave, valor in incrementos.items():
+                self.contadores[clave] += valor
+
+    def estado(self):
+        with self._lock:
+            contadores = dict(self.contadores)
+        return {
+            'estado': 'ok',
+            'activo_desde': self.inicio.strftime("%Y-%m-%d %H:%M:%S"),
+            'hilos_por_lote': self.validador.max_hilos,
+            'cache': bool(self.validador.cache and self.validador.cache.activa),
+            **contadores,
+        }
+
+
+class ManejadorValidacion(BaseHTTPRequestHandler):
+
+    # HTTP/1.1: conexiones persistentes y respuestas por trozos (chunked)
+    protocol_version = 'HTTP/1.1'
+    server_version = 'ValidadorEnlaces'
+
+    def log_message(self, formato, *args):
+        self.server.logger.info(f"{self.address_string()} {formato % args}")
+
+    # ========================================================================
+    # RUTAS
+    # ========================================================================
+
+    def do_GET(self):
+        ruta = urlparse(self.path)
+        self.server.sumar(solicitudes=1)
+        if ruta.path == '/salud':
+            self._responder_json(200, self.server.estado())
+        elif ruta.path == '/validar':
+            url = parse_qs(ruta.query).get('url', [None])[0]
+            self._validar_una(url)
+        else:
+            self._responder_error(404, f"Ruta desconocida: {ruta.path}")
+
+    def do_POST(self):
+        ruta = urlparse(self.path)
+        self.server.sumar(solicitudes=1)
+        if ruta.path == '/validar':
+            cuerpo = self._leer_cuerpo_json()
+            if cuerpo is None:
+                return
+            if not isinstance(cuerpo, dict):
+                self._responder_error(400, 'Se esperaba {"url": "..."}')
+                return
+            self._validar_una(cuerpo.get('url'))
+        elif ruta.path == '/lote':
+            en_orden = parse_qs(ruta.query).get('orden', [''])[0] == 'entrada'
+            self._validar_lote(en_orden)
+        else:
+            self._responder_error(404, f"Ruta desconocida: {ruta.path}")
+
+    # ========================================================================
+    # VALIDACIÓN
+    # ========================================================================
+
+    def _validar_una(self, url):
+        if url is None:
+            self._responder_error(400, "Falta el parámetro 'url'")
+            return
+        resultado = dict(self.server.validador.validar_url(url, self.server.delay))
+        resultado['url_original'] = url
+        self.server.sumar(urls_validadas=1)
+        self._responder_json(200, como_respuesta(resultado))
+
+    def _validar_lote(self, en_orden):
+        entradas = self._entradas_del_lote()
+        if entradas is None:
+            return
+
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/x-ndjson; charset=utf-8')
+        self.send_header('Transfer-Encoding', 'chunked')
+        self.end_headers()
+
+        estadisticas = {}
+        resultados = self.server.validador.iterar_lote(
+            entradas,
+            self.server.delay,
+            estadisticas=estadisticas,
+            en_orden=en_orden
+        )
+        self.server.sumar(lotes_en_curso=1)
+        try:
+            try:
+                for resultado in resultados:
+                    linea = json.dumps(como_respuesta(resultado), ensure_ascii=False) + '\n'
+                    self._escribir_trozo(linea.encode('utf-8'))
+                    self.server.sumar(urls_validadas=1)
+            except (BrokenPipeError, ConnectionResetError):
+                raise
+            except Exception as e:
+                # El 200 ya salió: una última línea de error distingue el lote
+                # cortado de uno completo, y el trozo vacío cierra la respuesta
+                self.server.logger.error(f"{EMOJI_NO_VALIDO} Lote interrumpido por un error: {e}")
+                error = {'error': f"Lote interrumpido ({type(e).__name__}): {e}"}
+                self._escribir_trozo((json.dumps(error, ensure_ascii=False) + '\n').encode('utf-8'))
+                self.close_connection = True
+            self._escribir_trozo(b'')
+        except (BrokenPipeError, ConnectionResetError):
+            # El cliente cerró la conexión: se detiene su lote
+            self.close_connection = True
+        finally:
+            resultados.close()
+            self.server.sumar(lotes_en_curso=-1, consultas_ahorradas=estadisticas.get('ahorradas', 0))
+
+    def _entradas_del_lote(self):
+        # Generador de (id, url). El JSON se carga entero; NDJSON y texto se
+        # copian a un temporal (en disco si es grande) y se leen línea a línea
+        # mientras se validan. Se lee el cuerpo completo antes de responder:
+        # un cliente que envía todo antes de leer (http.client, requests) se
+        # bloquearía si el servidor dejara de leer mientras le envía resultados.
+        longitud = self._longitud_cuerpo()
+        if longitud is None:
+            return None
+        tipo = self.headers.get('Content-Type', '').split(';')[0].strip()
+        if tipo == 'application/json':
+            cuerpo = self._leer_cuerpo_json(longitud)
+            if cuerpo is None:
+                return None
+            if isinstance(cuerpo, dict):
+                cuerpo = cuerpo.get('urls')
+            if not isinstance(cuerpo, list):
+                self._responder_error(400, 'Se esperaba una lista de URLs o {"urls": [...]}')
+                return None
+            return (leer_entrada(valor, posicion) for posicion, valor in enumerate(cuerpo, 1))
+
+        cuerpo = tempfile.SpooledTemporaryFile(max_size=SERVICIO_BYTES_LOTE_EN_MEMORIA)
+        while longitud > 0:
+            bloque = self.rfile.read(min(longitud, 64 * 1024))
+            if not bloque:
+                break
+            cuerpo.write(bloque)
+            longitud -= len(bloque)
+        cuerpo.seek(0)
+        return self._lineas_del_cuerpo(cuerpo)
+
+    @staticmethod
+    def _lineas_del_cuerpo(cuerpo):
+        with cuerpo:
+            posicion = 0
+            for linea in cuerpo:
+                linea = linea.decode('utf-8', errors='replace').strip()
+                if linea:
+                    posicion += 1
+                    yield leer_linea(linea, posicion)
+
+    # ========================================================================
+    # LECTURA Y RESPUESTA
+    # ========================================================================
+
+    def _longitud_cuerpo(self):
+        try:
+            return int(self.headers['Content-Length'])
+        except (TypeError, ValueError):
+            self._responder_error(411, "Falta la cabecera Content-Length")
+            return None
+
+    def _leer_cuerpo_json(self, longitud=None):
+        if longitud is None:
+            longitud = self._longitud_cuerpo()
+            if longitud is None:
+                return None
+        if longitud > SERVICIO_MAX_BYTES_JSON:
+            self._responder_error(413, f"El JSON supera {SERVICIO_MAX_BYTES_JSON} bytes; "
+                                       f"envía el lote como NDJSON")
+            return None
+        try:
+            return json.loads(self.rfile.read(longitud) or b'null')
+        except ValueError as e:
+            self._responder_error(400, f"JSON no válido: {e}")
+            return None
+
+    def _escribir_trozo(self, datos):
+        self.wfile.write(f"{len(datos):X}\r\n".encode('ascii') + datos + b"\r\n")
+        self.wfile.flush()
+
+    def _responder_json(self, codigo, datos):
+        cuerpo = json.dumps(datos, ensure_ascii=False).encode('utf-8')
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'application/json; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def _responder_error(self, codigo, mensaje):
+        # El cuerpo que no se ha leído no se puede reutilizar: se cierra la conexión
+        self.close_connection = True
+        self._responder_json(codigo, {'error': mensaje})
+
+
+# ============================================================================
+# PUNTO DE ENTRADA
+# ============================================================================
+
+def crear_parser():
+    parser = argparse.ArgumentParser(
+        prog="servicio.py",
+        description="Servicio HTTP local para validar enlaces sueltos o por lotes."
+    )
+    parser.add_argument("--host", default=SERVICIO_HOST,
+                        help=f"dirección en la que escuchar (por defecto {SERVICIO_HOST})")
+    parser.add_argument("--puerto", type=int, default=SERVICIO_PUERTO,
+                        help=f"puerto (por defecto {SERVICIO_PUERTO})")
+    parser.add_argument("--hilos", type=int, default=MAX_HILOS_VALIDACION,
+                        help=f"hilos de validación por lote (por defecto {MAX_HILOS_VALIDACION})")
+    parser.add_argument("--delay", type=float, default=DELAY_DEFAULT,
+                        help=f"segundos entre peticiones al mismo dominio (por defecto {DELAY_DEFAULT})")
+    parser.add_argument("--procesos-html", type=int, default=PROCESOS_ANALISIS_HTML,
+                        help="procesos para analizar el HTML en paralelo (0 = en los hilos de red; "
+                             "útil con varios núcleos)")
+    parser.add_argument("--sin-cache", action="store_true", help="no usar la caché de resultados")
+    parser.add_argument("--log", help="guardar también los mensajes en este archivo")
+    return parser
+
+
+def _terminar(signum, frame):
+    raise KeyboardInterrupt
+
+
+def main(argv=None):
+    parser = crear_parser()
+    args = parser.parse_args(argv)
+    if args.hilos < 1:
+        parser.error("--hilos debe ser al menos 1")
+    if args.procesos_html < 0:
+        parser.error("--procesos-html no puede ser negativo")
+
+    logger = get_logger(guardar_en_archivo=bool(args.log), ruta_archivo=args.log)
+    cache = None if args.sin_cache else CacheResultados()
+    validador = LinkValidator(max_hilos=args.hilos, cache=cache, procesos_html=args.procesos_html)
+    try:
+        servidor = ServicioValidacion((args.host, args.puerto), validador, args.delay)
+    except OSError as e:
+        logger.error(f"{EMOJI_NO_VALIDO} No se puede escuchar en {args.host}:{args.puerto}: {e}")
+        validador.cerrar()
+        return SALIDA_ERROR_USO
+
+    signal.signal(signal.SIGTERM, _terminar)
+    host, puerto = servidor.server_address[:2]
+    logger.info(f"{EMOJI_INICIO} Servicio de validación en http://{host}:{puerto} (Ctrl+C para salir)")
+    try:
+        servidor.serve_forever()
+    except KeyboardInterrupt:
+        logger.warning(f"{EMOJI_CUIDADO} Deteniendo el servicio...")
+    finally:
+        servidor.server_close()
+        validador.cerrar()
+        if cache is not None:
+            cache.cerrar()
+    return SALIDA_OK
+
+
+if __name__ == "__main__":
+    sys.exit(main())
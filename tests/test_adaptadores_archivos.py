@@ -0,0 +1,100 @@
+# ============================================================================
+# tests/test_adaptadores_archivos.py
+# Ida y vuelta por los adaptadores: lo que escribe cada destino se vuelve a
+# leer con la fuente del mismo formato, con sus filas y URLs
+# Uso: python -m pytest tests/test_adaptadores_archivos.py
+#      (Parquet necesita pyarrow)
+# ============================================================================
+
+import csv
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from model.adaptadores_archivos import (
+    PYARROW_DISPONIBLE,
+    FormatoArchivoNoSoportado,
+    crear_destino,
+    crear_fuente,
+    procesar_por_bloques,
+)
+from model.link_validator import LinkValidator
+
+# Valores que se resuelven sin salir a la red
+URLS = ['http://sin-ssl.example.com', 'texto sin url', None, 'http://otra.example.com/ruta?a=1&b=ñ']
+
+
+class TestAdaptadoresArchivos(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.validador = LinkValidator(cache=None)
+
+    def tearDown(self):
+        self.validador.cerrar()
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def ruta(self, nombre):
+        return os.path.join(self.carpeta, nombre)
+
+    def crear_csv(self, nombre, delimitador=','):
+        with open(self.ruta(nombre), 'w', encoding='utf-8', newline='') as archivo:
+            escritor = csv.writer(archivo, delimiter=delimitador)
+            escritor.writerow(['id', 'url'])
+            for numero, url in enumerate(URLS):
+                escritor.writerow([numero, url or ''])
+        return self.ruta(nombre)
+
+    def leer(self, ruta, columna):
+        return [fila for bloque in crear_fuente(ruta, columna).leer_bloques(tamano=2) for fila in bloque]
+
+    def valores(self, ruta, columna):
+        return [valor if valor != '' else None for _, valor in self.leer(ruta, columna)]
+
+    def ida_y_vuelta(self, extension):
+        salida = self.ruta('resultados' + extension)
+        contadores = procesar_por_bloques(
+            crear_fuente(self.crear_csv('entrada.csv', ';'), 'url'),
+            crear_destino(salida),
+            self.validador,
+            tamano_bloque=3,
+            delay=0
+        )
+        self.assertEqual(contadores, {'validos': 0, 'no_validos': 0, 'validar': 2, 'procesados': 4})
+        # La fila es la del CSV de entrada (cabecera en la fila 1); CSV lo
+        # devuelve todo como texto y las celdas vacías como ''
+        self.assertEqual([int(fila) for fila in self.valores(salida, 'fila')], [2, 3, 4, 5])
+        self.assertEqual(self.valores(salida, 'url'), URLS)
+        self.assertEqual(self.valores(salida, 'resultado'), ['VALIDAR', None, None, 'VALIDAR'])
+
+    def test_csv(self):
+        self.ida_y_vuelta('.csv')
+
+    def test_jsonl(self):
+        self.ida_y_vuelta('.jsonl')
+
+    @unittest.skipUnless(PYARROW_DISPONIBLE, "falta pyarrow")
+    def test_parquet(self):
+        self.ida_y_vuelta('.parquet')
+
+    def test_jsonl_linea_corrupta(self):
+        ruta = self.ruta('entrada.jsonl')
+        with open(ruta, 'w', encoding='utf-8') as archivo:
+            archivo.write(json.dumps({'url': 'http://a.example.com'}) + '\n')
+            archivo.write('\n{"url": "cortada\n')
+            archivo.write(json.dumps({'otro': 1}) + '\n')
+        self.assertEqual(self.leer(ruta, 'url'), [(1, 'http://a.example.com'), (3, None), (4, None)])
+
+    def test_formatos_no_soportados(self):
+        with self.assertRaises(FormatoArchivoNoSoportado):
+            crear_fuente(self.ruta('datos.txt'), 'url')
+        with self.assertRaises(FormatoArchivoNoSoportado):
+            crear_destino(self.ruta('datos.xml'))
+        with self.assertRaises(FormatoArchivoNoSoportado):
+            self.leer(self.crear_csv('entrada.csv'), 'no_existe')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# ============================================================================
+# tests/test_analisis_procesos.py
+# Análisis HTML en un pool de procesos: si un proceso muere, las páginas se
+# siguen analizando (pool nuevo o en el hilo) y un fallo con procesos nunca
+# da 'ok'
+# Uso: python -m pytest tests/test_analisis_procesos.py
+# ============================================================================
+
+import os
+import unittest
+from concurrent.futures.process import BrokenProcessPool
+from unittest import mock
+
+from config.constants import MENSAJE_ANALISIS_FALLIDO, TAMANO_BLOQUE_HTML
+from model import link_validator
+from model.link_validator import LinkValidator
+
+PAGINA_BUENA = b"<html><head><title>Bienvenido</title></head><body>contenido real</body></html>"
+PAGINA_EN_VENTA = (b"<html><head><title>This domain is for sale</title></head>"
+                   b"<body>buy this domain</body></html>")
+RELLENO = b"<p>contenido</p>" * (TAMANO_BLOQUE_HTML // 16)
+# El primer bloque no decide: el veredicto sale del proceso
+PAGINA_EN_VENTA_AL_FINAL = PAGINA_BUENA.replace(b"</body>", RELLENO + b"buy this domain</body>")
+
+
+class RespuestaSimulada:
+    """Lo que _clasificar_respuesta usa de una respuesta de requests"""
+
+    def __init__(self, contenido, error=None):
+        self.contenido = contenido
+        self.error = error
+        self.status_code = 200
+        self.headers = {'Content-Type': 'text/html; charset=utf-8'}
+        self.url = 'https://pagina.example.com/'
+
+    def iter_content(self, chunk_size):
+        for inicio in range(0, len(self.contenido), chunk_size):
+            yield self.contenido[inicio:inicio + chunk_size]
+        if self.error is not None:
+            raise self.error
+
+
+class TestAnalisisProcesos(unittest.TestCase):
+
+    def setUp(self):
+        self.validador = LinkValidator(cache=None, procesos_html=1)
+
+    def tearDown(self):
+        self.validador.cerrar()
+
+    def analizar(self, contenido, error=None):
+        return self.validador.analizar_contenido_html(RespuestaSimulada(contenido, error))
+
+    def romper_pool(self):
+        # Un proceso del pool que muere de golpe, como con falta de memoria
+        pool = self.validador._obtener_pool_procesos()
+        with self.assertRaises(BrokenProcessPool):
+            pool.submit(os._exit, 1).result()
+        return pool
+
+    def test_pool_roto_se_rehace(self):
+        self.assertEqual(self.analizar(PAGINA_EN_VENTA_AL_FINAL), 'error')
+        roto = self.romper_pool()
+
+        # La página que encuentra el pool roto se analiza en el hilo
+        self.assertEqual(self.analizar(PAGINA_EN_VENTA_AL_FINAL), 'error')
+        self.assertEqual(self.analizar(PAGINA_BUENA), 'ok')
+        self.assertIsNotNone(self.validador._pool_procesos)
+        self.assertIsNot(self.validador._pool_procesos, roto)
+        self.assertEqual(self.validador.procesos_html, 1)
+
+    def test_pool_roto_demasiadas_veces_sigue_en_hilos(self):
+        with mock.patch.object(link_validator, 'MAX_REINICIOS_POOL_HTML', 2):
+            for _ in range(2):
+                self.romper_pool()
+                self.assertEqual(self.analizar(PAGINA_EN_VENTA_AL_FINAL), 'error')
+        self.assertEqual(self.validador.procesos_html, 0)
+        self.assertIsNone(self.validador._pool_procesos)
+        self.assertEqual(self.analizar(PAGINA_EN_VENTA_AL_FINAL), 'error')
+        self.assertIsNone(self.validador._pool_procesos)
+
+    def test_veredicto_del_primer_bloque_corta_la_descarga(self):
+        relleno = RELLENO * 20
+        medidas = {}
+        veredicto = self.validador.analizar_contenido_html(
+            RespuestaSimulada(PAGINA_EN_VENTA.replace(b"</body>", relleno + b"</body>")), medidas)
+        self.assertEqual(veredicto, 'error')
+        self.assertEqual(medidas['bytes_leidos'], TAMANO_BLOQUE_HTML)
+
+        # Si el primer bloque no decide, la página se analiza entera
+        medidas = {}
+        contenido = PAGINA_BUENA.replace(b"</body>", relleno + b"domain for sale</body>")
+        self.assertEqual(self.validador.analizar_contenido_html(RespuestaSimulada(contenido), medidas), 'error')
+        self.assertEqual(medidas['bytes_leidos'], len(contenido))
+
+    def test_fallo_con_procesos_no_es_valido(self):
+        respuesta = RespuestaSimulada(PAGINA_BUENA, ValueError("análisis roto"))
+        resultado = self.validador._clasificar_respuesta(respuesta, {})
+        self.assertEqual(resultado['estado'], 'validar')
+        self.assertEqual(resultado['detalles'], MENSAJE_ANALISIS_FALLIDO)
+
+    def test_fallo_en_hilos_como_siempre(self):
+        # Sin procesos, un fallo del análisis (no de la red) sigue dando la
+        # página por buena
+        self.validador.procesos_html = 0
+        respuesta = RespuestaSimulada(PAGINA_BUENA, ValueError("análisis roto"))
+        resultado = self.validador._clasificar_respuesta(respuesta, {})
+        self.assertEqual(resultado['estado'], 'valido')
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# ============================================================================
+# tests/test_analizador_html.py
+# Los extractores deben dar el mismo texto que el análisis original con
+# BeautifulSoup (html.parser), con el documento entero y partido en bloques
+# Uso: python -m pytest tests/test_analizador_html.py
+#      (necesita beautifulsoup4: pip install -r requirements-dev.txt)
+# ============================================================================
+
+import random
+import unittest
+
+from bs4 import BeautifulSoup
+
+from model.analizador_html import ExtractorTextoHTML, ExtractorTextoRapido
+
+EXTRACTORES = (ExtractorTextoHTML, ExtractorTextoRapido)
+
+# Casos en los que un árbol HTML5 (lxml) no coincide con el de html.parser
+CASOS_FIJOS = {
+    '</p><body>hola': ' hola',
+    '<title>hola<body>': 'hola ',
+    'hola<body>Sign In': ' sign in',
+    '<html><head><title>Page Not Found</title></head><body><h1>Hola</h1></body></html>': 'page not found hola',
+    '<body><p>uno</p> \n\t <p>dos</p><pre> \n </pre></body>': ' uno\ndos \n ',
+    '<body>a<br>b</br>c<script>d</script>e<rt>f</rt><![CDATA[g]]></body>': ' abceg',
+    '<body>&amp;&foo;&#65;&#x42;&#128;&#0;&a.b;</body>': ' &&fooab€\ufffd&a.b',
+    # Tras el segundo '&#' suelto html.parser devuelve el resto como texto
+    '<body>a &# b; <b>c</b> &# <i>d</i></body>': ' a &# b; c &# <i>d</i></body>',
+}
+
+# Piezas con las que se generan documentos aleatorios: etiquetas normales y
+# raras, entidades válidas y cortadas, comentarios, CDATA y texto con espacios
+PIEZAS = [
+    '<html>', '</html>', '<head>', '</head>', '<title>', '</title>', '<TITLE>', '<body>', '</body>',
+    '<body class="x">', '<p>', '</p>', '<div>', '</div>', '<b>', '</b>', '<span>', '</span>',
+    '<script>', '</script>', '</ script>', '<script/>', '<style>', '</style>', '<template>', '</template>',
+    '<textarea>', '</textarea>', '<pre>', '</pre>', '<rt>', '</rt>', '<rp>', '<noscript>', '</noscript>',
+    '<br>', '</br>', '<br/>', '<br />', '<img src=x>', '<img/>', '<input>', '</input>', '<meta charset="utf-8">',
+    '<a href="/x">', '<a href=/x/y>', '<a href=x/>', '<a b="c"d>', '<a\xa0b>', '<a  b = \'c\' >', '</a>',
+    '<A HREF="Q">', '</A>', '<x-y>', '</x-y>', '<table>', '<td>', '<li>', '<h1>', '</h1>', '<iframe>',
+    '<!-- c -->', '<!---->', '<!-- a -- >', '<!-->', '<!--', '-->', '<!DOCTYPE html>', '<![CDATA[ cd ]]>',
+    '<![if x]>', '<?php x ?>', '<!x>', '<', '>', '< p>', '<p', '</', '</p', '<a b="', '">', '<1>',
+    'hola', 'Sign In', '404', ' ', '  ', '\n', ' \n ', '\t', '\r\n', '\xa0',
+    '&amp;', '&amp', '&nbsp;', '&foo;', '&#65;', '&#x41;', '&#0;', '&#128;', '&#x9f;', '&#32;', '&#10;',
+    '&#xD800;', '&#1114112;', '&#65', '&#x;', '&', '&#', '&a.b;',
+]
+
+
+def texto_beautifulsoup(html):
+    # Réplica del análisis anterior con BeautifulSoup
+    soup = BeautifulSoup(html, 'html.parser')
+    title = soup.find('title')
+    body = soup.find('body')
+    return (title.get_text().lower() if title else "") + " " + (body.get_text().lower() if body else "")
+
+
+def texto_extractor(clase, html, tamano_bloque=None):
+    extractor = clase()
+    if tamano_bloque is None:
+        extractor.feed(html)
+    else:
+        for inicio in range(0, len(html), tamano_bloque):
+            extractor.feed(html[inicio:inicio + tamano_bloque])
+    extractor.close()
+    return extractor.texto_completo()
+
+
+def generar_documentos(cantidad, semilla=11):
+    aleatorio = random.Random(semilla)
+    for _ in range(cantidad):
+        yield ''.join(aleatorio.choice(PIEZAS) for _ in range(aleatorio.randint(1, 14)))
+
+
+class TestAnalizadorHTML(unittest.TestCase):
+    
+    def test_casos_fijos(self):
+        for html, esperado in CASOS_FIJOS.items():
+            self.assertEqual(texto_beautifulsoup(html), esperado, repr(html))
+            for clase in EXTRACTORES:
+                for tamano_bloque in (None, 1, 5):
+                    self.assertEqual(
+                        texto_extractor(clase, html, tamano_bloque), esperado,
+                        (clase.__name__, tamano_bloque, repr(html))
+                    )
+    
+    def test_documentos_aleatorios(self):
+        for html in generar_documentos(2000):
+            esperado = texto_beautifulsoup(html)
+            for clase in EXTRACTORES:
+                self.assertEqual(texto_extractor(clase, html), esperado, (clase.__name__, repr(html)))
+    
+    def test_documentos_aleatorios_por_bloques(self):
+        # Etiquetas, entidades y comentarios partidos entre bloques
+        for tamano_bloque in (1, 3, 7):
+            for html in generar_documentos(600, semilla=tamano_bloque):
+                esperado = texto_beautifulsoup(html)
+                for clase in EXTRACTORES:
+                    self.assertEqual(
+                        texto_extractor(clase, html, tamano_bloque), esperado,
+                        (clase.__name__, tamano_bloque, repr(html))
+                    )
+    
+    def test_pagina_grande(self):
+        partes = ['<html><head><title>Pagina</title><script>if (a < b) { x = "</div>"; }</script></head><body>']
+        for i in range(2000):
+            partes.append(f'<div class="c{i % 7}"><a href="/x/{i}">enlace {i}</a> texto &amp; m&aacute;s '
+                          f'<span>palabra{i}</span><!-- {i} --></div>\n')
+        partes.append('</body></html>')
+        html = ''.join(partes)
+        esperado = texto_beautifulsoup(html)
+        for clase in EXTRACTORES:
+            self.assertEqual(texto_extractor(clase, html, 16 * 1024), esperado, clase.__name__)
+
+
+if __name__ == "__main__":
+    unittest.main()
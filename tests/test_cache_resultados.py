@@ -0,0 +1,64 @@
+# ============================================================================
+# tests/test_cache_resultados.py
+# La caché borra al abrirse las filas que ya no sirven ni al modo incremental
+# Uso: python -m pytest tests/test_cache_resultados.py
+# ============================================================================
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from model.cache_resultados import CacheResultados
+
+DIA = 24 * 3600
+TTL = {'valido': 7 * DIA, 'no_valido': 3600}
+
+
+class TestCacheResultados(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, 'cache.db')
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def guardar_hace(self, segundos, url, estado):
+        cache = CacheResultados(self.ruta, TTL)
+        with mock.patch('model.cache_resultados.time.time', return_value=time.time() - segundos):
+            cache.guardar(url, {'estado': estado, 'detalles': ''})
+        cache.cerrar()
+
+    def test_purga_al_abrir(self):
+        self.guardar_hace(0, 'https://nuevo.com', 'valido')
+        self.guardar_hace(10 * DIA, 'https://caducado.com', 'valido')
+        self.guardar_hace(40 * DIA, 'https://viejo.com', 'valido')
+        self.guardar_hace(40 * DIA, 'https://error.com', 'no_valido')
+
+        with mock.patch('model.cache_resultados.ANTIGUEDAD_REVALIDACION', 30 * DIA):
+            cache = CacheResultados(self.ruta, TTL)
+        try:
+            fechas = cache.fechas_verificacion(['https://nuevo.com', 'https://caducado.com',
+                                                'https://viejo.com', 'https://error.com'])
+            # La caducada reciente se conserva por su fecha, pero no es un acierto
+            self.assertEqual(set(fechas), {'https://nuevo.com', 'https://caducado.com'})
+            self.assertIsNone(cache.obtener('https://caducado.com'))
+            self.assertEqual(cache.obtener('https://nuevo.com')['estado'], 'valido')
+        finally:
+            cache.cerrar()
+
+    def test_sin_revalidacion_purga_por_vigencia(self):
+        self.guardar_hace(10 * DIA, 'https://caducado.com', 'valido')
+        with mock.patch('model.cache_resultados.ANTIGUEDAD_REVALIDACION', None):
+            cache = CacheResultados(self.ruta, TTL)
+        try:
+            self.assertEqual(cache.fechas_verificacion(['https://caducado.com']), {})
+        finally:
+            cache.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,97 @@
+# ============================================================================
+# tests/test_clasificador_keywords.py
+# El clasificador compilado debe dar el mismo veredicto que el análisis original
+# Uso: python -m pytest tests/test_clasificador_keywords.py
+# ============================================================================
+
+import random
+import unittest
+
+from config.constants import (
+    KEYWORDS_ERROR_CRITICO,
+    KEYWORDS_AD_BLOCKER,
+    KEYWORDS_LOGIN,
+)
+from model.clasificador_keywords import CLASIFICADOR_CONTENIDO
+
+TODAS_LAS_KEYWORDS = KEYWORDS_ERROR_CRITICO + KEYWORDS_AD_BLOCKER + KEYWORDS_LOGIN
+
+
+def clasificar_original(texto):
+    # Análisis anterior a ClasificadorKeywords: texto en minúsculas + tres barridos
+    contenido = texto.lower()
+    if any(err in contenido for err in KEYWORDS_ERROR_CRITICO):
+        return 'error'
+    if any(keyword in contenido for keyword in KEYWORDS_AD_BLOCKER):
+        return 'validar'
+    if any(keyword in contenido for keyword in KEYWORDS_LOGIN):
+        return 'validar'
+    return 'ok'
+
+
+def clasificar_por_bloques(texto, tamano_bloque):
+    escaner = CLASIFICADOR_CONTENIDO.crear_escaner()
+    for inicio in range(0, len(texto), tamano_bloque):
+        if escaner.agregar(texto[inicio:inicio + tamano_bloque]):
+            break
+    return escaner.veredicto()
+
+
+def variar_mayusculas(aleatorio, texto):
+    return ''.join(c.upper() if aleatorio.random() < 0.5 else c for c in texto)
+
+
+def generar_textos(cantidad, semilla=7):
+    # Relleno con trozos de palabras clave (prefijos, sufijos y frases enteras)
+    # para cubrir coincidencias parciales, solapadas y partidas entre bloques
+    aleatorio = random.Random(semilla)
+    relleno = ['lorem', 'ipsum', 'page', 'not', 'found', 'sign', 'log', 'in', ' ', '\n', ',']
+    for _ in range(cantidad):
+        partes = []
+        for _ in range(aleatorio.randint(1, 30)):
+            eleccion = aleatorio.random()
+            if eleccion < 0.15:
+                keyword = aleatorio.choice(TODAS_LAS_KEYWORDS)
+                partes.append(variar_mayusculas(aleatorio, keyword))
+            elif eleccion < 0.35:
+                keyword = aleatorio.choice(TODAS_LAS_KEYWORDS)
+                corte = aleatorio.randint(1, max(1, len(keyword) - 1))
+                partes.append(keyword[:corte] if aleatorio.random() < 0.5 else keyword[corte:])
+            else:
+                partes.append(aleatorio.choice(relleno))
+            partes.append(aleatorio.choice(['', ' ']))
+        yield ''.join(partes)
+
+
+class TestClasificadorKeywords(unittest.TestCase):
+    
+    def test_cada_keyword_sola(self):
+        for keyword in TODAS_LAS_KEYWORDS:
+            for texto in (keyword, keyword.upper(), f"texto antes {keyword} y después"):
+                self.assertEqual(CLASIFICADOR_CONTENIDO.clasificar(texto), clasificar_original(texto), texto)
+    
+    def test_texto_sin_keywords(self):
+        self.assertEqual(CLASIFICADOR_CONTENIDO.clasificar("bienvenido a la página"), 'ok')
+        self.assertEqual(CLASIFICADOR_CONTENIDO.clasificar(""), 'ok')
+    
+    def test_prioridad_error_sobre_login(self):
+        texto = "please sign in ... 404 not found"
+        self.assertEqual(clasificar_original(texto), 'error')
+        self.assertEqual(CLASIFICADOR_CONTENIDO.clasificar(texto), 'error')
+    
+    def test_textos_aleatorios_igual_que_el_original(self):
+        for texto in generar_textos(3000):
+            self.assertEqual(CLASIFICADOR_CONTENIDO.clasificar(texto), clasificar_original(texto), repr(texto))
+    
+    def test_textos_aleatorios_por_bloques(self):
+        # Las frases partidas entre bloques deben encontrarse igual
+        for tamano_bloque in (1, 3, 7, 64):
+            for texto in generar_textos(500, semilla=tamano_bloque):
+                self.assertEqual(
+                    clasificar_por_bloques(texto, tamano_bloque), clasificar_original(texto),
+                    (tamano_bloque, repr(texto))
+                )
+
+
+if __name__ == "__main__":
+    unittest.main()
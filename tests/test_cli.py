@@ -0,0 +1,139 @@
+# ============================================================================
+# tests/test_cli.py
+# Códigos de salida de cli.main: 0 sin enlaces no válidos, 1 con alguno,
+# 2 argumentos incorrectos, 3 error de archivo y 4 error interno
+# Uso: python -m pytest tests/test_cli.py
+# ============================================================================
+
+import os
+import shutil
+import signal
+import sqlite3
+import tempfile
+import unittest
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+
+import cli
+from config.constants import (
+    SALIDA_OK,
+    SALIDA_HAY_NO_VALIDOS,
+    SALIDA_ERROR_USO,
+    SALIDA_ERROR_ARCHIVO,
+    SALIDA_ERROR_INTERNO,
+)
+from model.link_validator import LinkValidator
+from model.resolutor_dns import ResolutorDNS
+
+
+def validar_sin_red(self, url, delay=None):
+    # Las URLs con 'caido' no responden; el resto, bien
+    estado = 'no_valido' if 'caido' in str(url) else 'valido'
+    return {'url_original': url, 'estado': estado, 'detalles': '', 'codigo_http': None}
+
+
+def crear_libro(ruta, urls):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Datos'
+    ws.append(['URL'])
+    for url in urls:
+        ws.append([url])
+    wb.save(ruta)
+
+
+class TestCli(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        # main instala sus manejadores de Ctrl+C y SIGTERM
+        self.senales = {senal: signal.getsignal(senal) for senal in (signal.SIGINT, signal.SIGTERM)}
+        for parche in (mock.patch.object(LinkValidator, 'validar_url', validar_sin_red),
+                       mock.patch.object(ResolutorDNS, 'resolver_hosts',
+                                         lambda resolutor, hosts: {host: True for host in hosts})):
+            parche.start()
+            self.addCleanup(parche.stop)
+
+    def tearDown(self):
+        for senal, manejador in self.senales.items():
+            signal.signal(senal, manejador)
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def ruta(self, nombre):
+        return os.path.join(self.carpeta, nombre)
+
+    def main(self, *argumentos):
+        return cli.main([*argumentos, '--sin-cache', '--delay', '0'])
+
+    def test_sin_no_validos(self):
+        crear_libro(self.ruta('libro.xlsx'), ['https://a.example.com', 'https://b.example.com'])
+        codigo = self.main(self.ruta('libro.xlsx'), '-c', 'A', '-r', 'B', '--sin-detalles')
+        self.assertEqual(codigo, SALIDA_OK)
+        ws = load_workbook(self.ruta('libro.xlsx'))['Datos']
+        self.assertEqual([ws.cell(fila, 2).value for fila in (2, 3)], ['VÁLIDO', 'VÁLIDO'])
+
+    def test_hay_no_validos(self):
+        crear_libro(self.ruta('libro.xlsx'), ['https://a.example.com', 'https://caido.example.com'])
+        codigo = self.main(self.ruta('libro.xlsx'), '-c', 'A', '-r', 'B', '--sin-detalles')
+        self.assertEqual(codigo, SALIDA_HAY_NO_VALIDOS)
+
+    def test_hay_no_validos_csv(self):
+        with open(self.ruta('datos.csv'), 'w', encoding='utf-8') as archivo:
+            archivo.write('url\nhttps://caido.example.com\n')
+        codigo = self.main(self.ruta('datos.csv'), '-c', 'url', '-o', self.ruta('salida.jsonl'))
+        self.assertEqual(codigo, SALIDA_HAY_NO_VALIDOS)
+
+    def test_argumentos_incorrectos(self):
+        crear_libro(self.ruta('libro.xlsx'), ['https://a.example.com'])
+        casos = [
+            [self.ruta('libro.xlsx'), '-c', 'A'],                     # Falta --resultado
+            [self.ruta('libro.xlsx'), '-c', 'A1', '-r', 'B'],         # Columna no válida
+            [self.ruta('libro.xlsx'), '-c', 'A', '-r', 'B', '--desde', '5', '--hasta', '2'],
+            [self.ruta('datos.csv'), '-c', 'url'],                   # Falta --salida
+        ]
+        for argumentos in casos:
+            with self.subTest(argumentos=argumentos[1:]), mock.patch('sys.stderr'):
+                with self.assertRaises(SystemExit) as salida:
+                    self.main(*argumentos)
+                self.assertEqual(salida.exception.code, SALIDA_ERROR_USO)
+
+    def test_hoja_o_columna_inexistente(self):
+        crear_libro(self.ruta('libro.xlsx'), ['https://a.example.com'])
+        codigo = self.main(self.ruta('libro.xlsx'), '-c', 'A', '-r', 'B', '-H', 'Otra')
+        self.assertEqual(codigo, SALIDA_ERROR_USO)
+
+        with open(self.ruta('datos.csv'), 'w', encoding='utf-8') as archivo:
+            archivo.write('url\nhttps://a.example.com\n')
+        codigo = self.main(self.ruta('datos.csv'), '-c', 'enlace', '-o', self.ruta('salida.csv'))
+        self.assertEqual(codigo, SALIDA_ERROR_USO)
+
+    def test_error_de_archivo(self):
+        with open(self.ruta('roto.xlsx'), 'w') as archivo:
+            archivo.write('no es un libro')
+        self.assertEqual(self.main(self.ruta('roto.xlsx'), '-c', 'A', '-r', 'B'), SALIDA_ERROR_ARCHIVO)
+        # Carpeta sin libros
+        os.mkdir(self.ruta('vacia'))
+        self.assertEqual(self.main(self.ruta('vacia'), '-c', 'A', '-r', 'B'), SALIDA_ERROR_ARCHIVO)
+        # Carpeta con un libro roto: el lote termina, pero con error
+        crear_libro(self.ruta('vacia/bien.xlsx'), ['https://a.example.com'])
+        shutil.copy(self.ruta('roto.xlsx'), self.ruta('vacia/roto.xlsx'))
+        codigo = self.main(self.ruta('vacia'), '-c', 'A', '-r', 'B', '--sin-detalles')
+        self.assertEqual(codigo, SALIDA_ERROR_ARCHIVO)
+
+    def test_cache_danada(self):
+        crear_libro(self.ruta('libro.xlsx'), ['https://a.example.com'])
+        with mock.patch.object(cli, 'CacheResultados', side_effect=sqlite3.DatabaseError("file is not a database")):
+            codigo = cli.main([self.ruta('libro.xlsx'), '-c', 'A', '-r', 'B', '--delay', '0'])
+        self.assertEqual(codigo, SALIDA_ERROR_ARCHIVO)
+
+    def test_error_interno(self):
+        # Un fallo del programa no sale con 1 ("hay enlaces no válidos")
+        crear_libro(self.ruta('libro.xlsx'), ['https://a.example.com'])
+        for error in (RuntimeError("fallo"), KeyError('clave')):
+            with self.subTest(error=error), mock.patch.object(cli, 'validar_libro', side_effect=error):
+                self.assertEqual(self.main(self.ruta('libro.xlsx'), '-c', 'A', '-r', 'B'), SALIDA_ERROR_INTERNO)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,99 @@
+# ============================================================================
+# tests/test_diario_ejecucion.py
+# Al reanudar con el diario, las filas ya registradas no se vuelven a validar
+# y su resultado llega igual al libro
+# Uso: python -m pytest tests/test_diario_ejecucion.py
+# ============================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+
+from model.diario_ejecucion import DiarioEjecucion
+from model.link_validator import LinkValidator
+from model.trabajo_validacion import ObjetivoValidacion, TrabajoValidacion
+
+
+def crear_libro(ruta):
+    wb = Workbook()
+    ws = wb.active
+    ws.title = 'Datos'
+    for fila in range(1, 6):
+        ws.append([f'https://sitio{fila}.example.com'])
+    wb.save(ruta)
+
+
+def resultado_valido(url, delay=None):
+    return {'url_original': url, 'estado': 'valido', 'detalles': 'OK - HTTP 200', 'codigo_http': 200}
+
+
+class TestDiarioEjecucion(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, 'libro.xlsx')
+        crear_libro(self.ruta)
+        self.objetivo = ObjetivoValidacion('Datos', 'A', 1, 5, 'B')
+        self.cabecera = {'archivo': 'libro.xlsx', 'objetivos': [self.objetivo.como_dict()]}
+        self.validador = LinkValidator(cache=None)
+        # Sin DNS: todos los dominios existen
+        self.validador.resolutor.resolver_hosts = lambda hosts: {host: True for host in hosts}
+
+    def tearDown(self):
+        self.validador.cerrar()
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def interrumpir_tras_dos_filas(self):
+        # Primera ejecución cortada: dos filas terminadas y una línea a medias
+        diario = DiarioEjecucion(self.ruta)
+        diario.abrir(self.cabecera)
+        diario.registrar({'fila_excel': 1, 'estado': 'no_valido', 'detalles': 'HTTP 404', 'codigo_http': 404})
+        diario.registrar({'fila_excel': 2, 'estado': 'validar', 'detalles': 'Requiere login'})
+        diario.cerrar()
+        with open(diario.ruta, 'a', encoding='utf-8') as archivo:
+            archivo.write('{"f":3,"e":"va')
+
+    def test_reanudar_omite_filas_del_diario(self):
+        self.interrumpir_tras_dos_filas()
+
+        diario = DiarioEjecucion(self.ruta)
+        self.assertEqual(diario.leer_cabecera(), self.cabecera)
+        trabajo = TrabajoValidacion(self.ruta, [self.objetivo], self.validador)
+        for resultado in diario.iterar_resultados():
+            trabajo.registrar(resultado)
+
+        diario.abrir(self.cabecera, continuar=True)
+        with mock.patch.object(self.validador, 'validar_url', side_effect=resultado_valido) as validar_url:
+            procesadas = trabajo.validar(trabajo.iterar_entradas(), delay=0, callback=(
+                lambda url, idx, total, resultado, fila: diario.registrar(resultado)
+            ))
+        diario.cerrar()
+
+        self.assertEqual(procesadas, 3)
+        self.assertEqual(sorted(llamada.args[0] for llamada in validar_url.call_args_list),
+                         [f'https://sitio{fila}.example.com' for fila in (3, 4, 5)])
+
+        # La línea a medias se cerró: el diario tiene las cinco filas
+        filas = sorted(resultado['fila_excel'] for resultado in DiarioEjecucion(self.ruta).iterar_resultados())
+        self.assertEqual(filas, [1, 2, 3, 4, 5])
+
+        contadores = trabajo.guardar()
+        self.assertEqual(contadores, {'validos': 3, 'no_validos': 1, 'validar': 1})
+        ws = load_workbook(self.ruta)['Datos']
+        self.assertEqual([ws.cell(fila, 2).value for fila in range(1, 6)],
+                         ['NO VÁLIDO', 'VALIDAR', 'VÁLIDO', 'VÁLIDO', 'VÁLIDO'])
+
+    def test_diario_nuevo_descarta_el_anterior(self):
+        self.interrumpir_tras_dos_filas()
+        diario = DiarioEjecucion(self.ruta)
+        diario.abrir(self.cabecera)
+        diario.cerrar()
+        self.assertEqual(list(DiarioEjecucion(self.ruta).iterar_resultados()), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
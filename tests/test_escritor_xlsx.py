@@ -0,0 +1,151 @@
+# ============================================================================
+# tests/test_escritor_xlsx.py
+# El parche del .xlsx debe dejar un libro que openpyxl lee con los cambios
+# Uso: python -m pytest tests/test_escritor_xlsx.py
+# ============================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+
+from model.escritor_xlsx import EscritorXlsx
+from model.lote_libros import expandir_rutas
+
+CALC_CHAIN = ('<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+              '<calcChain xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main">'
+              '<c r="B2" i="1"/><c r="B3"/></calcChain>')
+
+
+def agregar_calc_chain(ruta):
+    # openpyxl no escribe calcChain.xml; Excel sí, con su relación y su tipo
+    with zipfile.ZipFile(ruta) as paquete:
+        partes = [(info.filename, paquete.read(info)) for info in paquete.infolist()]
+    with zipfile.ZipFile(ruta, 'w', zipfile.ZIP_DEFLATED) as paquete:
+        for nombre, datos in partes:
+            if nombre == '[Content_Types].xml':
+                datos = datos.replace(b'</Types>', b'<Override PartName="/xl/calcChain.xml" ContentType="application/'
+                                      b'vnd.openxmlformats-officedocument.spreadsheetml.calcChain+xml"/></Types>')
+            elif nombre == 'xl/_rels/workbook.xml.rels':
+                datos = datos.replace(b'</Relationships>', b'<Relationship Id="rIdCalc" Target="calcChain.xml" Type="'
+                                      b'http://schemas.openxmlformats.org/officeDocument/2006/relationships/calcChain"/>'
+                                      b'</Relationships>')
+            paquete.writestr(nombre, datos)
+        paquete.writestr('xl/calcChain.xml', CALC_CHAIN)
+
+
+class TestEscritorXlsx(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.ruta = os.path.join(self.carpeta, 'libro.xlsx')
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def test_parche(self):
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Datos'
+        ws.append(['URL', 'Resultado'])
+        ws.append(['https://a.example.com', 'viejo'])
+        wb.create_sheet('Otra')['A1'] = 'sin cambios'
+        wb.save(self.ruta)
+
+        metodo = EscritorXlsx(self.ruta).escribir({'Datos': {(2, 2): 'Válido', (4, 3): 'nuevo  ', (1, 1): None}})
+        self.assertEqual(metodo, 'parche')
+        wb = load_workbook(self.ruta)
+        self.assertEqual([list(fila) for fila in wb['Datos'].values],
+                         [[None, 'Resultado', None], ['https://a.example.com', 'Válido', None],
+                          [None, None, None], [None, None, 'nuevo  ']])
+        self.assertEqual(wb['Otra']['A1'].value, 'sin cambios')
+
+    def test_quita_calc_chain(self):
+        # Sobrescribir una celda con fórmula deja calcChain.xml apuntando a
+        # una fórmula que ya no existe: Excel avisaría de que el libro está
+        # dañado. Se quita la parte, su relación y su tipo de contenido.
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Datos'
+        ws.append(['URL', 'Resultado'])
+        ws.append(['https://a.example.com', '=1+1'])
+        ws.append(['https://b.example.com', '=2+2'])
+        wb.save(self.ruta)
+        agregar_calc_chain(self.ruta)
+
+        self.assertEqual(EscritorXlsx(self.ruta).escribir({'Datos': {(2, 2): 'Válido'}}), 'parche')
+        with zipfile.ZipFile(self.ruta) as paquete:
+            self.assertIsNone(paquete.testzip())
+            self.assertNotIn('xl/calcChain.xml', paquete.namelist())
+            self.assertNotIn(b'calcChain', paquete.read('[Content_Types].xml'))
+            self.assertNotIn(b'calcChain', paquete.read('xl/_rels/workbook.xml.rels'))
+            self.assertIn(b'worksheets/sheet1.xml', paquete.read('xl/_rels/workbook.xml.rels'))
+        ws = load_workbook(self.ruta)['Datos']
+        self.assertEqual((ws['B2'].value, ws['B3'].value), ('Válido', '=2+2'))
+
+    def test_openpyxl_conserva_macros(self):
+        # Con la escritura de openpyxl, un .xlsm debe seguir teniendo sus macros
+        ruta = os.path.join(self.carpeta, 'libro.xlsm')
+        wb = Workbook()
+        wb.active.title = 'Datos'
+        wb.save(ruta)
+        with zipfile.ZipFile(ruta, 'a') as paquete:
+            paquete.writestr('xl/vbaProject.bin', b'macros')
+
+        EscritorXlsx(ruta).escribir_openpyxl({'Datos': {(1, 2): 'Válido'}})
+        with zipfile.ZipFile(ruta) as paquete:
+            self.assertEqual(paquete.read('xl/vbaProject.bin'), b'macros')
+        self.assertEqual(load_workbook(ruta)['Datos']['B1'].value, 'Válido')
+
+    def test_hoja_parcheada_con_zip64(self):
+        # El tamaño de la hoja parcheada no se conoce al empezar a escribirla
+        wb = Workbook()
+        wb.active.title = 'Datos'
+        wb.save(self.ruta)
+        EscritorXlsx(self.ruta).escribir({'Datos': {(1, 2): 'Válido'}})
+        with open(self.ruta, 'rb') as archivo, zipfile.ZipFile(self.ruta) as paquete:
+            info = paquete.getinfo('xl/worksheets/sheet1.xml')
+            # Longitudes del nombre y del campo extra en la cabecera local
+            archivo.seek(info.header_offset + 26)
+            largo_nombre = int.from_bytes(archivo.read(2), 'little')
+            largo_extra = int.from_bytes(archivo.read(2), 'little')
+            archivo.seek(largo_nombre, os.SEEK_CUR)
+            extra = archivo.read(largo_extra)
+        self.assertEqual(extra[:2], b'\x01\x00')  # Cabecera zip64
+        self.assertEqual(load_workbook(self.ruta)['Datos']['B1'].value, 'Válido')
+
+    def test_libro_abierto_no_deja_temporal(self):
+        # En Windows, con el libro abierto en Excel, falla el reemplazo final
+        wb = Workbook()
+        wb.active.title = 'Datos'
+        wb.save(self.ruta)
+        with mock.patch('model.escritor_xlsx.os.replace', side_effect=PermissionError("en uso")):
+            with self.assertRaises(PermissionError):
+                EscritorXlsx(self.ruta).escribir({'Datos': {(1, 2): 'Válido'}})
+        self.assertEqual(os.listdir(self.carpeta), ['libro.xlsx'])
+        self.assertIsNone(load_workbook(self.ruta)['Datos']['B1'].value)
+
+    def test_temporal_fuera_del_lote(self):
+        # Si el proceso muere antes de borrarlo, el lote no lo toma por un libro
+        wb = Workbook()
+        wb.active.title = 'Datos'
+        wb.save(self.ruta)
+        temporales = []
+        reemplazar = os.replace
+
+        def reemplazar_anotando(origen, destino):
+            temporales.append(os.path.basename(origen))
+            self.assertEqual(expandir_rutas(self.carpeta), [self.ruta])
+            reemplazar(origen, destino)
+
+        with mock.patch('model.escritor_xlsx.os.replace', side_effect=reemplazar_anotando):
+            EscritorXlsx(self.ruta).escribir({'Datos': {(1, 2): 'Válido'}})
+        self.assertTrue(temporales[0].startswith('~$'))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+# ============================================================================
+# tests/test_hosts_recordados.py
+# El planificador, el circuit breaker y la caché DNS no crecen sin límite
+# con los dominios que van viendo, y siguen funcionando igual
+# Uso: python -m pytest tests/test_hosts_recordados.py
+# ============================================================================
+
+import unittest
+from unittest import mock
+
+from model import interruptor_hosts, planificador_hosts, resolutor_dns
+from model.interruptor_hosts import InterruptorHosts, ABIERTO, CERRADO
+from model.planificador_hosts import PlanificadorHosts
+from model.resolutor_dns import ResolutorDNS
+
+
+class TestHostsRecordados(unittest.TestCase):
+
+    def test_planificador_olvida_turnos_pasados(self):
+        planificador = PlanificadorHosts(intervalo_default=0)
+        for i in range(1000):
+            planificador.esperar_turno(f'host{i}.example.com')
+        self.assertLessEqual(len(planificador._proximo_turno), 1)
+
+    def test_planificador_acotado(self):
+        planificador = PlanificadorHosts(intervalo_default=60)
+        with mock.patch.object(planificador_hosts, 'MAX_HOSTS_RECORDADOS', 10):
+            for i in range(100):
+                planificador.esperar_turno(f'host{i}.example.com')
+            self.assertEqual(len(planificador._proximo_turno), 10)
+            self.assertIn('host99.example.com', planificador._proximo_turno)
+
+    def test_interruptor_solo_recuerda_hosts_con_fallos(self):
+        interruptor = InterruptorHosts(umbral_fallos=2, tiempo_apertura=60)
+        for i in range(100):
+            host = f'host{i}.example.com'
+            self.assertTrue(interruptor.permitir(host))
+            interruptor.registrar_exito(host)
+        self.assertEqual(len(interruptor._hosts), 0)
+
+        interruptor.registrar_fallo('caido.example.com')
+        interruptor.registrar_fallo('caido.example.com')
+        self.assertEqual(interruptor.estado('caido.example.com'), ABIERTO)
+        self.assertFalse(interruptor.permitir('caido.example.com'))
+        interruptor._hosts['caido.example.com']['reintentar_en'] = 0
+        self.assertTrue(interruptor.permitir('caido.example.com'))
+        interruptor.registrar_exito('caido.example.com')
+        self.assertEqual(interruptor.estado('caido.example.com'), CERRADO)
+        self.assertEqual(len(interruptor._hosts), 0)
+
+    def test_interruptor_acotado(self):
+        interruptor = InterruptorHosts(umbral_fallos=1, tiempo_apertura=60)
+        with mock.patch.object(interruptor_hosts, 'MAX_HOSTS_RECORDADOS', 10):
+            for i in range(100):
+                interruptor.registrar_fallo(f'host{i}.example.com')
+            self.assertEqual(len(interruptor._hosts), 10)
+            self.assertEqual(interruptor.estado('host99.example.com'), ABIERTO)
+            self.assertEqual(interruptor.estado('host0.example.com'), CERRADO)
+
+    def test_dns_olvida_caducados_y_acotado(self):
+        resolutor = ResolutorDNS(ttl=0)
+        resolutor.activo = True
+        with mock.patch.object(resolutor_dns.socket, 'getaddrinfo', return_value=[]):
+            for i in range(100):
+                self.assertTrue(resolutor.resolver(f'host{i}.example.com'))
+            self.assertLessEqual(len(resolutor._cache), 1)
+
+            resolutor.ttl = 300
+            with mock.patch.object(resolutor_dns, 'MAX_HOSTS_RECORDADOS', 10):
+                for i in range(100):
+                    resolutor.resolver(f'host{i}.example.com')
+            self.assertEqual(len(resolutor._cache), 10)
+            self.assertIn('host99.example.com', resolutor._cache)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,94 @@
+# ============================================================================
+# tests/test_interruptor_hosts.py
+# Circuit breaker por dominio: se abre tras los fallos seguidos, deja pasar
+# una sola sonda y la sonda nunca queda en curso para siempre
+# Uso: python -m pytest tests/test_interruptor_hosts.py
+# ============================================================================
+
+import unittest
+from unittest import mock
+
+from config.constants import MENSAJE_HOST_NO_DISPONIBLE
+from model.interruptor_hosts import InterruptorHosts, ABIERTO, CERRADO, SEMIABIERTO
+from model.link_validator import LinkValidator
+from model.planificador_hosts import PlanificadorHosts
+
+HOST = 'caido.example.com'
+
+
+class TestInterruptorHosts(unittest.TestCase):
+
+    def setUp(self):
+        self.interruptor = InterruptorHosts(umbral_fallos=3, tiempo_apertura=60)
+
+    def abrir(self):
+        for _ in range(3):
+            self.interruptor.registrar_fallo(HOST)
+
+    def pasar_espera(self):
+        self.interruptor._hosts[HOST]['reintentar_en'] = 0
+
+    def test_se_abre_tras_el_umbral(self):
+        self.interruptor.registrar_fallo(HOST)
+        self.interruptor.registrar_fallo(HOST)
+        self.assertEqual(self.interruptor.estado(HOST), CERRADO)
+        self.assertTrue(self.interruptor.permitir(HOST))
+        self.interruptor.registrar_fallo(HOST)
+        self.assertEqual(self.interruptor.estado(HOST), ABIERTO)
+        self.assertFalse(self.interruptor.permitir(HOST))
+
+    def test_un_exito_reinicia_la_cuenta(self):
+        self.interruptor.registrar_fallo(HOST)
+        self.interruptor.registrar_fallo(HOST)
+        self.interruptor.registrar_exito(HOST)
+        self.interruptor.registrar_fallo(HOST)
+        self.assertEqual(self.interruptor.estado(HOST), CERRADO)
+
+    def test_semiabierto_una_sonda_a_la_vez(self):
+        self.abrir()
+        self.pasar_espera()
+        self.assertTrue(self.interruptor.permitir(HOST))
+        self.assertEqual(self.interruptor.estado(HOST), SEMIABIERTO)
+        self.assertFalse(self.interruptor.permitir(HOST))
+
+    def test_sonda_fallida_vuelve_a_abrir(self):
+        self.abrir()
+        self.pasar_espera()
+        self.assertTrue(self.interruptor.permitir(HOST))
+        self.interruptor.registrar_fallo(HOST)
+        self.assertEqual(self.interruptor.estado(HOST), ABIERTO)
+        self.assertFalse(self.interruptor.permitir(HOST))
+
+    def test_sonda_con_exito_cierra(self):
+        self.abrir()
+        self.pasar_espera()
+        self.assertTrue(self.interruptor.permitir(HOST))
+        self.interruptor.registrar_exito(HOST)
+        self.assertEqual(self.interruptor.estado(HOST), CERRADO)
+        self.assertTrue(self.interruptor.permitir(HOST))
+
+    def test_sonda_con_excepcion_inesperada_no_queda_en_curso(self):
+        validador = LinkValidator(cache=None, interruptor=self.interruptor,
+                                  planificador=PlanificadorHosts(intervalo_default=0))
+        self.abrir()
+        self.pasar_espera()
+        sesion = mock.Mock()
+        sesion.get.side_effect = RuntimeError('fallo interno')
+        with mock.patch.object(validador, '_obtener_sesion', return_value=sesion):
+            with self.assertRaises(RuntimeError):
+                validador.hacer_request(f'https://{HOST}/a')
+        self.assertEqual(self.interruptor.estado(HOST), SEMIABIERTO)
+
+        # La siguiente URL del host vuelve a sondear en lugar de darlo por caído
+        sesion.get.side_effect = None
+        sesion.get.return_value = mock.Mock()
+        with mock.patch.object(validador, '_obtener_sesion', return_value=sesion):
+            response, error, _ = validador.hacer_request(f'https://{HOST}/b')
+        self.assertNotEqual(error, MENSAJE_HOST_NO_DISPONIBLE)
+        self.assertIsNone(error)
+        self.assertEqual(self.interruptor.estado(HOST), CERRADO)
+        validador.cerrar()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,50 @@
+# ============================================================================
+# tests/test_iterar_lote.py
+# Una excepción inesperada al validar una URL no detiene el lote: sus filas
+# quedan para revisar y el resto se valida con normalidad
+# Uso: python -m pytest tests/test_iterar_lote.py
+# ============================================================================
+
+import unittest
+from collections import Counter
+
+from config.constants import MENSAJE_ERROR_INESPERADO
+from model.link_validator import LinkValidator
+
+
+class TestIterarLote(unittest.TestCase):
+
+    def setUp(self):
+        self.validador = LinkValidator(cache=None, max_hilos=2)
+        self.validador.resolutor.resolver_hosts = lambda hosts: {host: True for host in hosts}
+        self.llamadas = Counter()
+        self.validador.validar_url = self.validar_con_fallo
+
+    def tearDown(self):
+        self.validador.cerrar()
+
+    def validar_con_fallo(self, url, delay=None):
+        self.llamadas[url] += 1
+        if 'rota' in url:
+            raise RuntimeError("fallo del programa")
+        return {'url_original': url, 'estado': 'valido', 'detalles': 'OK - HTTP 200', 'codigo_http': 200}
+
+    def test_fallo_de_una_url_no_corta_el_lote(self):
+        filas = [(fila, f'https://sitio{fila}.example.com') for fila in range(2, 30)]
+        filas[5] = (7, 'https://rota.example.com')
+        filas.append((30, 'https://rota.example.com'))
+        resultados = list(self.validador.iterar_lote(filas, delay=0, ventana=4))
+
+        self.assertEqual([resultado['fila_excel'] for resultado in resultados], [fila for fila, _ in filas])
+        rotas = [resultado for resultado in resultados if resultado['estado'] != 'valido']
+        self.assertEqual([resultado['fila_excel'] for resultado in rotas], [7, 30])
+        for resultado in rotas:
+            self.assertEqual(resultado['estado'], 'validar')
+            self.assertIn(MENSAJE_ERROR_INESPERADO, resultado['detalles'])
+            self.assertIn('fallo del programa', resultado['detalles'])
+        # El fallo no se recuerda: la repetición, leída mucho después, se vuelve a probar
+        self.assertEqual(self.llamadas['https://rota.example.com'], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,257 @@
+# ============================================================================
+# tests/test_lector_excel.py
+# LectorExcel debe dar los mismos nombres, dimensiones y valores que openpyxl
+# Uso: python -m pytest tests/test_lector_excel.py
+# ============================================================================
+
+import datetime
+import os
+import random
+import re
+import shutil
+import tempfile
+import unittest
+import warnings
+import zipfile
+from unittest import mock
+
+from openpyxl import Workbook, load_workbook
+from openpyxl.cell.rich_text import CellRichText, TextBlock
+from openpyxl.cell.text import InlineFont
+from openpyxl.chart import BarChart, Reference
+from openpyxl.utils.datetime import CALENDAR_MAC_1904
+
+import model.lector_excel as lector_excel
+from errors import errores_archivo_excel
+from model.lector_excel import LectorExcel
+
+NS_HOJA = 'http://schemas.openxmlformats.org/spreadsheetml/2006/main'
+
+# <si> que Excel y otros generadores escriben en sharedStrings.xml
+CADENAS_XML = [
+    '<si><t>simple</t></si>',
+    '<si><t xml:space="preserve"> con espacios </t></si>',
+    '<si><t>a &amp; b &lt;c&gt; &#233;</t></si>',
+    '<si><r><rPr><b/></rPr><t>ne</t></r><r><t>gra</t></r></si>',
+    '<si><t>base</t><rPh sb="0" eb="1"><t>fonética</t></rPh></si>',
+    '<si/>',
+    '<si><t/></si>',
+    '<si><t>x005F_x</t></si>',
+    '<si><t>a\r\nb</t></si>',
+    '<si>\n  <t>sangría</t>\n</si>',
+    '<si><r><t>r1</t></r><t>plano</t></si>',
+    '<si><t>ñandú €</t></si>',
+]
+
+
+def a_cadenas_compartidas(ruta, tabla=None):
+    # openpyxl escribe las cadenas en línea (inlineStr): se pasan a
+    # sharedStrings.xml, como las guarda Excel. Con 'tabla', sharedStrings.xml
+    # es ese XML y cada cadena en línea pasa a ser su índice en orden.
+    with zipfile.ZipFile(ruta) as paquete:
+        partes = [(info.filename, paquete.read(info).decode('utf-8')) for info in paquete.infolist()]
+    cadenas = {}
+
+    def compartir(coincidencia):
+        indice = cadenas.setdefault('<si>' + coincidencia.group(1) + '</si>', len(cadenas))
+        return f' t="s"><v>{indice}</v>'
+
+    with zipfile.ZipFile(ruta, 'w', zipfile.ZIP_DEFLATED) as paquete:
+        for nombre, datos in partes:
+            if nombre.startswith('xl/worksheets/'):
+                datos = re.sub(r' t="inlineStr"><is>(.*?)</is>', compartir, datos, flags=re.S)
+            elif nombre == '[Content_Types].xml':
+                datos = datos.replace('</Types>', '<Override PartName="/xl/sharedStrings.xml" ContentType="application/'
+                                      'vnd.openxmlformats-officedocument.spreadsheetml.sharedStrings+xml"/></Types>')
+            elif nombre == 'xl/_rels/workbook.xml.rels':
+                datos = datos.replace('</Relationships>', '<Relationship Id="rIdCadenas" Target="sharedStrings.xml" Type="'
+                                      'http://schemas.openxmlformats.org/officeDocument/2006/relationships/sharedStrings"/>'
+                                      '</Relationships>')
+            paquete.writestr(nombre, datos)
+        if tabla is None:
+            tabla = f'<?xml version="1.0" encoding="UTF-8"?>\n<sst xmlns="{NS_HOJA}">{"".join(cadenas)}</sst>'
+        paquete.writestr('xl/sharedStrings.xml', tabla)
+
+
+def valores_openpyxl(ruta, hoja, columnas_idx, fila_ini, fila_fin):
+    wb = load_workbook(ruta, read_only=True, data_only=True)
+    try:
+        desde = min(columnas_idx)
+        filas = wb[hoja].iter_rows(min_row=fila_ini, max_row=fila_fin, min_col=desde + 1,
+                                   max_col=max(columnas_idx) + 1, values_only=True)
+        return [(fila, tuple(valores[idx - desde] for idx in columnas_idx))
+                for fila, valores in enumerate(filas, start=fila_ini)]
+    finally:
+        wb.close()
+
+
+def valor_aleatorio(aleatorio):
+    return aleatorio.choice([
+        None,
+        aleatorio.randint(-10 ** 6, 10 ** 6),
+        aleatorio.random() * 1e6,
+        aleatorio.choice(['hola', 'a & b', '<x>', ' espacios ', 'x005F_y', 'éñ', '', 'línea\nnueva']),
+        f'https://sitio{aleatorio.randrange(50)}.example.com/?a=1&b=2',
+        datetime.datetime(2000 + aleatorio.randrange(30), 1 + aleatorio.randrange(12), 1 + aleatorio.randrange(28),
+                          aleatorio.randrange(24), aleatorio.randrange(60)),
+        datetime.date(1990 + aleatorio.randrange(40), 3, 4),
+        datetime.time(3, 4, 5),
+        datetime.timedelta(hours=aleatorio.randrange(50), minutes=3),
+        aleatorio.random() < 0.5,
+        '=1+2',
+        CellRichText(['ab', TextBlock(InlineFont(b=True), 'cd'), 'ef']),
+    ])
+
+
+def metadatos_openpyxl(ruta):
+    wb = load_workbook(ruta, read_only=True)
+    try:
+        return [
+            {
+                'hoja': nombre,
+                'filas': getattr(wb[nombre], 'max_row', None),
+                'columnas': getattr(wb[nombre], 'max_column', None),
+            }
+            for nombre in wb.sheetnames
+        ]
+    finally:
+        wb.close()
+
+
+class TestLectorExcel(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def test_metadatos(self):
+        ruta = os.path.join(self.carpeta, 'hojas.xlsx')
+        wb = Workbook()
+        ws = wb.active
+        ws.title = 'Uno'
+        for i in range(1, 11):
+            ws.append([f'https://sitio{i}.example.com', i, None])
+        wb.create_sheet('Dos')['D7'] = 'x'
+        wb.create_sheet('Vacía')
+        grafico = BarChart()
+        grafico.add_data(Reference(ws, min_col=2, min_row=1, max_row=10))
+        wb.create_chartsheet('Gráfico').add_chart(grafico)
+        wb.save(ruta)
+
+        avisos = []
+        with LectorExcel(ruta) as lector:
+            metadatos = lector.leer_metadatos(callback=lambda *args: avisos.append(args))
+        self.assertEqual(metadatos, metadatos_openpyxl(ruta))
+        self.assertEqual(metadatos[0], {'hoja': 'Uno', 'filas': 10, 'columnas': 3})
+        self.assertEqual([aviso[0] for aviso in avisos], [1, 2, 3, 4])
+
+    def test_metadatos_sin_dimension(self):
+        # El modo write-only de openpyxl no escribe <dimension>
+        ruta = os.path.join(self.carpeta, 'sin_dimension.xlsx')
+        wb = Workbook(write_only=True)
+        ws = wb.create_sheet('Datos')
+        for i in range(1000):
+            ws.append([f'cadena {i}'])
+        wb.save(ruta)
+        with LectorExcel(ruta) as lector:
+            self.assertEqual(lector.leer_metadatos(), [{'hoja': 'Datos', 'filas': None, 'columnas': None}])
+
+    def test_valores_como_openpyxl(self):
+        # Números, fechas con y sin formato, booleanos, fórmulas, texto con
+        # formato, huecos y filas sin escribir, con cadenas en línea y
+        # compartidas
+        aleatorio = random.Random(7)
+        for libro in range(40):
+            ruta = os.path.join(self.carpeta, f'valores{libro}.xlsx')
+            wb = Workbook()
+            ws = wb.active
+            ws.title = 'Datos'
+            if libro % 3 == 0:
+                wb.epoch = CALENDAR_MAC_1904
+            for _ in range(aleatorio.randrange(1, 80)):
+                celda = ws.cell(row=aleatorio.randint(1, 60), column=aleatorio.randint(1, 6),
+                                value=valor_aleatorio(aleatorio))
+                if aleatorio.random() < 0.2:
+                    celda.number_format = aleatorio.choice(['0.00', 'yyyy-mm-dd', '[h]:mm:ss', 'h:mm', '#,##0'])
+            wb.save(ruta)
+            if libro % 4:
+                a_cadenas_compartidas(ruta)
+
+            with LectorExcel(ruta) as lector:
+                for _ in range(5):
+                    columnas = aleatorio.sample(range(6), aleatorio.randint(1, 3))
+                    fila_ini = aleatorio.randint(1, 40)
+                    fila_fin = fila_ini + aleatorio.randint(0, 40)
+                    with warnings.catch_warnings():
+                        # Fechas fuera de rango: openpyxl avisa y da '#VALUE!'
+                        warnings.simplefilter('ignore')
+                        esperado = valores_openpyxl(ruta, 'Datos', columnas, fila_ini, fila_fin)
+                    self.assertEqual(list(lector.leer_columnas('Datos', columnas, fila_ini, fila_fin)), esperado,
+                                     (libro, columnas, fila_ini, fila_fin))
+
+    def test_cadenas_compartidas(self):
+        # Entidades, texto con formato, fonética, prefijos de namespace y
+        # comentarios, con bloques de lectura que parten las etiquetas y con
+        # la tabla en memoria o en disco
+        prefijadas = ''.join(re.sub(r'<(/?)', r'<\1x:', cadena) for cadena in CADENAS_XML)
+        tablas = {
+            'normal': f'<?xml version="1.0" encoding="UTF-8"?>\n<sst xmlns="{NS_HOJA}">{"".join(CADENAS_XML)}</sst>',
+            'prefijo': f'<x:sst xmlns:x="{NS_HOJA}">{prefijadas}</x:sst>',
+            'comentario': f'<sst xmlns="{NS_HOJA}">{"".join(CADENAS_XML)}<!-- <si><t>falso</t></si> --></sst>',
+        }
+        for nombre, tabla in tablas.items():
+            ruta = os.path.join(self.carpeta, f'{nombre}.xlsx')
+            wb = Workbook()
+            ws = wb.active
+            ws.title = 'Datos'
+            for fila in range(1, len(CADENAS_XML) + 1):
+                ws.cell(row=fila, column=1, value=f'cadena {fila}')
+            wb.save(ruta)
+            a_cadenas_compartidas(ruta, tabla)
+            esperado = valores_openpyxl(ruta, 'Datos', [0], 1, len(CADENAS_XML))
+
+            for bloque in (1024 * 1024, 113, 127, 151):
+                for umbral in (0, 1024 * 1024):
+                    with mock.patch.object(lector_excel, 'TAMANO_BLOQUE_XLSX', bloque), \
+                            mock.patch.object(lector_excel, 'UMBRAL_CADENAS_EN_DISCO', umbral), \
+                            LectorExcel(ruta) as lector:
+                        self.assertEqual(list(lector.leer_columnas('Datos', [0], 1, len(CADENAS_XML))), esperado,
+                                         (nombre, bloque, umbral))
+
+    def test_un_solo_zip_por_lector(self):
+        ruta = os.path.join(self.carpeta, 'varias.xlsx')
+        wb = Workbook()
+        wb.active.title = 'Datos'
+        for fila in range(1, 21):
+            wb.active.append([f'https://sitio{fila}.example.com', None, 'Válido'])
+        wb.save(ruta)
+        a_cadenas_compartidas(ruta)
+        with mock.patch.object(lector_excel.zipfile, 'ZipFile', wraps=zipfile.ZipFile) as abrir:
+            with LectorExcel(ruta) as lector:
+                lector.leer_metadatos()
+                self.assertEqual(len(list(lector.leer_columna('Datos', 0, 1, 20))), 20)
+                self.assertEqual(list(lector.leer_columnas('Datos', [0, 2], 5, 5)),
+                                 [(5, ('https://sitio5.example.com', 'Válido'))])
+            self.assertEqual(abrir.call_count, 1)
+        with LectorExcel(ruta) as lector:
+            with self.assertRaises(KeyError):
+                list(lector.leer_columna('No existe', 0, 1, 5))
+
+    def test_archivo_no_valido(self):
+        # Los errores deben ser de los que la aplicación muestra como libro no válido
+        texto = os.path.join(self.carpeta, 'texto.xlsx')
+        with open(texto, 'w') as archivo:
+            archivo.write('no es un zip')
+        sin_libro = os.path.join(self.carpeta, 'sin_libro.xlsx')
+        with zipfile.ZipFile(sin_libro, 'w') as paquete:
+            paquete.writestr('otro.xml', '<a/>')
+        for ruta in (texto, sin_libro):
+            with self.assertRaises(errores_archivo_excel()):
+                with LectorExcel(ruta) as lector:
+                    lector.leer_metadatos()
+
+
+if __name__ == "__main__":
+    unittest.main()
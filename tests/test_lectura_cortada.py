@@ -0,0 +1,81 @@
+# ============================================================================
+# tests/test_lectura_cortada.py
+# Un servidor que envía las cabeceras y deja de responder a mitad del cuerpo:
+# la URL no es válida, cuenta como fallo del host y no se guarda en la caché
+# Uso: python -m pytest tests/test_lectura_cortada.py
+# ============================================================================
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest import mock
+
+from config.constants import MENSAJE_CUERPO_CORTADO
+from model.cache_resultados import CacheResultados
+from model.link_validator import LinkValidator
+
+
+class ServidorAtascado(BaseHTTPRequestHandler):
+    """Cabeceras y el primer trozo de la página; el resto nunca llega"""
+
+    def do_GET(self):
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', '100000')
+        self.end_headers()
+        self.wfile.write(b"<html><head><title>Bienvenido</title></head><body>")
+        self.wfile.flush()
+        self.server.liberar.wait(10)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+class TestLecturaCortada(unittest.TestCase):
+
+    def setUp(self):
+        self.servidor = ThreadingHTTPServer(('127.0.0.1', 0), ServidorAtascado)
+        self.servidor.daemon_threads = True
+        self.servidor.liberar = threading.Event()
+        threading.Thread(target=self.servidor.serve_forever, daemon=True).start()
+        self.url = f'http://127.0.0.1:{self.servidor.server_address[1]}/'
+        self.carpeta = tempfile.mkdtemp()
+        self.cache = CacheResultados(os.path.join(self.carpeta, 'cache.db'))
+
+    def tearDown(self):
+        self.servidor.liberar.set()
+        self.servidor.shutdown()
+        self.servidor.server_close()
+        self.cache.cerrar()
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def validar(self, procesos_html):
+        validador = LinkValidator(cache=self.cache, procesos_html=procesos_html)
+        self.addCleanup(validador.cerrar)
+        hacer_request = validador.hacer_request
+        # La URL de prueba es http://: se salta el paso de SSL y se acorta el timeout
+        with mock.patch.object(validador, 'normalizar_url', return_value=self.url.replace('http', 'https')), \
+             mock.patch.object(validador, 'hacer_request',
+                               lambda url, **kwargs: hacer_request(self.url, timeout=0.5, max_retries=0)), \
+             mock.patch.object(validador.resolutor, 'host_inexistente', return_value=False):
+            inicio = time.monotonic()
+            resultado = validador.validar_url('https://atascado.example.com/')
+        self.assertLess(time.monotonic() - inicio, 5)
+        return validador, resultado
+
+    def test_lectura_atascada_no_es_valida(self):
+        for procesos in (0, 1):
+            with self.subTest(procesos=procesos):
+                validador, resultado = self.validar(procesos)
+                self.assertEqual(resultado['estado'], 'no_valido')
+                self.assertEqual(resultado['detalles'], MENSAJE_CUERPO_CORTADO)
+                self.assertEqual(validador.interruptor._hosts['127.0.0.1']['fallos'], 1)
+                self.assertIsNone(self.cache.obtener(self.url.replace('http', 'https')))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,112 @@
+# ============================================================================
+# tests/test_lote_libros.py
+# Un libro con error queda anotado en su resumen y no detiene el resto; cada
+# libro tiene su detalle por fila
+# Uso: python -m pytest tests/test_lote_libros.py
+# ============================================================================
+
+import os
+import shutil
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+from openpyxl import Workbook
+
+from model.link_validator import LinkValidator
+from model.lote_libros import LoteLibros
+
+
+def crear_libro(ruta, hoja='Datos'):
+    # Valores que no salen a la red: texto que no es URL y celdas vacías
+    wb = Workbook()
+    ws = wb.active
+    ws.title = hoja
+    for fila in range(1, 6):
+        ws.append([f'texto {fila}' if fila % 2 else None])
+    wb.save(ruta)
+
+
+class TestLoteLibros(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.validador = LinkValidator(cache=None)
+
+    def tearDown(self):
+        self.validador.cerrar()
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def ruta(self, nombre):
+        return os.path.join(self.carpeta, nombre)
+
+    def ejecutar(self, rutas, hoja='Datos', detalles=True):
+        return LoteLibros(rutas, hoja, 'A', 1, 5, 'B', self.validador, detalles=detalles).ejecutar(delay=0)
+
+    def archivos_de_detalle(self):
+        return sorted(nombre for nombre in os.listdir(self.carpeta) if '.detalles_' in nombre)
+
+    def test_detalle_por_libro(self):
+        crear_libro(self.ruta('uno.xlsx'))
+        crear_libro(self.ruta('dos.xlsx'))
+        resumen = self.ejecutar([self.ruta('uno.xlsx'), self.ruta('dos.xlsx')])
+        self.assertEqual([os.path.basename(registro['detalles']).split('.detalles_')[0] for registro in resumen],
+                         ['uno', 'dos'])
+        self.assertEqual(len(self.archivos_de_detalle()), 2)
+
+    def test_sin_detalles(self):
+        crear_libro(self.ruta('uno.xlsx'))
+        resumen = self.ejecutar([self.ruta('uno.xlsx')], detalles=False)
+        self.assertIsNone(resumen[0]['detalles'])
+        self.assertEqual(self.archivos_de_detalle(), [])
+
+    def test_hoja_inexistente(self):
+        crear_libro(self.ruta('otra_hoja.xlsx'), hoja='Otra')
+        crear_libro(self.ruta('bien.xlsx'))
+        resumen = self.ejecutar([self.ruta('otra_hoja.xlsx'), self.ruta('bien.xlsx')])
+        self.assertEqual(resumen[0]['error'], "No existe la hoja 'Datos'")
+        self.assertIsNone(resumen[1]['error'])
+        self.assertEqual(resumen[1]['filas'], 5)
+
+    def test_error_inesperado_no_detiene_el_lote(self):
+        # Un KeyError que no tiene que ver con la hoja no se confunde con ella
+        crear_libro(self.ruta('uno.xlsx'))
+        crear_libro(self.ruta('dos.xlsx'))
+        crear_libro(self.ruta('tres.xlsx'))
+        guardar = mock.Mock(side_effect=[KeyError('interna'), RuntimeError('fallo'), {'validos': 0}])
+        with mock.patch('model.trabajo_validacion.TrabajoValidacion.guardar', guardar):
+            resumen = self.ejecutar([self.ruta(nombre) for nombre in ('uno.xlsx', 'dos.xlsx', 'tres.xlsx')])
+        self.assertEqual(resumen[0]['error'], "Error inesperado (KeyError): 'interna'")
+        self.assertEqual(resumen[1]['error'], "Error inesperado (RuntimeError): fallo")
+        self.assertIsNone(resumen[2]['error'])
+
+    def test_value_error_propio_no_es_archivo_no_valido(self):
+        # Un ValueError de nuestro código no se confunde con un libro dañado
+        crear_libro(self.ruta('uno.xlsx'))
+        guardar = mock.Mock(side_effect=ValueError('Los cambios deben llegar en orden de fila'))
+        with mock.patch('model.trabajo_validacion.TrabajoValidacion.guardar', guardar):
+            resumen = self.ejecutar([self.ruta('uno.xlsx')])
+        self.assertEqual(resumen[0]['error'],
+                         "Error inesperado (ValueError): Los cambios deben llegar en orden de fila")
+
+    def test_xml_danado(self):
+        crear_libro(self.ruta('danado.xlsx'))
+        with zipfile.ZipFile(self.ruta('danado.xlsx')) as paquete:
+            partes = [(info.filename, paquete.read(info)) for info in paquete.infolist()]
+        with zipfile.ZipFile(self.ruta('danado.xlsx'), 'w') as paquete:
+            for nombre, datos in partes:
+                paquete.writestr(nombre, b'<worksheet' if nombre == 'xl/worksheets/sheet1.xml' else datos)
+        resumen = self.ejecutar([self.ruta('danado.xlsx')])
+        self.assertTrue(resumen[0]['error'].startswith("Archivo no válido: XML no válido"))
+
+    def test_archivo_no_valido(self):
+        with open(self.ruta('roto.xlsx'), 'w') as archivo:
+            archivo.write('no es un libro')
+        resumen = self.ejecutar([self.ruta('roto.xlsx'), self.ruta('no_existe.xlsx')])
+        self.assertTrue(resumen[0]['error'].startswith("Archivo no válido"))
+        self.assertEqual(resumen[1]['error'], "Archivo no encontrado")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+# ============================================================================
+# tests/test_modo_incremental.py
+# Modo incremental: qué filas con resultado se vuelven a validar según la
+# fecha de verificación guardada en la caché
+# Uso: python -m pytest tests/test_modo_incremental.py
+# ============================================================================
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest import mock
+
+from model.cache_resultados import CacheResultados
+from model.link_validator import LinkValidator
+
+DIA = 24 * 3600
+
+
+class TestModoIncremental(unittest.TestCase):
+
+    def setUp(self):
+        self.carpeta = tempfile.mkdtemp()
+        self.cache = CacheResultados(os.path.join(self.carpeta, 'cache.db'))
+        self.validador = LinkValidator(cache=self.cache)
+
+    def tearDown(self):
+        self.validador.cerrar()
+        self.cache.cerrar()
+        shutil.rmtree(self.carpeta, ignore_errors=True)
+
+    def guardar_hace(self, segundos, url, estado='valido'):
+        with mock.patch('model.cache_resultados.time.time', return_value=time.time() - segundos):
+            self.cache.guardar(url, {'estado': estado, 'detalles': ''})
+
+    def seleccionar(self, filas):
+        return self.validador.seleccionar_pendientes(filas, antiguedad_maxima=30 * DIA)
+
+    def test_filas_sin_resultado_y_antiguas(self):
+        self.guardar_hace(DIA, 'https://reciente.com')
+        self.guardar_hace(40 * DIA, 'https://antigua.com')
+        filas = [
+            (2, 'https://reciente.com', 'VÁLIDO'),
+            (3, 'https://antigua.com', 'VÁLIDO'),
+            (4, 'https://sin-resultado.com', None),
+            (5, 'https://en-blanco.com', '  '),
+            (6, None, None),                            # Sin URL: nada que validar
+            (7, 'https://nunca-vista.com', 'NO VÁLIDO'),
+        ]
+        self.assertEqual(self.seleccionar(filas), [(3, 'https://antigua.com'),
+                                                   (4, 'https://sin-resultado.com'),
+                                                   (5, 'https://en-blanco.com'),
+                                                   (7, 'https://nunca-vista.com')])
+
+    def test_resultados_sin_acierto_en_cache_dejan_fecha(self):
+        # http:// y dominio inexistente no se guardan como acierto, pero la
+        # siguiente ejecución incremental no debe volver a validarlos
+        self.validador.resolutor.host_inexistente = lambda host: host == 'no-existe.example.com'
+        self.validador.validar_url('http://sin-ssl.com')
+        self.validador.validar_url('https://no-existe.example.com')
+        self.assertIsNone(self.cache.obtener('http://sin-ssl.com'))
+        self.assertIsNone(self.cache.obtener('https://no-existe.example.com'))
+
+        filas = [(2, 'sin-ssl.com', 'VALIDAR'),          # Sin protocolo: se normaliza a https://
+                 (3, 'http://sin-ssl.com', 'VALIDAR'),
+                 (4, 'https://no-existe.example.com', 'NO VÁLIDO')]
+        self.assertEqual(self.seleccionar(filas), [(2, 'sin-ssl.com')])
+
+    def test_estado_sin_vigencia_deja_fecha(self):
+        self.cache.ttl_por_estado['validar'] = 0
+        self.cache.guardar('https://login.com', {'estado': 'validar', 'detalles': 'Requiere login'})
+        self.assertIsNone(self.cache.obtener('https://login.com'))
+        self.assertEqual(self.seleccionar([(2, 'https://login.com', 'VALIDAR')]), [])
+
+    def test_sin_cache_solo_filas_sin_resultado(self):
+        self.validador.cache = None
+        filas = [(2, 'https://a.com', 'VÁLIDO'), (3, 'https://b.com', '')]
+        self.assertEqual(self.seleccionar(filas), [(3, 'https://b.com')])
+
+    def test_sin_antiguedad_nunca_revalida(self):
+        filas = [(2, 'https://nunca-vista.com', 'VÁLIDO')]
+        self.assertEqual(self.validador.seleccionar_pendientes(filas, antiguedad_maxima=None), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
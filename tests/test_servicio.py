@@ -0,0 +1,154 @@
+# ============================================================================
+# tests/test_servicio.py
+# El servicio HTTP contra un sitio HTTPS local que hace de web real:
+# una URL suelta, lotes en streaming y errores de la petición
+# Uso: python -m pytest tests/test_servicio.py
+#      (necesita el comando openssl para el certificado del sitio)
+# ============================================================================
+
+import http.client
+import json
+import shutil
+import ssl
+import subprocess
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from model.link_validator import LinkValidator
+from servicio import ServicioValidacion
+
+# Ruta -> (código, cuerpo) del sitio local
+PAGINAS = {
+    '/ok': (200, b"<html><head><title>Bienvenido</title></head><body>contenido real</body></html>"),
+    '/falta': (404, b"<html><body>not found</body></html>"),
+    '/parking': (200, b"<html><head><title>This domain is for sale</title></head>"
+                      b"<body>buy this domain</body></html>"),
+}
+
+
+class ManejadorSitio(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+
+    def do_GET(self):
+        codigo, cuerpo = PAGINAS.get(self.path.split('?')[0], PAGINAS['/ok'])
+        self.send_response(codigo)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, formato, *args):
+        pass
+
+
+def arrancar(servidor):
+    threading.Thread(target=servidor.serve_forever, daemon=True).start()
+    return servidor
+
+
+@unittest.skipUnless(shutil.which('openssl'), "falta el comando openssl")
+class TestServicio(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.directorio = tempfile.TemporaryDirectory()
+        certificado = Path(cls.directorio.name) / 'sitio.crt'
+        clave = Path(cls.directorio.name) / 'sitio.key'
+        subprocess.run(
+            ['openssl', 'req', '-x509', '-newkey', 'rsa:2048', '-nodes', '-days', '1',
+             '-subj', '/CN=127.0.0.1', '-keyout', str(clave), '-out', str(certificado)],
+            check=True, capture_output=True
+        )
+        contexto = ssl.SSLContext(ssl.PROTOCOL_TLS_SERVER)
+        contexto.load_cert_chain(certificado, clave)
+        cls.sitio = ThreadingHTTPServer(('127.0.0.1', 0), ManejadorSitio)
+        cls.sitio.socket = contexto.wrap_socket(cls.sitio.socket, server_side=True)
+        arrancar(cls.sitio)
+        cls.base = f"https://127.0.0.1:{cls.sitio.server_address[1]}"
+
+        cls.validador = LinkValidator(max_hilos=4, cache=None)
+        cls.servicio = arrancar(ServicioValidacion(('127.0.0.1', 0), cls.validador, delay=0))
+
+    @classmethod
+    def tearDownClass(cls):
+        for servidor in (cls.servicio, cls.sitio):
+            servidor.shutdown()
+            servidor.server_close()
+        cls.validador.cerrar()
+        cls.directorio.cleanup()
+
+    def peticion(self, metodo, ruta, cuerpo=None, cabeceras=None):
+        conexion = http.client.HTTPConnection('127.0.0.1', self.servicio.server_address[1], timeout=30)
+        try:
+            conexion.request(metodo, ruta, body=cuerpo, headers=cabeceras or {})
+            respuesta = conexion.getresponse()
+            return respuesta.status, respuesta.read()
+        finally:
+            conexion.close()
+
+    def test_salud(self):
+        codigo, cuerpo = self.peticion('GET', '/salud')
+        self.assertEqual(codigo, 200)
+        self.assertEqual(json.loads(cuerpo)['estado'], 'ok')
+
+    def test_validar_una(self):
+        for ruta, estado in (('/ok', 'valido'), ('/falta', 'no_valido'), ('/parking', 'no_valido')):
+            codigo, cuerpo = self.peticion('GET', f'/validar?url={self.base}{ruta}')
+            self.assertEqual(codigo, 200)
+            self.assertEqual(json.loads(cuerpo)['estado'], estado, ruta)
+
+        codigo, cuerpo = self.peticion('POST', '/validar', json.dumps({'url': f'{self.base}/ok'}))
+        self.assertEqual(json.loads(cuerpo)['estado'], 'valido')
+
+    def test_lote_en_orden(self):
+        urls = [f'{self.base}/ok/{i}' if i % 3 else f'{self.base}/falta' for i in range(30)]
+        lineas = '\n'.join(urls + ['texto suelto', json.dumps({'id': 'x', 'url': f'{self.base}/ok'})])
+        codigo, cuerpo = self.peticion('POST', '/lote?orden=entrada', lineas.encode('utf-8'))
+        self.assertEqual(codigo, 200)
+        resultados = [json.loads(linea) for linea in cuerpo.splitlines()]
+        self.assertEqual([r['id'] for r in resultados], list(range(1, 32)) + ['x'])
+        self.assertEqual(
+            [r['estado'] for r in resultados[:30]],
+            ['valido' if i % 3 else 'no_valido' for i in range(30)]
+        )
+        self.assertNotEqual(resultados[30]['estado'], 'valido')
+        self.assertEqual(resultados[31]['estado'], 'valido')
+
+    def test_lote_json(self):
+        cuerpo = json.dumps({'urls': [f'{self.base}/ok', f'{self.base}/falta']})
+        codigo, respuesta = self.peticion('POST', '/lote', cuerpo, {'Content-Type': 'application/json'})
+        self.assertEqual(codigo, 200)
+        estados = {r['id']: r['estado'] for r in map(json.loads, respuesta.splitlines())}
+        self.assertEqual(estados, {1: 'valido', 2: 'no_valido'})
+
+    def test_lote_con_error_del_motor(self):
+        # Los resultados ya enviados llegan, y una última línea avisa del corte
+        original = self.validador.iterar_lote
+
+        def iterar_y_fallar(entradas, *args, **kwargs):
+            resultados = original(entradas, *args, **kwargs)
+            yield next(resultados)
+            resultados.close()
+            raise RuntimeError('motor roto')
+
+        with mock.patch.object(self.validador, 'iterar_lote', iterar_y_fallar):
+            codigo, cuerpo = self.peticion('POST', '/lote?orden=entrada',
+                                           f'{self.base}/ok\n{self.base}/falta'.encode('utf-8'))
+        self.assertEqual(codigo, 200)
+        lineas = [json.loads(linea) for linea in cuerpo.splitlines()]
+        self.assertEqual(lineas[0]['estado'], 'valido')
+        self.assertEqual(lineas[-1], {'error': 'Lote interrumpido (RuntimeError): motor roto'})
+
+    def test_errores_de_peticion(self):
+        self.assertEqual(self.peticion('GET', '/validar')[0], 400)
+        self.assertEqual(self.peticion('GET', '/otra')[0], 404)
+        self.assertEqual(self.peticion('POST', '/validar', b'{no es json')[0], 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,79 @@
+# ============================================================================
+# tests/test_urls_repetidas.py
+# Las filas con la misma URL comparten una sola petición y reciben cada una
+# su resultado
+# Uso: python -m pytest tests/test_urls_repetidas.py
+# ============================================================================
+
+import threading
+import unittest
+from collections import Counter
+from unittest import mock
+
+from model.link_validator import LinkValidator
+
+
+class RespuestaFalsa:
+
+    status_code = 200
+    headers = {'Content-Type': 'text/plain'}
+
+    def __init__(self, url):
+        self.url = url
+
+    def close(self):
+        pass
+
+
+class TestUrlsRepetidas(unittest.TestCase):
+
+    def setUp(self):
+        self.validador = LinkValidator(cache=None, max_hilos=4)
+        # Sin DNS: todos los dominios existen
+        self.validador.resolutor.resolver_hosts = lambda hosts: {host: True for host in hosts}
+        self.validador.resolutor.host_inexistente = lambda host: False
+        self.peticiones = Counter()
+        self.lock = threading.Lock()
+
+        def hacer_request(url, **kwargs):
+            with self.lock:
+                self.peticiones[url] += 1
+            return RespuestaFalsa(url), None, False
+
+        self.validador.hacer_request = mock.Mock(side_effect=hacer_request)
+
+    def tearDown(self):
+        self.validador.cerrar()
+
+    def test_una_peticion_por_url(self):
+        filas = [
+            (2, 'https://uno.example.com/a'),
+            (3, 'uno.example.com/a'),           # Misma URL sin protocolo
+            (4, 'https://dos.example.com'),
+            (5, '  https://uno.example.com/a '),
+            (6, 'texto sin url'),
+            (7, 'https://dos.example.com'),
+        ]
+        estadisticas = {}
+        resultados = list(self.validador.iterar_lote(filas, delay=0, estadisticas=estadisticas))
+
+        self.assertEqual(self.peticiones, Counter({'https://uno.example.com/a': 1,
+                                                   'https://dos.example.com': 1}))
+        self.assertEqual(estadisticas['ahorradas'], 3)
+        self.assertEqual([r['fila_excel'] for r in resultados], [2, 3, 4, 5, 6, 7])
+        self.assertEqual([r['url_original'] for r in resultados], [url for _, url in filas])
+        self.assertEqual([r['estado'] for r in resultados],
+                         ['valido', 'valido', 'valido', 'valido', None, 'valido'])
+
+    def test_repetidas_fuera_de_la_ventana(self):
+        # Con ventana 1 la repetida llega cuando la primera ya terminó: sale
+        # de las URLs recientes en lugar de esperar en vuelo
+        filas = [(fila, 'https://uno.example.com') for fila in range(2, 12)]
+        resultados = list(self.validador.iterar_lote(filas, delay=0, ventana=1))
+
+        self.assertEqual(self.peticiones, Counter({'https://uno.example.com': 1}))
+        self.assertEqual([r['fila_excel'] for r in resultados], list(range(2, 12)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -17,6 +17,7 @@ from config.constants import (
     EMOJI_NO_VALIDO,
     EMOJI_DETENER,
     EMOJI_PAUSAR,
+    EMOJI_CARGANDO,
     UI_COLOR_FONDO,
     UI_COLOR_TEXTO_PRINCIPAL,
     UI_COLOR_TEXTO_SECUNDARIO,
@@ -36,15 +37,47 @@ from config.constants import (
     UI_FONT_AYUDA,
     UI_FONT_BOTON_PRINCIPAL,
     UI_FONT_BOTON_SECUNDARIO,
-    UI_FONT_BOTON_TERCIARIO
+    UI_FONT_BOTON_TERCIARIO,
+    ANTIGUEDAD_REVALIDACION,
+    DELAY_DEFAULT,
+    INTERVALOS_POR_HOST
 )
 
+# Unidades para mostrar ANTIGUEDAD_REVALIDACION, de mayor a menor
+_UNIDADES_TIEMPO = (
+    (24 * 3600, "día", "días"),
+    (3600, "hora", "horas"),
+    (60, "minuto", "minutos"),
+    (1, "segundo", "segundos"),
+)
+
+
+def _texto_modo_incremental(antiguedad=ANTIGUEDAD_REVALIDACION):
+    # Rótulo de la casilla del modo incremental según la constante de
+    # configuración, en la mayor unidad que la expresa exacta
+    texto = "Modo incremental: validar solo filas sin resultado"
+    if antiguedad is None:
+        return texto
+    for segundos, singular, plural in _UNIDADES_TIEMPO:
+        if antiguedad % segundos == 0:
+            cantidad = int(antiguedad // segundos)
+            return f"{texto} (o verificadas hace más de {cantidad} {singular if cantidad == 1 else plural})"
+    return texto
+
+
+def _texto_delay(delay=DELAY_DEFAULT, intervalos_por_host=INTERVALOS_POR_HOST):
+    # Intervalo del planificador por dominio según la configuración
+    texto = f"Delay: {delay:g} seg por dominio"
+    if intervalos_por_host:
+        texto += " (algunos dominios tienen el suyo)"
+    return texto
+
 
 class ValidadorView:
     def __init__(self, root):
         self.root = root
         self.root.title(f"{EMOJI_CADENA} Validador de Enlaces - Excel")
-        self.root.geometry("900x500")
+        self.root.geometry("900x630")
         self.root.configure(bg=UI_COLOR_FONDO)
         
         # Referencias a widgets
@@ -55,8 +88,13 @@ class ValidadorView:
         self.fila_inicio = None
         self.fila_fin = None
         self.resultado_entrada = None
+        self.incremental_var = None
+        self.objetivos_lista = None
+        self.agregar_objetivo_btn = None
+        self.quitar_objetivo_btn = None
         self.ejecutar_btn = None
         self.ver_logs_btn = None
+        self.carpeta_btn = None
         self.progreso_label = None
         self.progreso_bar = None
         
@@ -245,11 +283,58 @@ class ValidadorView:
         
         tk.Label(
             res_col_frame,
-            text="Ejemplo: Z, AA, AB... | Delay: 2 seg (fijo)",
+            text=f"Ejemplo: Z, AA, AB... | {_texto_delay()}",
             font=UI_FONT_AYUDA,
             bg=UI_COLOR_BLANCO,
             fg=UI_COLOR_TEXTO_SECUNDARIO
         ).pack(side='left', padx=5)
+        
+        # Modo incremental: solo filas sin resultado o con resultado antiguo
+        self.incremental_var = tk.BooleanVar(value=False)
+        tk.Checkbutton(
+            result_frame,
+            text=_texto_modo_incremental(),
+            variable=self.incremental_var,
+            font=UI_FONT_TEXTO_NORMAL,
+            bg=UI_COLOR_BLANCO,
+            activebackground=UI_COLOR_BLANCO,
+            anchor='w'
+        ).pack(fill='x', pady=(5, 0))
+        
+        # Objetivos del trabajo: varias hojas/columnas validadas en una sola pasada
+        objetivos_frame = tk.Frame(result_frame, bg=UI_COLOR_BLANCO)
+        objetivos_frame.pack(fill='x', pady=(5, 0))
+        
+        self.objetivos_lista = tk.Listbox(objetivos_frame, height=3, font=UI_FONT_TEXTO_INFO)
+        self.objetivos_lista.pack(side='left', fill='x', expand=True)
+        
+        objetivos_botones = tk.Frame(objetivos_frame, bg=UI_COLOR_BLANCO)
+        objetivos_botones.pack(side='left', padx=10)
+        
+        self.agregar_objetivo_btn = tk.Button(
+            objetivos_botones,
+            text="+ Añadir objetivo",
+            font=UI_FONT_BOTON_TERCIARIO,
+            cursor='hand2'
+        )
+        self.agregar_objetivo_btn.pack(fill='x')
+        
+        self.quitar_objetivo_btn = tk.Button(
+            objetivos_botones,
+            text="- Quitar",
+            font=UI_FONT_BOTON_TERCIARIO,
+            cursor='hand2'
+        )
+        self.quitar_objetivo_btn.pack(fill='x', pady=(3, 0))
+        
+        tk.Label(
+            result_frame,
+            text="Añade varias hojas/columnas para validarlas juntas. Lista vacía: se usa la configuración de arriba.",
+            font=UI_FONT_AYUDA,
+            bg=UI_COLOR_BLANCO,
+            fg=UI_COLOR_TEXTO_SECUNDARIO,
+            anchor='w'
+        ).pack(fill='x')
     
     def crear_seccion_ejecucion(self, parent):
         exec_frame = tk.Frame(parent, bg=UI_COLOR_FONDO)
@@ -322,6 +407,21 @@ class ValidadorView:
         )
         self.ver_logs_btn.pack(side='left', padx=5)
         
+        # Botón de validar una carpeta de libros con la misma configuración
+        self.carpeta_btn = tk.Button(
+            botones_frame,
+            text=f"{EMOJI_ARCHIVO} Validar carpeta",
+            font=UI_FONT_BOTON_TERCIARIO,
+            bg=UI_COLOR_INFO,
+            fg=UI_COLOR_BLANCO,
+            relief='raised',
+            borderwidth=2,
+            padx=15,
+            pady=10,
+            cursor='hand2'
+        )
+        self.carpeta_btn.pack(side='left', padx=5)
+        
         # Label de progreso
         self.progreso_label = tk.Label(
             parent, 
@@ -340,7 +440,27 @@ class ValidadorView:
     # Para que el Controlador actualice la vista
     # ========================================================================
     
+    def mostrar_cargando_archivo(self, nombre_archivo):
+        self.drop_label.config(
+            bg=UI_COLOR_PROCESANDO,
+            fg=UI_COLOR_BLANCO,
+            text=f"{EMOJI_CARGANDO} Cargando archivo...\n{nombre_archivo}"
+        )
+        self.archivo_label.config(text="Leyendo hojas del libro...", fg=UI_COLOR_TEXTO_SECUNDARIO)
+        self.ejecutar_btn.config(state='disabled')
+        self.progreso_bar.config(mode='indeterminate')
+        self.progreso_bar.start(15)
+    
+    def actualizar_carga_archivo(self, texto):
+        self.archivo_label.config(text=texto)
+    
+    def detener_progreso_carga(self):
+        self.progreso_bar.stop()
+        self.progreso_bar.config(mode='determinate')
+        self.progreso_bar['value'] = 0
+    
     def mostrar_archivo_cargado(self, nombre_archivo, num_filas, num_columnas, hojas):
+        self.detener_progreso_carga()
         self.drop_label.config(
             bg=UI_COLOR_EXITO, 
             fg=UI_COLOR_BLANCO, 
@@ -356,6 +476,7 @@ class ValidadorView:
         self.ejecutar_btn.config(state='normal')
     
     def mostrar_error_carga(self):
+        self.detener_progreso_carga()
         self.drop_label.config(
             bg=UI_COLOR_ERROR, 
             fg=UI_COLOR_BLANCO, 
@@ -380,6 +501,7 @@ class ValidadorView:
             bg=UI_COLOR_EXITO, 
             text=f"{EMOJI_CONTINUAR} INICIAR VALIDACIÓN"
         )
+        self.carpeta_btn.config(state='normal')
     
     def deshabilitar_boton_ejecutar(self):
         self.ejecutar_btn.config(
@@ -387,6 +509,7 @@ class ValidadorView:
             bg=UI_COLOR_PROCESANDO, 
             text=f"{EMOJI_PAUSAR} VALIDANDO..."
         )
+        self.carpeta_btn.config(state='disabled')
         # Habilitar botones durante validación
         self.pausar_btn.config(state='normal', bg=UI_COLOR_WARNING, text=f"{EMOJI_PAUSAR} PAUSAR")
         self.detener_btn.config(state='normal', bg=UI_COLOR_ERROR)
@@ -422,6 +545,18 @@ class ValidadorView:
     def obtener_columna_resultado(self):
         return self.resultado_entrada.get().strip().upper()
     
+    def obtener_modo_incremental(self):
+        return self.incremental_var.get()
+    
+    def obtener_objetivo_seleccionado(self):
+        seleccion = self.objetivos_lista.curselection()
+        return seleccion[0] if seleccion else None
+    
+    def mostrar_objetivos(self, descripciones):
+        self.objetivos_lista.delete(0, 'end')
+        for descripcion in descripciones:
+            self.objetivos_lista.insert('end', descripcion)
+    
     # ========================================================================
     # MÉTODOS PARA BINDING DE EVENTOS (el Controlador los conectará)
     # ========================================================================
@@ -441,6 +576,15 @@ class ValidadorView:
     def vincular_boton_pausar(self, callback):
         self.pausar_btn.config(command=callback)
     
+    def vincular_boton_agregar_objetivo(self, callback):
+        self.agregar_objetivo_btn.config(command=callback)
+    
+    def vincular_boton_quitar_objetivo(self, callback):
+        self.quitar_objetivo_btn.config(command=callback)
+    
+    def vincular_boton_carpeta(self, callback):
+        self.carpeta_btn.config(command=callback)
+    
     def vincular_drag_drop(self, callback):
         try:
             from tkinterdnd2 import DND_FILES